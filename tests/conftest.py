@@ -0,0 +1,17 @@
+import pytest
+
+from tqqq_sniper.market_calendar import trading_days
+from tqqq_sniper.synthetic import synthetic_ohlc
+
+
+def calendar_ohlc(n, seed=0, end='2025-12-31', **kwargs):
+    """NYSE 거래일 달력 위의 합성 일봉 (synthetic_ohlc는 평일 달력이라 휴장일 봉이 섞임)"""
+    index = trading_days('2000-01-01', end)[-n:]
+    data = synthetic_ohlc(n, seed=seed, end=end, **kwargs)
+    data.index = index.rename('Date')
+    return data
+
+
+@pytest.fixture
+def daily():
+    return calendar_ohlc(800, seed=1)
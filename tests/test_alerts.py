@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from tqqq_sniper.alerts import AlertDaemon, AlertSink, MemorySink
+from tqqq_sniper.analyzer import TQQQAnalyzer
+from tqqq_sniper.engine import ACTION_LABELS, HOLD, compute_allocation
+from tqqq_sniper.indicators import calculate_indicators
+from tqqq_sniper.market_calendar import NY
+from tqqq_sniper.providers import MockProvider
+from tqqq_sniper.store import BarStore
+
+# 합성 일봉(2025-12-31 마감) 다음 거래일 장중 — 확정 일봉은 2025-12-31
+NOW = datetime(2026, 1, 2, 12, 0, tzinfo=NY)
+LOOKBACK = 60
+
+
+class BrokenSink(AlertSink):
+    name = 'broken'
+
+    def send(self, alert):
+        raise ConnectionError('전송 실패')
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'bars.sqlite')
+
+
+def _daemon(store_path, daily, sinks):
+    analyzer = TQQQAnalyzer(store=BarStore(store_path), provider=MockProvider({'TQQQ': daily}),
+                            tickers=['TQQQ'], aux_tickers=[], rules=[])
+    return AlertDaemon(analyzer, sinks)
+
+
+def _expected_flips(daily, since):
+    alloc = compute_allocation(calculate_indicators(daily), [20, 45, 151, 212])
+    flips = alloc[(alloc.index > since) & (alloc['Action'] != HOLD)]
+    return [(f'{d:%Y-%m-%d}', ACTION_LABELS[a]) for d, a in flips['Action'].items()]
+
+
+def _seed(store_path, daily):
+    """저장소를 채우고 LOOKBACK일 전까지 평가한 상태로 만듦"""
+    daemon = _daemon(store_path, daily, [MemorySink()])
+    daemon.evaluate_close(NOW)
+    since = daily.index[-LOOKBACK]
+    daemon.state.set('TQQQ', since)
+    return since
+
+
+def test_close_flips_are_sent_once_across_restarts(store_path, daily):
+    since = _seed(store_path, daily)
+    expected = _expected_flips(daily, since)
+    assert expected
+
+    sink = MemorySink()
+    sent = _daemon(store_path, daily, [sink]).evaluate_close(NOW)
+    assert [(a['date'], a['action']) for a in sink.alerts] == expected
+    assert sent == sink.alerts
+
+    # 재시작해도 같은 알림을 다시 보내지 않음 (평가 상태는 SQLite)
+    restarted = MemorySink()
+    daemon = _daemon(store_path, daily, [restarted])
+    assert daemon.evaluate_close(NOW) == []
+    assert restarted.alerts == []
+    assert daemon.state.get('TQQQ') == daily.index[-1]
+
+
+def test_failed_delivery_is_retried(store_path, daily):
+    since = _seed(store_path, daily)
+    expected = _expected_flips(daily, since)
+
+    daemon = _daemon(store_path, daily, [BrokenSink()])
+    assert daemon.evaluate_close(NOW) == []
+    assert daemon.state.get('TQQQ') < pd.Timestamp(expected[0][0])
+    assert daemon.next_close_check == NOW + timedelta(seconds=daemon.retry_seconds)
+
+    # 다음 시도에서 전달되지 않았던 알림부터 다시 보냄
+    sink = MemorySink()
+    _daemon(store_path, daily, [sink]).evaluate_close(NOW)
+    assert [(a['date'], a['action']) for a in sink.alerts] == expected
+
+
+def test_one_working_sink_is_enough(store_path, daily):
+    since = _seed(store_path, daily)
+    sink = MemorySink()
+    daemon = _daemon(store_path, daily, [BrokenSink(), sink])
+    assert len(daemon.evaluate_close(NOW)) == len(_expected_flips(daily, since))
+    assert daemon.state.get('TQQQ') == daily.index[-1]
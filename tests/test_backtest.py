@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.backtest import TRADING_DAYS, performance_stats, run_backtest, simulate, simulate_paths
+from tqqq_sniper.engine import compute_allocation
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, calculate_indicators
+
+
+def _replay(close, target, cost, cash_rate, threshold=0.01):
+    """하루씩 보유 수량을 굴리는 기준 구현 — 목표가 threshold 넘게 바뀐 날만 종가 리밸런싱"""
+    growth = np.exp(np.log1p(cash_rate) / TRADING_DAYS)
+    risky = cash = 0.0
+    value = 1.0
+    equity = []
+    for t in range(len(close)):
+        if t:
+            risky *= close[t] / close[t - 1]
+            cash *= growth
+            value = risky + cash
+        if t == 0 or abs(target[t] - target[t - 1]) > threshold:
+            value *= 1 - cost * abs(target[t] - risky / value)
+            risky, cash = target[t] * value, (1 - target[t]) * value
+        equity.append(value)
+    return np.array(equity)
+
+
+@pytest.mark.parametrize('cost_bps,cash_rate', [(0.0, 0.0), (10.0, 0.04)])
+def test_simulate_matches_daily_replay(daily, cost_bps, cash_rate):
+    close = daily['Close'].to_numpy()
+    target = np.repeat(np.random.default_rng(1).integers(0, 5, len(close) // 20 + 1) / 4, 20)[:len(close)]
+    equity, weights, trade, turnover = simulate(close, target, cost_bps, cost_bps, cash_rate)
+    np.testing.assert_allclose(equity, _replay(close, target, 2 * cost_bps / 1e4, cash_rate), rtol=1e-12)
+    np.testing.assert_array_equal(weights, target)
+    assert trade[0] and trade.sum() == 1 + (np.diff(target) != 0).sum()
+
+
+def test_run_backtest_executes_the_rule_with_lag(daily):
+    result = run_backtest(daily, cost_bps=0.0, slippage_bps=0.0, lag=1)
+    ind = calculate_indicators(daily)
+    target = compute_allocation(ind, DEFAULT_MA_PERIODS)['TQQQ']
+
+    weights = result['weights']
+    assert weights.index.equals(ind.index)
+    assert weights.iloc[0] == 0.0
+    np.testing.assert_array_equal(weights.to_numpy()[1:], target.to_numpy()[:-1])
+    np.testing.assert_allclose(result['benchmark'].to_numpy(), ind['Close'] / ind['Close'].iloc[0])
+    np.testing.assert_allclose(result['equity'].to_numpy(), _replay(ind['Close'].to_numpy(), weights.to_numpy(), 0, 0))
+
+    stats = result['stats']
+    assert stats['total_return'] == pytest.approx(result['equity'].iloc[-1] - 1)
+    assert stats['trades'] == len(result['trades']) - 1
+    assert stats['start'] == f'{ind.index[0]:%Y-%m-%d}'
+
+
+def test_run_backtest_window_and_costs(daily):
+    start, end = '2024-06-03', '2025-06-30'
+    free = run_backtest(daily, cost_bps=0.0, slippage_bps=0.0, start=start, end=end)
+    costly = run_backtest(daily, cost_bps=10.0, slippage_bps=5.0, start=start, end=end)
+    assert free['equity'].index[0] == pd.Timestamp(start)
+    assert free['equity'].index[-1] <= pd.Timestamp(end)
+    # 비용은 거래가 있을 때만 자산을 줄이고 비중은 그대로
+    assert (costly['equity'] <= free['equity'] + 1e-12).all()
+    assert costly['stats']['total_return'] < free['stats']['total_return']
+    pd.testing.assert_series_equal(costly['weights'], free['weights'])
+
+
+def test_performance_stats_on_known_curve():
+    dates = pd.bdate_range('2020-01-01', periods=5)
+    equity = np.array([1.0, 1.1, 0.99, 1.2, 1.32])
+    stats = performance_stats(equity, dates, turnover=np.array([1.0, 0, 0.5, 0, 0]),
+                              trade=np.array([True, False, True, False, False]))
+    years = (dates[-1] - dates[0]).days / 365.25
+    assert stats['total_return'] == pytest.approx(0.32)
+    assert stats['cagr'] == pytest.approx(1.32 ** (1 / years) - 1)
+    assert stats['max_drawdown'] == pytest.approx(0.99 / 1.1 - 1)
+    assert stats['turnover'] == pytest.approx(1.5 / years)
+    assert stats['trades'] == 1
+    daily = equity[1:] / equity[:-1] - 1
+    assert stats['sharpe'] == pytest.approx(daily.mean() / daily.std(ddof=1) * np.sqrt(TRADING_DAYS))
+
+
+@pytest.mark.parametrize('cost_bps,cash_rate', [(0.0, 0.0), (10.0, 0.04)])
+def test_simulate_paths_matches_simulate(cost_bps, cash_rate):
+    rng = np.random.default_rng(0)
+    n, paths = 300, 6
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, (n, paths)), axis=0))
+    target = np.repeat(rng.integers(0, 5, (n // 10, paths)) / 4, 10, axis=0)
+    target[:, 0] = 0.0  # 거래가 없는 경로
+    target[:, 1] = 1.0  # 첫날 한 번만 거래하는 경로
+
+    equity, turnover = simulate_paths(close, target, cost_bps, cost_bps, cash_rate)
+    for j in range(paths):
+        eq, _, _, to = simulate(close[:, j], target[:, j], cost_bps, cost_bps, cash_rate)
+        np.testing.assert_allclose(equity[:, j], eq, rtol=1e-12)
+        np.testing.assert_allclose(turnover[:, j], to, atol=1e-15)
@@ -0,0 +1,36 @@
+import json
+
+from tqqq_sniper.bench import compare, main, run_benchmarks
+
+
+def test_every_stage_is_measured_per_dataset(tmp_path, daily):
+    daily.to_csv(tmp_path / 'fixture.csv')
+    report = run_benchmarks(sizes=[300], fixture=str(tmp_path / 'fixture.csv'), repeat=2)
+
+    rows = {(r['dataset'], r['bars'], r['stage']): r for r in report['results']}
+    for dataset in ('synthetic', 'fixture'):
+        for stage in ('load', 'validate', 'indicators', 'analyze', 'render'):
+            r = rows[(dataset, 300, stage)]
+            assert 0 < r['p50_ms'] <= r['p95_ms']
+            assert r['peak_kb'] > 0
+    assert report['meta']['repeat'] == 2
+
+
+def test_compare_flags_slower_stages():
+    def report(p50):
+        return {'results': [{'dataset': 'synthetic', 'bars': 400, 'stage': s, 'p50_ms': v}
+                            for s, v in p50.items()]}
+
+    diff = compare(report({'load': 1.2, 'indicators': 1.3}), report({'load': 1.0, 'indicators': 1.0, 'render': 5.0}))
+    assert dict(zip(diff['stage'], diff['regression'])) == {'load': False, 'indicators': True}
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    out = tmp_path / 'bench.json'
+    assert main(['--sizes', '300', '--repeat', '1', '--out', str(out)]) == 0
+    baseline = json.loads(out.read_text())
+    for r in baseline['results']:
+        r['p50_ms'] /= 100  # 이전 결과가 100배 빨랐다고 가정
+    (tmp_path / 'base.json').write_text(json.dumps(baseline))
+    assert main(['--sizes', '300', '--repeat', '1', '--compare', str(tmp_path / 'base.json')]) == 1
+    assert 'regression' in capsys.readouterr().out
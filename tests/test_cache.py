@@ -0,0 +1,47 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from tqqq_sniper.cache import SharedCache
+
+
+def _later(seconds=60):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def test_concurrent_requests_compute_once():
+    cache = SharedCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute, _later())))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+
+
+def test_key_locks_do_not_accumulate():
+    cache = SharedCache()
+    for i in range(100):
+        cache.get_or_compute(('chart', i), lambda: i, _later(-1))  # 바로 만료되는 키
+        cache.get_or_compute(('failed', i), lambda: None, _later())  # 실패는 저장하지 않음
+    assert cache._key_locks == {}
+    assert len(cache._entries) <= 1
+
+
+def test_expiry_can_depend_on_the_value():
+    cache = SharedCache()
+    # 잠정 결과는 바로 만료되어 다음 요청이 다시 계산
+    expiry = lambda value: _later(-1 if value == 'provisional' else 60)
+    assert cache.get_or_compute('k', lambda: 'provisional', expiry) == 'provisional'
+    assert cache.get_or_compute('k', lambda: 'final', expiry) == 'final'
+    assert cache.get_or_compute('k', lambda: 'again', expiry) == 'final'
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from tqqq_sniper.chart import POINT_BUDGET, build_chart, candle_interval, data_version, lttb, resample_ohlc
+from tqqq_sniper.compact import CompactFrame
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, calculate_indicators
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_plotly_is_loaded_only_when_a_chart_is_built():
+    script = ("import sys; import tqqq_sniper.chart, tqqq_sniper.analyzer, tqqq_sniper.snapshot; "
+              "print('plotly' in sys.modules)")
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    out = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == 'False'
+
+
+def test_data_version_is_shared_by_frame_and_compact_frame(daily):
+    ind = calculate_indicators(daily)
+    compact = CompactFrame.from_frame(ind)
+    assert data_version(ind) == data_version(compact)
+
+    moved = ind.copy()
+    moved.iloc[-1, moved.columns.get_loc('Close')] *= 1.01  # 장중 갱신된 마지막 봉
+    assert data_version(moved) != data_version(ind)
+    assert data_version(ind.iloc[:-1]) != data_version(ind)
+
+
+def test_build_chart_from_compact_frame(daily):
+    ind = calculate_indicators(daily)
+    fig = build_chart(CompactFrame.from_frame(ind), DEFAULT_MA_PERIODS)
+    names = [trace.name for trace in fig.data]
+    assert names == ['TQQQ'] + [f'MA{p}' for p in DEFAULT_MA_PERIODS] + ['%K', '%D']
+    assert fig.data[0].x[-1] == ind.index[-1]
+
+
+def test_default_window_is_the_last_80_bars(daily):
+    ind = calculate_indicators(daily)
+    fig = build_chart(ind, DEFAULT_MA_PERIODS)
+    for trace in fig.data:
+        assert list(trace.x) == list(ind.index[-80:])
+    np.testing.assert_array_equal(fig.data[0].close, ind['Close'].iloc[-80:])
+
+
+def test_long_lookbacks_stay_within_the_point_budget(daily):
+    ind = calculate_indicators(daily)
+    fig = build_chart(ind, DEFAULT_MA_PERIODS, 'MAX', budget=200)
+    assert len(ind) > 200
+    assert candle_interval(len(ind), 200) == 'W'
+    for trace in fig.data:
+        assert len(trace.x) <= 200
+        assert trace.x[-1] == ind.index[-1]
+    assert candle_interval(POINT_BUDGET * 5 + 1) == 'M'
+    assert candle_interval(POINT_BUDGET) is None
+
+
+def test_resample_ohlc_weekly(daily):
+    index = daily.index[:20]
+    o, h, l, c = (daily[f].to_numpy()[:20] for f in ('Open', 'High', 'Low', 'Close'))
+    x, wo, wh, wl, wc = resample_ohlc(index, o, h, l, c, 'W')
+
+    weekly = daily.iloc[:20].groupby(index.to_period('W'))
+    assert list(x) == [week.index[-1] for _, week in weekly]
+    np.testing.assert_array_equal(wo, weekly['Open'].first())
+    np.testing.assert_array_equal(wh, weekly['High'].max())
+    np.testing.assert_array_equal(wl, weekly['Low'].min())
+    np.testing.assert_array_equal(wc, weekly['Close'].last())
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 2000))
+    y[1234] = 5.0
+    keep = lttb(y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert (np.diff(keep) > 0).all()
+    assert 1234 in keep
+    np.testing.assert_array_equal(lttb(y[:50], 100), np.arange(50))
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tqqq_sniper.cli import main
+from tqqq_sniper.validate import OHLC
+
+
+def _signal(capsys, path, *extra):
+    assert main(['signal', '--json', '--prices', str(path), *extra]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_price_file_goes_through_validation(tmp_path, monkeypatch, capsys, daily):
+    monkeypatch.chdir(tmp_path)
+    adjusted = daily.copy()
+    adjusted[OHLC] /= 2
+    adjusted.to_csv(tmp_path / 'adjusted.csv')
+    unadjusted = adjusted.copy()
+    unadjusted.iloc[:700, unadjusted.columns.get_indexer(OHLC)] *= 2  # 수정되지 않은 2:1 분할
+    unadjusted.to_csv(tmp_path / 'unadjusted.csv')
+
+    expected = _signal(capsys, tmp_path / 'adjusted.csv')
+    actual = _signal(capsys, tmp_path / 'unadjusted.csv')
+    assert actual['date'] == expected['date']
+    assert actual['action'] == expected['action']
+    for key in ('price', 'stoch_k', 'stoch_d', 'tqqq'):
+        assert actual[key] == pytest.approx(expected[key], rel=1e-9)
+
+
+def test_price_file_path_has_no_store_side_effects(tmp_path, daily):
+    # 파일만 읽는 경로는 저장소 파일을 만들지 않고 http.server도 불러오지 않음 (새 프로세스에서 확인)
+    daily.to_csv(tmp_path / 'prices.csv')
+    script = ("import sys; from tqqq_sniper.cli import main; "
+              "code = main(['signal', '--json', '--prices', 'prices.csv']); "
+              "print(code, 'http.server' in sys.modules)")
+    env = {**os.environ, 'PYTHONPATH': os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}
+    env.pop('TQQQ_STORE_PATH', None)
+    out = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.splitlines()[-1] == '0 False'
+    assert sorted(os.listdir(tmp_path)) == ['prices.csv']
+
+
+def test_signal_text_and_order_output(tmp_path, monkeypatch, capsys, daily):
+    monkeypatch.chdir(tmp_path)
+    daily.to_csv(tmp_path / 'prices.csv')
+    payload = _signal(capsys, tmp_path / 'prices.csv')
+
+    assert main(['signal', '--prices', 'prices.csv']) == 0
+    text = capsys.readouterr().out.splitlines()
+    assert text[0].startswith(f"TQQQ {daily.index[-1]:%Y.%m.%d} ${payload['price']:.2f}")
+    assert text[2].startswith(f"ACTION  {payload['action_text']}")
+
+    # 보유 100주 + 현금 → 목표 비중에 맞춰 lot 단위 주문 (수수료 없음)
+    order = _signal(capsys, tmp_path / 'prices.csv', '--cash', '5000', '--shares', '100', '--lot', '5')['order']
+    value = 5000 + 100 * payload['price']
+    target = (value * payload['tqqq'] / payload['price'] / 5 + 0.5) // 1 * 5
+    assert order['shares'] == target - 100 != 0
+    assert order['position'] == target
+    assert order['cash'] == pytest.approx(5000 - order['shares'] * payload['price'], abs=0.01)
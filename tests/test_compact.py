@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.compact import CompactFrame
+from tqqq_sniper.indicators import calculate_indicators
+
+
+@pytest.fixture
+def ind(daily):
+    return calculate_indicators(daily)
+
+
+def test_round_trip_within_float32_precision(ind):
+    compact = CompactFrame.from_frame(ind)
+    assert len(compact) == len(ind)
+    assert compact.columns == tuple(ind.columns)
+    assert '%K' in compact and 'Volume' not in compact
+
+    frame = compact.to_frame()
+    assert frame.index.equals(ind.index)
+    assert (frame.dtypes == np.float64).all()
+    pd.testing.assert_frame_equal(frame, ind.astype(np.float32).astype(np.float64), check_freq=False)
+    np.testing.assert_allclose(frame.to_numpy(), ind.to_numpy(), rtol=1e-6)
+
+
+def test_columns_are_read_only_views_at_half_the_memory(ind):
+    compact = CompactFrame.from_frame(ind)
+    close = compact['Close']
+    assert close.dtype == np.float32
+    assert np.shares_memory(close, compact.values)
+    with pytest.raises(ValueError):
+        close[0] = 0.0
+    assert compact.values.nbytes * 2 == ind.to_numpy().nbytes
+    assert compact.nbytes < ind.memory_usage(deep=True).sum()
+
+
+def test_tail(ind):
+    compact = CompactFrame.from_frame(ind)
+    tail = compact.tail(80)
+    assert tail.index.equals(ind.index[-80:])
+    np.testing.assert_allclose(tail['%D'], ind['%D'].iloc[-80:], rtol=1e-6)
+    assert len(compact.tail(10 ** 6)) == len(ind)
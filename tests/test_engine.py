@@ -0,0 +1,39 @@
+import numpy as np
+
+from tqqq_sniper.engine import BUY, HOLD, SELL, allocation_from_arrays, compute_allocation
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, calculate_indicators
+
+
+def _row_rule(row, ma_periods):
+    """기존 analyze()의 한 행 규칙 — 상승 국면은 MA 개당 25%, 하락 국면은 MA20 · MA45 개당 50%"""
+    above = {p: row['Close'] > row[f'MA{p}'] for p in ma_periods}
+    if row['%K'] > row['%D']:
+        return sum(above.values()) * 0.25
+    return (int(above[20]) + int(above[45])) * 0.5
+
+
+def test_every_row_matches_the_single_row_rule(daily):
+    ind = calculate_indicators(daily)
+    alloc = compute_allocation(ind, DEFAULT_MA_PERIODS)
+
+    expected = np.array([_row_rule(row, DEFAULT_MA_PERIODS) for _, row in ind.iterrows()])
+    np.testing.assert_array_equal(alloc['TQQQ'].to_numpy(), expected)
+    np.testing.assert_array_equal(alloc['Cash'].to_numpy(), 1 - expected)
+    np.testing.assert_array_equal(alloc['PrevTQQQ'].to_numpy()[1:], expected[:-1])
+
+    change = np.diff(expected)
+    action = np.where(change > 0.01, BUY, np.where(change < -0.01, SELL, HOLD))
+    np.testing.assert_array_equal(alloc['Action'].to_numpy()[1:], action)
+    assert alloc['Action'].iloc[0] == HOLD
+    assert {BUY, SELL} <= set(alloc['Action'])
+
+
+def test_wide_input_matches_each_column(daily):
+    ind = calculate_indicators(daily)
+    cols = [ind, ind.iloc[::-1].set_axis(ind.index)]
+    k, d, close = (np.column_stack([c[f].to_numpy() for c in cols]) for f in ('%K', '%D', 'Close'))
+    ma = np.stack([np.column_stack([c[f'MA{p}'].to_numpy() for c in cols]) for p in DEFAULT_MA_PERIODS])
+
+    wide = allocation_from_arrays(k, d, close, ma)
+    for j in range(len(cols)):
+        np.testing.assert_array_equal(wide[:, j], allocation_from_arrays(k[:, j], d[:, j], close[:, j], ma[:, :, j]))
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from tqqq_sniper.execution import run_execution, simulate_accounts, synthetic_accounts
+
+
+def test_empty_account_stays_finite(daily):
+    close = daily['Close'].to_numpy()
+    target = np.where(np.arange(len(close)) % 40 < 20, 1.0, 0.25)
+    funded = simulate_accounts(close, target, cash=[5e4, 1e5], lot=1, band=0.02, fee_bps=1.0)
+    mixed = simulate_accounts(close, target, cash=[5e4, 0.0, 1e5], lot=1, band=0.02, fee_bps=1.0)
+
+    for key, value in mixed.items():
+        assert np.isfinite(value).all(), key
+        # 빈 계좌가 끼어도 다른 계좌 결과는 그대로
+        np.testing.assert_array_equal(value[[0, 2]], funded[key])
+    assert mixed['final'][1] == 0
+    assert mixed['cash_drag'][1] == 0
+    assert mixed['max_drawdown'][1] == 0
+
+
+def test_run_execution_rejects_unfunded_accounts(daily):
+    accounts = synthetic_accounts(4, [0.0], [1])
+    accounts.loc[2, 'cash'] = 0.0
+    with pytest.raises(ValueError):
+        run_execution(daily, accounts)
+    with pytest.raises(ValueError):
+        synthetic_accounts(4, [0.0], [1], size_range=(0.0, 1e3))
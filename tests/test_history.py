@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.history import SignalHistory
+from tqqq_sniper.providers import OHLC_COLUMNS
+
+STOCH = {'period': 60, 'k_period': 10, 'd_period': 3}
+PERIODS = [5, 20, 45, 100]
+
+
+@pytest.fixture
+def history(tmp_path):
+    return SignalHistory(str(tmp_path / 'bars.sqlite'), STOCH, PERIODS)
+
+
+def _rebuilt(tmp_path, bars):
+    """같은 일봉으로 처음부터 만든 이력"""
+    fresh = SignalHistory(str(tmp_path / 'fresh.sqlite'), STOCH, PERIODS)
+    fresh.update('TQQQ', bars)
+    return fresh.range('TQQQ')
+
+
+def _assert_history(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+
+def _no_rebuild(history, monkeypatch):
+    monkeypatch.setattr(history, 'delete', lambda ticker: pytest.fail('이력 전체를 다시 만듦'))
+
+
+def test_incremental_append(tmp_path, history, daily, monkeypatch):
+    history.update('TQQQ', daily.iloc[:-10])
+    _no_rebuild(history, monkeypatch)
+    assert history.update('TQQQ', daily) == 12  # 기준 봉 + 마지막 저장 봉 + 새 봉 10개
+    _assert_history(history.range('TQQQ'), _rebuilt(tmp_path, daily))
+
+
+def test_partial_bar_is_overwritten(tmp_path, history, daily, monkeypatch):
+    partial = daily.copy()
+    partial.iloc[-1, partial.columns.get_loc('Close')] *= 1.03  # 장중에 기록된 미완성 봉
+    history.update('TQQQ', partial)
+    _no_rebuild(history, monkeypatch)
+    assert history.update('TQQQ', daily) == 2
+    _assert_history(history.range('TQQQ'), _rebuilt(tmp_path, daily))
+
+
+def test_adjustment_rebuilds(tmp_path, history, daily):
+    history.update('TQQQ', daily.iloc[:-5])
+    adjusted = daily.copy()
+    adjusted[OHLC_COLUMNS] *= 0.98  # 배당으로 과거 수정주가 전체가 바뀜
+    history.update('TQQQ', adjusted)
+    result = history.range('TQQQ')
+    _assert_history(result, _rebuilt(tmp_path, adjusted))
+    np.testing.assert_allclose(result['Close'], adjusted['Close'].loc[result.index])
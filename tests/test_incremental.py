@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.engine import compute_allocation
+from tqqq_sniper.incremental import IncrementalIndicators, RollingExtreme, RollingMean
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG, calculate_indicators
+from tqqq_sniper.live import LiveAllocator
+
+STOCH = {'period': 60, 'k_period': 10, 'd_period': 3}
+PERIODS = [5, 20, 45]
+
+
+def _stream(data, stoch=STOCH, periods=PERIODS):
+    inc = IncrementalIndicators(stoch, periods)
+    rows = [inc.update(h, l, c) for h, l, c in zip(data['High'], data['Low'], data['Close'])]
+    return pd.DataFrame(rows, index=data.index)
+
+
+@pytest.mark.parametrize('stoch,periods', [(STOCH, PERIODS), (DEFAULT_STOCH_CONFIG, DEFAULT_MA_PERIODS)])
+def test_stream_matches_batch(daily, stoch, periods):
+    batch = calculate_indicators(daily, stoch, periods)
+    stream = _stream(daily, stoch, periods).dropna()
+    assert stream.index.equals(batch.index)
+    np.testing.assert_allclose(stream.to_numpy(), batch[stream.columns].to_numpy(), rtol=1e-10)
+
+    expected = compute_allocation(batch, periods)
+    actual = compute_allocation(stream, periods)
+    np.testing.assert_array_equal(actual['TQQQ'], expected['TQQQ'])
+    np.testing.assert_array_equal(actual['Action'], expected['Action'])
+
+
+def test_nan_bar_poisons_windows_like_batch(daily):
+    daily = daily.copy()
+    daily.iloc[400, daily.columns.get_loc('Close')] = np.nan
+    daily.iloc[550, daily.columns.get_loc('High')] = np.nan
+    batch = calculate_indicators(daily, STOCH, PERIODS)
+    stream = _stream(daily).dropna()
+    assert stream.index.equals(batch.index)
+    np.testing.assert_allclose(stream.to_numpy(), batch[stream.columns].to_numpy(), rtol=1e-10)
+
+
+def test_preview_matches_batch_with_bar_appended(daily):
+    live = LiveAllocator(daily.iloc[:-1], STOCH, PERIODS)
+    bar = daily.iloc[-1]
+    row = live.indicators.preview(bar['High'], bar['Low'], bar['Close'])
+    last = calculate_indicators(daily, STOCH, PERIODS).iloc[-1]
+    for col in row:
+        assert row[col] == pytest.approx(last[col], rel=1e-12)
+
+
+def test_rolling_primitives_peek_equals_push():
+    x = np.random.default_rng(3).normal(size=50)
+    x[20] = np.nan
+    mean, high = RollingMean(7), RollingExtreme(7, 'max')
+    for v in x:
+        peeked = mean.peek(v), high.peek(v)
+        pushed = mean.push(v), high.push(v)
+        np.testing.assert_allclose(peeked, pushed, rtol=1e-12)
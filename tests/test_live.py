@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.engine import compute_allocation
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, calculate_indicators
+from tqqq_sniper.live import LiveAllocator, load_minute_bars
+from tqqq_sniper.market_calendar import trading_days
+
+
+def _minutes(day, start_price, seed):
+    """정규장 390개 분봉 (시각 인덱스, 랜덤워크)"""
+    index = pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=390, freq='min')
+    close = start_price * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, len(index))))
+    open_ = np.r_[start_price, close[:-1]]
+    return pd.DataFrame({
+        'Open': open_, 'High': np.maximum(open_, close) * 1.0005,
+        'Low': np.minimum(open_, close) * 0.9995, 'Close': close,
+    }, index=index.rename('Datetime'))
+
+
+def _daily_bar(minutes):
+    day = minutes.index[0].normalize()
+    return pd.DataFrame({
+        'Open': [minutes['Open'].iloc[0]], 'High': [minutes['High'].max()],
+        'Low': [minutes['Low'].min()], 'Close': [minutes['Close'].iloc[-1]],
+    }, index=pd.DatetimeIndex([day], name='Date'))
+
+
+def _assert_matches_batch(state, daily):
+    ind = calculate_indicators(daily)
+    last = ind.iloc[-1]
+    alloc = compute_allocation(ind, DEFAULT_MA_PERIODS)
+    assert state['session'] == daily.index[-1]
+    assert state['price'] == last['Close']
+    assert state['stoch_k'] == pytest.approx(last['%K'], rel=1e-12)
+    assert state['stoch_d'] == pytest.approx(last['%D'], rel=1e-12)
+    assert state['tqqq'] == alloc['TQQQ'].iloc[-1]
+    assert state['base_tqqq'] == alloc['TQQQ'].iloc[-2]
+
+
+def test_minute_replay_matches_batch_recompute(tmp_path, daily):
+    daily = daily[['Open', 'High', 'Low', 'Close']]
+    days = trading_days(daily.index[-1] + pd.Timedelta(days=1), daily.index[-1] + pd.Timedelta(days=10))[:2]
+    first = _minutes(days[0], daily['Close'].iloc[-1], seed=5)
+    second = _minutes(days[1], first['Close'].iloc[-1], seed=6)
+    path = tmp_path / 'TQQQ_1m.csv'
+    pd.concat([first, second]).to_csv(path)
+    replayed = load_minute_bars(str(path))
+
+    live = LiveAllocator(daily)
+    state = live.consume(replayed[replayed.index < days[1]])
+    daily = pd.concat([daily, _daily_bar(first)])
+    _assert_matches_batch(state, daily)
+
+    # 다음 세션 분봉이 오면 전일 잠정 봉을 확정 반영
+    state = live.consume(replayed)
+    _assert_matches_batch(state, pd.concat([daily, _daily_bar(second)]))
+    assert live.last_date == days[0]
@@ -0,0 +1,63 @@
+import json
+import logging
+from urllib.request import urlopen
+
+import pytest
+
+from tqqq_sniper import metrics
+from tqqq_sniper.metrics import MetricsRegistry, RunTimer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(metrics, '_server', None)
+    server = metrics.start_metrics_server(0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_metrics_server_binds_to_localhost_by_default(server):
+    host, port = server.server_address
+    assert host == '127.0.0.1'
+    metrics.registry.inc('cache_requests', cache='test', result='hit')
+    with urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+        assert response.status == 200
+        assert 'cache_requests' in response.read().decode()
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.observe('stage', 0.5, stage='load')
+    registry.observe('stage', 1.5, stage='load')
+    registry.inc('cache_requests', cache='TQQQ', result='hit')
+    registry.inc('cache_requests', 2, cache='TQQQ', result='hit')
+    lines = registry.render_prometheus().splitlines()
+
+    assert 'tqqq_stage_seconds_count{stage="load"} 2' in lines
+    assert 'tqqq_stage_seconds_sum{stage="load"} 2.000000' in lines
+    assert 'tqqq_stage_seconds_max{stage="load"} 1.500000' in lines
+    assert 'tqqq_stage_seconds_last{stage="load"} 1.500000' in lines
+    assert 'tqqq_cache_requests_total{cache="TQQQ",result="hit"} 3' in lines
+
+
+def test_run_timer_logs_one_structured_line(monkeypatch, caplog):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    run = RunTimer()
+    with run.stage('get_data'):
+        pass
+    try:
+        with run.stage('analyze'):
+            raise RuntimeError
+    except RuntimeError:
+        pass  # 실패한 단계도 기록
+    with caplog.at_level(logging.INFO, logger='tqqq_sniper.metrics'):
+        total = run.finish(cache='hit')
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['event'] == 'rerun' and record['cache'] == 'hit'
+    assert list(record['stages']) == ['get_data', 'analyze']
+    timings, _ = registry.snapshot()
+    assert {dict(labels)['stage'] for _, labels in timings} == {'get_data', 'analyze', 'rerun'}
+    assert timings[('stage', (('stage', 'rerun'),))][3] == total
@@ -0,0 +1,11 @@
+from tqqq_sniper.params import chunks, random_params
+
+
+def test_chunks_cover_every_combo_grouped_by_period():
+    combos = random_params(50, period_range=(50, 55), seed=3)
+    batches = chunks(combos, workers=3)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(combos)))
+    # 순번을 따라 펼치면 스토캐스틱 기간 순 — 같은 기간은 이웃한 묶음에 모임
+    keys = [(combos[i][0]['period'], combos[i][0]['k_period']) for batch in batches for i in batch]
+    assert keys == sorted(keys)
+    assert len(batches) > 1
@@ -0,0 +1,63 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from tqqq_sniper import providers
+from tqqq_sniper.providers import ProviderError, RetryPolicy
+
+
+class _NoPool:
+    def submit(self, *args, **kwargs):
+        raise AssertionError('bounded 호출이 타임아웃 스레드 풀을 사용함')
+
+
+def test_bounded_call_runs_in_caller_thread_and_retries(monkeypatch):
+    monkeypatch.setattr(providers, '_call_pool', _NoPool())
+    calls = []
+
+    def flaky():
+        calls.append(threading.current_thread())
+        if len(calls) < 3:
+            raise ConnectionError('일시 오류')
+        return 'ok'
+
+    assert RetryPolicy(attempts=3, backoff=0).call(flaky, bounded=True) == 'ok'
+    assert calls == [threading.current_thread()] * 3
+
+
+def test_bounded_call_retries_socket_timeouts(monkeypatch):
+    monkeypatch.setattr(providers, '_call_pool', _NoPool())
+    calls = []
+
+    def hung():
+        calls.append(1)
+        raise TimeoutError('timed out')  # urlopen · 소켓 읽기 타임아웃
+
+    with pytest.raises(ProviderError, match='timed out'):
+        RetryPolicy(attempts=2, backoff=0).call(hung, bounded=True)
+    assert len(calls) == 2
+
+
+def test_unbounded_call_times_out():
+    started = time.perf_counter()
+    with pytest.raises(ProviderError):
+        RetryPolicy(attempts=1, timeout=0.05).call(time.sleep, 0.5)
+    assert time.perf_counter() - started < 0.4
+
+
+def test_http_provider_times_out_on_the_request(monkeypatch):
+    pytest.importorskip('requests')
+    monkeypatch.setattr(providers, '_call_pool', _NoPool())
+    # 연결은 받지만 응답하지 않는 서버
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    url = f'http://127.0.0.1:{server.getsockname()[1]}/bars/{{ticker}}'
+    provider = providers.HttpJsonProvider(url, retry=RetryPolicy(attempts=2, timeout=0.1, backoff=0))
+    started = time.perf_counter()
+    with pytest.raises(ProviderError):
+        provider.fetch('TQQQ', '2024-01-01')
+    assert time.perf_counter() - started < 2
+    server.close()
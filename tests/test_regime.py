@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from tqqq_sniper.engine import compute_allocation
+from tqqq_sniper.indicators import DEFAULT_MA_PERIODS, calculate_indicators
+from tqqq_sniper.regime import STALE_DAYS, align_closes, compute_defensive, rule_assets
+
+from conftest import calendar_ohlc
+
+
+def _setup(daily):
+    ind = calculate_indicators(daily)
+    tqqq = compute_allocation(ind, DEFAULT_MA_PERIODS)['TQQQ']
+    closes = pd.DataFrame({
+        t: calendar_ohlc(len(daily), seed=10 + i)['Close'] for i, t in enumerate(rule_assets())
+    })
+    return ind, tqqq, closes
+
+
+def test_weights_sum_to_one(daily):
+    ind, tqqq, closes = _setup(daily)
+    out = compute_defensive(ind, tqqq, closes)
+    np.testing.assert_allclose(out.sum(axis=1) + tqqq, 1.0)
+    bull = (ind['%K'] > ind['%D']).to_numpy()
+    # 상승 국면은 규칙이 없어 비TQQQ 몫이 전부 현금
+    np.testing.assert_allclose(out['Cash'].to_numpy()[bull], 1 - tqqq.to_numpy()[bull])
+
+
+def test_stale_asset_goes_to_fallback(daily):
+    ind, tqqq, closes = _setup(daily)
+    # 꾸준히 오르던 TLT 공급만 30거래일 전에 끊김 — 다른 자산은 계속 찍힘 (이어 붙이면 MA 위에 머무는 값)
+    closes['TLT'] = np.linspace(50, 100, len(closes))
+    closes.loc[closes.index[-30]:, 'TLT'] = np.nan
+    out = compute_defensive(ind, tqqq, closes)
+
+    stale = out.index > closes['TLT'].last_valid_index() + pd.Timedelta(days=STALE_DAYS)
+    assert stale.sum() > 0
+    assert (out.loc[stale, 'TLT'] == 0).all()
+    bear = (ind['%K'] <= ind['%D']).to_numpy() & stale
+    # 끊긴 자산 몫은 fallback(SHV)으로, 현금은 남지 않음
+    np.testing.assert_allclose(out.loc[bear, 'Cash'], 0.0)
+    np.testing.assert_allclose(out.sum(axis=1) + tqqq, 1.0)
+
+
+def test_stale_fallback_leaves_cash(daily):
+    ind, tqqq, closes = _setup(daily)
+    closes.loc[closes.index[-30]:, 'SHV'] = np.nan
+    out = compute_defensive(ind, tqqq, closes)
+    stale = out.index > closes['SHV'].last_valid_index() + pd.Timedelta(days=STALE_DAYS)
+    assert (out.loc[stale, 'SHV'] == 0).all()
+    np.testing.assert_allclose(out.sum(axis=1) + tqqq, 1.0)
+
+
+def test_ma_recovers_right_after_a_data_gap(daily):
+    _, _, closes = _setup(daily)
+    # TLT만 10거래일 공급이 끊겼다가 재개 — 공백 동안은 신선도로 꺼지고, 재개 직후부터 MA는 자기 히스토리 기준
+    gap = closes.index[-300:-290]
+    closes.loc[gap, 'TLT'] = np.nan
+    close, ma = align_closes(closes, closes.index, [20, 200])
+
+    j = list(closes.columns).index('TLT')
+    own = closes['TLT'].dropna()
+    expected = own.rolling(200).mean().reindex(closes.index).ffill().to_numpy()
+    stale = np.isnan(close[:, j])
+    assert stale.any() and stale[-289:].sum() == 0
+    np.testing.assert_allclose(ma[1, ~stale, j], expected[~stale])
+    assert not np.isnan(ma[1, -289:, j]).any()
+    assert np.isnan(ma[1, stale, j]).all()
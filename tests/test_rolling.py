@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper import rolling
+
+MODES = ['0', pytest.param('1', marks=pytest.mark.skipif(rolling._jit() is None, reason='numba 없음'))]
+
+
+@pytest.fixture(params=MODES, ids=['pandas', 'numba'])
+def mode(request, monkeypatch):
+    monkeypatch.setattr(rolling, 'NUMBA_MODE', request.param)
+    return request.param
+
+
+def _gappy(shape, seed=0):
+    x = np.random.default_rng(seed).normal(100, 5, size=shape)
+    x[0] = np.nan
+    x[40:47] = np.nan
+    x[300] = np.nan
+    x[400:420] = 101.25  # 같은 값 연속 구간
+    return x
+
+
+@pytest.mark.parametrize('window', [1, 5, 60])
+def test_rolling_matches_pandas(mode, window):
+    x = _gappy((500, 3))
+    frame = pd.DataFrame(x)
+    for fn, how in [(rolling.rolling_mean, 'mean'), (rolling.rolling_max, 'max'), (rolling.rolling_min, 'min')]:
+        expected = getattr(frame.rolling(window), how)().to_numpy()
+        np.testing.assert_array_equal(fn(x, window), expected)
+        np.testing.assert_array_equal(fn(x[:, 0], window), expected[:, 0])
+
+
+def test_indicator_block_matches_pandas(mode, daily):
+    daily = daily.copy()
+    daily.iloc[100:103, daily.columns.get_loc('High')] = np.nan
+    daily.iloc[250, daily.columns.get_loc('Close')] = np.nan
+    stoch = {'period': 60, 'k_period': 10, 'd_period': 3}
+    periods = [1, 20, 45]
+    block = rolling.indicator_block(daily['High'], daily['Low'], daily['Close'], stoch, periods)
+
+    hh = daily['High'].rolling(60).max()
+    ll = daily['Low'].rolling(60).min()
+    k = ((daily['Close'] - ll) / (hh - ll) * 100).rolling(10).mean()
+    expected = [hh, ll, k, k.rolling(3).mean()] + [daily['Close'].rolling(p).mean() for p in periods]
+    for row, series in zip(block, expected):
+        np.testing.assert_array_equal(row, series.to_numpy())
+
+
+def test_paths_agree_on_empty_input(mode):
+    assert rolling.rolling_mean(np.array([]), 3).shape == (0,)
+    assert rolling.indicator_block([], [], [], {'period': 3, 'k_period': 2, 'd_period': 2}, [2]).shape == (6, 0)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.analyzer import TQQQAnalyzer
+from tqqq_sniper.providers import MockProvider
+from tqqq_sniper.screener import screen, to_panel
+from tqqq_sniper.store import BarStore
+
+from conftest import calendar_ohlc
+
+
+def _frames(daily):
+    other = calendar_ohlc(len(daily), seed=7)
+    # SOXL만 최근 며칠이 빠짐 — 날짜는 TQQQ와의 합집합
+    gappy = other.drop(other.index[[-90, -60, -61, -20]])
+    return daily, other, gappy
+
+
+def test_missing_days_do_not_spread_through_other_ticker(daily):
+    tqqq, _, gappy = _frames(daily)
+    table = screen(to_panel({'TQQQ': tqqq, 'SOXL': gappy}))
+    alone = screen(to_panel({'SOXL': gappy}))
+
+    assert table.loc['SOXL', 'Date'] == gappy.index[-1]
+    pd.testing.assert_series_equal(table.loc['SOXL'], alone.loc['SOXL'])
+    pd.testing.assert_series_equal(table.loc['TQQQ'], screen(to_panel({'TQQQ': tqqq})).loc['TQQQ'])
+
+
+def test_panel_is_validated_per_ticker(tmp_path, daily):
+    tqqq, other, gappy = _frames(daily)
+    store = BarStore(str(tmp_path / 'bars.sqlite'))
+    store.write('TQQQ', tqqq)
+    store.write('SOXL', gappy)
+    analyzer = TQQQAnalyzer(store=store, provider=MockProvider({}), tickers=['TQQQ', 'SOXL'],
+                            aux_tickers=[], rules=[])
+    panel = analyzer.get_panel(days_back=4000, sync=False)
+
+    # 빠진 거래일은 직전 종가 보합 봉으로 채워져 두 티커가 같은 달력
+    close = panel['Close']
+    assert not close.isna().any().any()
+    missing = other.index[-61]
+    assert close.loc[missing, 'SOXL'] == other['Close'].iloc[-62]
+    np.testing.assert_array_equal(close['TQQQ'].to_numpy(), tqqq['Close'].to_numpy())
+
+
+def test_screen_matches_single_ticker_analysis(tmp_path, daily):
+    tqqq, other, _ = _frames(daily)
+    provider = MockProvider({'TQQQ': tqqq, 'SOXL': other})
+    analyzer = TQQQAnalyzer(store=BarStore(str(tmp_path / 'bars.sqlite')), provider=provider,
+                            tickers=['TQQQ', 'SOXL'], aux_tickers=[], rules=[])
+    table = analyzer.screen(analyzer.get_panel(days_back=4000))
+    # 두 티커 모두 처음 동기화 — 한 번의 전체 기간 요청 묶음
+    assert sorted(call[0] for call in provider.calls) == ['SOXL', 'TQQQ']
+
+    for ticker, data in (('TQQQ', tqqq), ('SOXL', other)):
+        r = analyzer.analyze(analyzer.calculate_indicators(data))
+        row = table.loc[ticker]
+        assert row['Date'] == r['date']
+        assert row['Close'] == r['price']
+        assert row['%K'] == pytest.approx(r['stoch_k'], rel=1e-12)
+        assert row['Allocation'] == r['tqqq']
+        assert row['PrevAllocation'] == r['prev_tqqq']
+        assert row['Action'] == r['action']
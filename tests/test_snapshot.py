@@ -0,0 +1,30 @@
+import json
+
+from tqqq_sniper.snapshot import SNAPSHOT_HTML, SNAPSHOT_JSON, main
+
+
+def test_snapshot_is_written_once_per_data_version(tmp_path, monkeypatch, capsys, daily):
+    monkeypatch.chdir(tmp_path)
+    daily.to_csv(tmp_path / 'prices.csv')
+    out = tmp_path / 'site'
+    argv = ['--prices', 'prices.csv', '--out', str(out)]
+
+    assert main(argv) == 0
+    assert '생성' in capsys.readouterr().out
+    bundle = json.loads((out / SNAPSHOT_JSON).read_text(encoding='utf-8'))
+    assert bundle['ticker'] == 'TQQQ'
+    assert bundle['signal']['date'] == f'{daily.index[-1]:%Y-%m-%d}'
+    assert [t['name'] for t in bundle['figure']['data']][:2] == ['TQQQ', 'MA20']
+    html = (out / SNAPSHOT_HTML).read_text(encoding='utf-8')
+    assert bundle['signal']['action_text'] in html
+
+    # 같은 데이터면 다시 쓰지 않고, 새 봉이 생기면 갱신
+    html_mtime = (out / SNAPSHOT_HTML).stat().st_mtime_ns
+    assert main(argv) == 0
+    assert '변경 없음' in capsys.readouterr().out
+    assert (out / SNAPSHOT_HTML).stat().st_mtime_ns == html_mtime
+
+    daily.iloc[:-1].to_csv(tmp_path / 'prices.csv')
+    assert main(argv) == 0
+    assert '생성' in capsys.readouterr().out
+    assert json.loads((out / SNAPSHOT_JSON).read_text(encoding='utf-8'))['signal']['date'] == f'{daily.index[-2]:%Y-%m-%d}'
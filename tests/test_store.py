@@ -0,0 +1,100 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from tqqq_sniper.analyzer import TQQQAnalyzer
+from tqqq_sniper.providers import OHLC_COLUMNS, FileProvider, MockProvider, ProviderError, normalize_ohlc
+from tqqq_sniper import store as store_module
+from tqqq_sniper.store import HISTORY_START, BarStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path / 'bars.sqlite'))
+
+
+def _assert_bars(actual, expected):
+    # 저장소에서 읽은 인덱스와 합성 데이터 인덱스의 datetime 단위(us · ns)만 다름
+    pd.testing.assert_frame_equal(actual, expected, check_index_type=False)
+
+
+def _set_close(store, ticker, date, close):
+    with sqlite3.connect(store.path) as con:
+        con.execute('UPDATE bars SET close = ? WHERE ticker = ? AND date = ?',
+                    (close, ticker, date.strftime('%Y-%m-%d')))
+
+
+def test_first_sync_loads_full_history_from_file(tmp_path, store, daily):
+    daily.to_csv(tmp_path / 'TQQQ.csv')
+    assert store.sync('TQQQ', FileProvider(str(tmp_path))) == len(daily)
+    _assert_bars(store.load('TQQQ'), normalize_ohlc(daily))
+    assert store.last_date('TQQQ') == daily.index[-1]
+
+
+def test_incremental_sync_rewrites_anchor_and_newer_bars(store, daily):
+    stored = daily.iloc[:-5].copy()
+    stored.iloc[-1, stored.columns.get_loc('Close')] *= 1.01  # 장중에 저장된 미완성 봉
+    store.write('TQQQ', stored)
+    anchor = stored.index[-2]
+    early = stored.index[10]
+    _set_close(store, 'TQQQ', early, -1.0)  # 다시 쓰면 사라지는 표식
+
+    provider = MockProvider({'TQQQ': daily})
+    assert store.sync('TQQQ', provider) == 7  # 기준 봉 + 미완성 봉 + 새 봉 5개
+    assert [call[1] for call in provider.calls] == [anchor]
+
+    loaded = store.load('TQQQ')
+    assert loaded.loc[early, 'Close'] == -1.0
+    _assert_bars(loaded.drop(early), normalize_ohlc(daily).drop(early))
+
+
+def test_adjusted_close_change_triggers_full_reload(store, daily):
+    store.write('TQQQ', daily.iloc[:-5])
+    adjusted = daily.copy()
+    adjusted[OHLC_COLUMNS] *= 0.98  # 배당으로 과거 수정주가 전체가 바뀜
+
+    provider = MockProvider({'TQQQ': adjusted})
+    assert store.sync('TQQQ', provider) == len(daily)
+    assert [call[1] for call in provider.calls] == [daily.index[-7], HISTORY_START]
+    _assert_bars(store.load('TQQQ'), normalize_ohlc(adjusted))
+
+
+def test_failed_reload_keeps_previous_bars(store, daily, monkeypatch):
+    store.write('TQQQ', daily.iloc[:-5])
+    adjusted = daily.copy()
+    adjusted[OHLC_COLUMNS] *= 0.98
+    # 중간에 실패하는 삽입 (같은 키 두 번) — 삭제까지 함께 되돌려져야 함
+    rows = store_module._rows
+    monkeypatch.setattr(store_module, '_rows', lambda ticker, data: rows(ticker, data) + rows(ticker, data)[:1])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        store.sync('TQQQ', MockProvider({'TQQQ': adjusted}))
+    _assert_bars(store.load('TQQQ'), normalize_ohlc(daily.iloc[:-5]))
+
+
+def test_failing_ticker_is_reported_without_blocking_others(store, daily):
+    provider = MockProvider({'TQQQ': daily, 'SHV': daily}, failing={'SHV'})
+    counts = store.sync_many(['TQQQ', 'SHV'], provider)
+    assert counts == {'TQQQ': len(daily), 'SHV': 0}
+    assert set(store.errors) == {'SHV'}
+
+
+def test_stale_ticker_gets_its_own_request(store, daily):
+    store.write('TQQQ', daily.iloc[:-5])
+    store.write('TLT', daily.iloc[:-5])
+    store.write('SHV', daily.iloc[:-200])
+    provider = MockProvider({t: daily for t in ('TQQQ', 'TLT', 'SHV')})
+    counts = store.sync_many(['TQQQ', 'TLT', 'SHV'], provider)
+    assert counts == {'TQQQ': 7, 'TLT': 7, 'SHV': 202}
+    assert sorted((t, start) for t, start, _ in provider.calls) == [
+        ('SHV', daily.index[-202]), ('TLT', daily.index[-7]), ('TQQQ', daily.index[-7]),
+    ]
+
+
+def test_empty_response_is_an_error(store, daily):
+    store.write('TQQQ', daily)
+    analyzer = TQQQAnalyzer(store=store, provider=MockProvider({}), aux_tickers=[], rules=[])
+    assert analyzer.get_data() is not None
+    assert isinstance(store.errors['TQQQ'], ProviderError)
+    assert analyzer.warnings
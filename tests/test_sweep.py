@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from tqqq_sniper.backtest import performance_stats, simulate
+from tqqq_sniper.engine import compute_allocation
+from tqqq_sniper.indicators import calculate_indicators
+from tqqq_sniper.params import param_grid, warmup_length
+from tqqq_sniper.sweep import STAT_COLUMNS, run_sweep
+
+COMBOS = param_grid([60, 90], [10], [3, 5], [[5, 20, 45, 100], [10, 30, 60, 120]])
+
+
+def _reference(daily, stoch, mas, first):
+    """조합 하나를 calculate_indicators → compute_allocation → simulate로 따로 평가"""
+    ind = calculate_indicators(daily, stoch, mas)
+    target = compute_allocation(ind, mas)['TQQQ'].reindex(daily.index)
+    executed = target.shift(1).to_numpy()[first:]
+    close = daily['Close'].to_numpy()[first:]
+    equity, _, trade, turnover = simulate(close, executed, 5.0, 5.0)
+    return performance_stats(equity, daily.index[first:], turnover, trade)
+
+
+def test_sweep_rows_match_single_backtests(daily):
+    table = run_sweep(daily, COMBOS, workers=1)
+    assert len(table) == len(COMBOS)
+    assert table['sharpe'].is_monotonic_decreasing
+    assert list(table.index[:2]) == [1, 2]
+
+    first = max(warmup_length(s, m) for s, m in COMBOS) + 1
+    for stoch, mas in COMBOS:
+        row = table[(table['period'] == stoch['period']) & (table['d_period'] == stoch['d_period'])
+                    & (table['ma_periods'] == ','.join(map(str, mas)))].iloc[0]
+        expected = _reference(daily, stoch, mas, first)
+        for column in STAT_COLUMNS:
+            assert row[column] == pytest.approx(expected[column], rel=1e-9), column
+
+
+def test_worker_pool_gives_the_same_table(daily):
+    single = run_sweep(daily, COMBOS, workers=1)
+    pooled = run_sweep(daily, COMBOS, workers=2)
+    np.testing.assert_allclose(pooled['sharpe'].to_numpy(), single['sharpe'].to_numpy())
+    assert sorted(map(tuple, pooled[['period', 'd_period', 'ma_periods']].to_numpy())) == \
+        sorted(map(tuple, single[['period', 'd_period', 'ma_periods']].to_numpy()))
+
+
+def test_empty_evaluation_window_is_an_error(daily):
+    with pytest.raises(ValueError):
+        run_sweep(daily.iloc[:100], COMBOS, workers=1)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tqqq_sniper.validate import OHLC, validate_bars
+
+
+def _kinds(report):
+    return report['issues'].reset_index().set_index('kind')
+
+
+def test_clean_bars_pass_unchanged(daily):
+    clean, report = validate_bars(daily)
+    pd.testing.assert_frame_equal(clean, daily, check_freq=False)
+    assert report['issues'].empty
+    assert not report['changed'].any()
+
+
+def test_spike_is_replaced_by_geometric_mean(daily):
+    day = daily.index[400]
+    bad = daily.copy()
+    bad.loc[day, OHLC] *= 1.6
+    clean, report = validate_bars(bad)
+
+    kinds = _kinds(report)
+    assert kinds.loc['spike', 'Date'] == day
+    expected = np.sqrt(daily['Close'].iloc[399] * daily['Close'].iloc[401])
+    np.testing.assert_allclose(clean.loc[day, OHLC], expected)
+    pd.testing.assert_frame_equal(clean.drop(day), daily.drop(day), check_freq=False)
+    assert report['changed'].sum() == 1
+
+
+@pytest.mark.parametrize('move', [0.0, 0.05, -0.06])
+def test_split_is_adjusted_even_on_a_volatile_day(daily, move):
+    # 분할일의 시장 움직임이 커도 (TQQQ 일간 변동성 수준) 2:1 분할로 인식
+    at = 500
+    bad = daily.copy()
+    bad.iloc[at, bad.columns.get_indexer(OHLC)] *= (1 + move) / (daily['Close'].iloc[at] / daily['Close'].iloc[at - 1])
+    bad.iloc[at + 1:, bad.columns.get_indexer(OHLC)] = daily.iloc[at + 1:][OHLC].to_numpy() \
+        * bad['Close'].iloc[at] / daily['Close'].iloc[at]
+    bad.iloc[at:, bad.columns.get_indexer(OHLC)] /= 2
+    clean, report = validate_bars(bad)
+
+    kinds = _kinds(report)
+    assert 'jump' not in kinds.index
+    assert kinds.loc['split', 'Date'] == daily.index[at]
+    assert kinds.loc['split', 'detail'] == '2:1'
+    # 분할 이전 가격만 절반으로 조정되고 분할 이후는 그대로
+    np.testing.assert_allclose(clean['Close'].to_numpy()[:at], bad['Close'].to_numpy()[:at] / 2)
+    np.testing.assert_array_equal(clean['Close'].to_numpy()[at:], bad['Close'].to_numpy()[at:])
+    assert clean['Close'].iloc[at] / clean['Close'].iloc[at - 1] == pytest.approx(1 + move)
+
+
+def test_crash_that_keeps_falling_is_only_flagged(daily):
+    # 분할 비율과 맞는 급락이어도 다음 날 또 급변하면 분할로 보지 않음
+    at = 500
+    bad = daily.copy()
+    bad.iloc[at:, bad.columns.get_indexer(OHLC)] /= 2
+    bad.iloc[at + 1:, bad.columns.get_indexer(OHLC)] *= 0.7
+    clean, report = validate_bars(bad)
+
+    assert set(report['issues']['kind']) == {'jump'}
+    pd.testing.assert_frame_equal(clean, bad, check_freq=False)
+
+
+def test_missing_session_is_filled_flat(daily):
+    day = daily.index[300]
+    clean, report = validate_bars(daily.drop(day))
+
+    assert clean.index.equals(daily.index)
+    prev = daily['Close'].iloc[299]
+    assert (clean.loc[day, OHLC] == prev).all()
+    kinds = _kinds(report)
+    assert kinds.loc['missing', 'Date'] == day
+    # 채운 봉을 창 안에 포함하는 지표만 영향 표시
+    affected = report['affected']
+    assert affected.loc[day:, 'Close'].sum() == 1
+    assert affected['HH'].sum() == min(166, len(daily) - 300)
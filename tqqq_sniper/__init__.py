@@ -0,0 +1 @@
+"""TQQQ Sniper 코어 패키지 (데이터 저장소 · 지표 · 시그널)"""
@@ -0,0 +1,349 @@
+"""시그널 변경 알림 데몬 — 종가 확정 후 (선택: 장중에도) 배분을 평가해 |change| > SIGNAL_THRESHOLD일 때만 알림
+
+확정 일봉은 저장소 증분 동기화 + 시그널 이력(signals 테이블) 증분 갱신을 그대로 사용하고,
+마지막으로 평가한 날짜는 같은 SQLite 파일에 보관해 재시작해도 같은 알림을 다시 보내지 않는다.
+평가 사이에는 다음 평가 시각까지 Event.wait로 잠들어 CPU를 쓰지 않는다.
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import urllib.request
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .analyzer import TQQQAnalyzer, action_text
+from .live import LIVE_POLL_SECONDS, LiveAllocator
+from .market_calendar import DATA_DELAY, NY, bar_expiry, is_market_open, next_open, previous_close
+from .metrics import registry
+from .providers import RetryPolicy, provider_from_spec
+from .store import BarStore, _Transaction
+from .validate import validate_bars
+
+logger = logging.getLogger(__name__)
+
+# 종가가 아직 공급자에 반영되지 않았을 때 다시 확인하는 간격 (초)
+RETRY_SECONDS = 300
+# 장중 분봉 조회 시작 전 확정 일봉 로드 기간 (지표 워밍업 포함)
+LIVE_DAYS_BACK = 400
+
+
+# -----------------------------------------------------------
+# 알림 전달 대상 (sink)
+# -----------------------------------------------------------
+class AlertSink:
+    """알림 전달 대상 — send(alert) 하나만 구현 (alert는 JSON 직렬화 가능한 dict)"""
+
+    name = 'sink'
+
+    def send(self, alert):
+        raise NotImplementedError
+
+
+class StdoutSink(AlertSink):
+    name = 'stdout'
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def send(self, alert):
+        print(alert['text'], file=self.stream or sys.stdout, flush=True)
+
+
+class FileSink(AlertSink):
+    """JSON Lines 파일에 한 줄씩 추가"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send(self, alert):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+
+class WebhookSink(AlertSink):
+    """JSON POST — 'text' 필드가 있어 Slack 호환 웹훅에도 그대로 쓸 수 있음"""
+
+    name = 'webhook'
+
+    def __init__(self, url, headers=None, retry=None):
+        self.url = url
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.retry = retry or RetryPolicy()
+
+    def _post(self, body):
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method='POST')
+        with urllib.request.urlopen(request, timeout=self.retry.timeout) as response:
+            response.read()
+
+    def send(self, alert):
+        self.retry.call(self._post, json.dumps(alert, ensure_ascii=False).encode('utf-8'), bounded=True)
+
+
+class MemorySink(AlertSink):
+    """보낸 알림을 리스트에 보관 — 테스트 · 재생 확인용"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self.alerts = []
+
+    def send(self, alert):
+        self.alerts.append(alert)
+
+
+def sink_from_spec(spec):
+    """설정 문자열 → sink: 'stdout' · 'memory' · 'file:<경로>' · 'http(s)://…'"""
+    if spec == 'stdout':
+        return StdoutSink()
+    if spec == 'memory':
+        return MemorySink()
+    if spec.startswith('file:'):
+        return FileSink(spec[len('file:'):])
+    if spec.startswith(('http://', 'https://')):
+        return WebhookSink(spec)
+    raise ValueError(f'알 수 없는 알림 대상: {spec}')
+
+
+# -----------------------------------------------------------
+# 평가 상태
+# -----------------------------------------------------------
+class AlertState:
+    """(티커, 파라미터)별 마지막으로 평가한 확정 일봉 날짜 — 일봉 저장소와 같은 SQLite 파일의 alert_state 테이블"""
+
+    def __init__(self, path, config):
+        self.path = path
+        self.config = config
+        with self._connect() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS alert_state (
+                    ticker TEXT NOT NULL,
+                    config TEXT NOT NULL,
+                    date   TEXT NOT NULL,
+                    PRIMARY KEY (ticker, config)
+                )
+            """)
+
+    def _connect(self):
+        return _Transaction(sqlite3.connect(self.path, timeout=30))
+
+    def get(self, ticker):
+        with self._connect() as con:
+            row = con.execute(
+                'SELECT date FROM alert_state WHERE ticker = ? AND config = ?', (ticker, self.config)
+            ).fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def set(self, ticker, date):
+        with self._connect() as con:
+            con.execute('INSERT OR REPLACE INTO alert_state VALUES (?, ?, ?)',
+                        (ticker, self.config, pd.Timestamp(date).strftime('%Y-%m-%d')))
+
+
+# -----------------------------------------------------------
+# 데몬
+# -----------------------------------------------------------
+class AlertDaemon:
+    """종가 확정 시각(bar_expiry)마다 시그널을 평가하고, intraday면 장중 LIVE_POLL_SECONDS마다 잠정 시그널도 평가"""
+
+    def __init__(self, analyzer, sinks, intraday=False, poll_seconds=LIVE_POLL_SECONDS,
+                 retry_seconds=RETRY_SECONDS):
+        self.analyzer = analyzer
+        self.ticker = analyzer.tickers[0]
+        self.sinks = list(sinks)
+        self.intraday = intraday
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.state = AlertState(analyzer.store.path, analyzer.history(update=False).config)
+        self.next_close_check = None
+        self._live = None
+        self._live_sent = None
+        self._stop = threading.Event()
+
+    def _alert(self, kind, date, action, tqqq, change, price, stoch_k, stoch_d, time=None):
+        alert = {
+            'ticker': self.ticker,
+            'kind': kind,
+            'date': pd.Timestamp(date).strftime('%Y-%m-%d'),
+            'time': time.isoformat() if time is not None else None,
+            'action': action,
+            'prev_tqqq': float(tqqq - change),
+            'tqqq': float(tqqq),
+            'change': float(change),
+            'price': float(price),
+            'stoch_k': float(stoch_k),
+            'stoch_d': float(stoch_d),
+        }
+        prefix = '[장중 잠정] ' if kind == 'intraday' else ''
+        alert['text'] = (f"{prefix}{self.ticker} {alert['date']} {action_text(alert)} "
+                         f"(비중 {alert['prev_tqqq']:.0%} → {alert['tqqq']:.0%}) · ${alert['price']:.2f}")
+        return alert
+
+    def _dispatch(self, alerts):
+        """알림을 순서대로 전송 — 전달된 알림 리스트 반환
+
+        sink 하나라도 받으면 전달로 보고, 어느 sink도 받지 못한 알림에서 멈춘다
+        (뒤 알림이 앞 알림을 앞질러 가지 않고, 호출 쪽이 그 알림부터 다시 시도).
+        """
+        sent = []
+        for alert in alerts:
+            delivered = not self.sinks
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                    result = 'ok'
+                    delivered = True
+                except Exception as e:
+                    logger.warning('%s 알림 전송 실패: %s', sink.name, e)
+                    result = 'error'
+                registry.inc('alerts_sent', sink=sink.name, kind=alert['kind'], result=result)
+            if not delivered:
+                break
+            sent.append(alert)
+        return sent
+
+    def evaluate_close(self, now=None):
+        """확정 일봉 평가 — 마지막 평가일 이후 시그널 변경일마다 알림, 보낸 알림 리스트 반환
+
+        처음 실행이면 가장 최근 확정일 하나만 평가한다 (과거 변경 이력을 한꺼번에 보내지 않음).
+        종가가 아직 반영되지 않았거나 어느 sink로도 전달하지 못한 알림이 있으면
+        retry_seconds 뒤 다시 확인하도록 예약한다 — 평가 상태는 전달하지 못한 알림 전날까지만 진행.
+        """
+        now = (now or datetime.now(NY)).astimezone(NY)
+        confirmed = pd.Timestamp(previous_close(now - DATA_DELAY).date())
+        with registry.timer('alert_evaluate', kind='close'):
+            self.analyzer.warnings.clear()
+            self.analyzer.get_data(sync=True)
+            history = self.analyzer.history()
+
+            last = self.state.get(self.ticker)
+            if last is None:
+                rows = history.range(self.ticker, end=confirmed).tail(1)
+            else:
+                rows = history.range(self.ticker, start=last + timedelta(days=1), end=confirmed)
+
+        alerts = [
+            self._alert('close', date, row['Action'], row['TQQQ'], row['Change'], row['Close'], row['%K'], row['%D'])
+            for date, row in rows[rows['Action'] != 'HOLD'].iterrows()
+        ]
+        sent = self._dispatch(alerts)
+        failed = len(sent) < len(alerts)
+        if failed:
+            rows = rows[rows.index < pd.Timestamp(alerts[len(sent)]['date'])]
+        if not rows.empty:
+            self.state.set(self.ticker, rows.index[-1])
+
+        latest = rows.index[-1] if not rows.empty else last
+        caught_up = not failed and latest is not None and latest >= confirmed
+        self.next_close_check = bar_expiry(now) if caught_up else now + timedelta(seconds=self.retry_seconds)
+        return sent
+
+    def evaluate_intraday(self, now=None):
+        """장중 잠정 평가 — 잠정 시그널(BUY/SELL/비중)이 바뀔 때만 알림 (잠정 시그널 취소도 알림)"""
+        now = (now or datetime.now(NY)).astimezone(NY)
+        session = pd.Timestamp(now.date())
+        with registry.timer('alert_evaluate', kind='intraday'):
+            if self._live is None or self._live[0] != session:
+                daily, _ = validate_bars(
+                    self.analyzer.store.load(self.ticker, start=session - timedelta(days=LIVE_DAYS_BACK)),
+                    self.analyzer.stoch_config, self.analyzer.ma_periods,
+                )
+                self._live = (session, LiveAllocator(daily, self.analyzer.stoch_config, self.analyzer.ma_periods,
+                                                     until=session))
+                self._live_sent = None
+            state = self._live[1].consume(self.analyzer.provider.fetch_intraday(self.ticker))
+        if state is None:
+            return []
+
+        current = (state['action'], round(state['tqqq'], 6))
+        prev = self._live_sent or ('HOLD', None)
+        if current == prev or (current[0] == 'HOLD' and prev[0] == 'HOLD'):
+            self._live_sent = current
+            return []
+        alerts = [self._alert('intraday', session, state['action'], state['tqqq'], state['change'], state['price'],
+                              state['stoch_k'], state['stoch_d'], time=state['time'])]
+        sent = self._dispatch(alerts)
+        if sent:
+            # 전달하지 못했으면 다음 폴링에서 다시 변경으로 판정
+            self._live_sent = current
+        return sent
+
+    def tick(self, now=None):
+        """지금 해야 할 평가를 실행하고 다음 깨어날 시각 반환 (평가 실패는 로그만 남기고 계속)"""
+        now = (now or datetime.now(NY)).astimezone(NY)
+        if self.next_close_check is None or now >= self.next_close_check:
+            try:
+                self.evaluate_close(now)
+            except Exception as e:
+                logger.warning('종가 평가 실패: %s', e)
+                self.next_close_check = now + timedelta(seconds=self.retry_seconds)
+        wake = self.next_close_check
+
+        if self.intraday:
+            if is_market_open(now):
+                try:
+                    self.evaluate_intraday(now)
+                except Exception as e:
+                    logger.warning('장중 평가 실패: %s', e)
+                wake = min(wake, now + timedelta(seconds=self.poll_seconds))
+            else:
+                wake = min(wake, next_open(now))
+        return wake
+
+    def run(self):
+        """stop()이 불릴 때까지 평가 · 대기 반복"""
+        logger.info('%s 알림 데몬 시작 (장중 평가: %s)', self.ticker, self.intraday)
+        while not self._stop.is_set():
+            wake = self.tick()
+            delay = (wake - datetime.now(NY)).total_seconds()
+            logger.info('다음 평가: %s', wake.isoformat(timespec='seconds'))
+            self._stop.wait(max(delay, 1.0))
+
+    def stop(self):
+        self._stop.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='시그널 변경 알림 데몬 (종가 확정 후 · 선택적으로 장중)')
+    parser.add_argument('--ticker', default='TQQQ')
+    parser.add_argument('--store', help='SQLite 저장소 경로 (기본: TQQQ_STORE_PATH)')
+    parser.add_argument('--provider', help='공급자 설정 (기본: TQQQ_PROVIDER)')
+    parser.add_argument('--sink', action='append',
+                        help="알림 대상 (반복 가능): 'stdout' · 'file:<경로>' · 'http(s)://…' (기본: stdout)")
+    parser.add_argument('--intraday', action='store_true', help='장중에도 분봉으로 잠정 시그널 평가')
+    parser.add_argument('--poll', type=int, default=LIVE_POLL_SECONDS, help='장중 평가 주기 (초)')
+    parser.add_argument('--once', action='store_true', help='한 번만 평가하고 종료 (cron 등 외부 스케줄러용)')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    analyzer = TQQQAnalyzer(
+        store=BarStore(args.store) if args.store else None,
+        provider=provider_from_spec(args.provider),
+        tickers=[args.ticker],
+        aux_tickers=[],
+    )
+    daemon = AlertDaemon(analyzer, [sink_from_spec(s) for s in args.sink or ['stdout']],
+                         intraday=args.intraday, poll_seconds=args.poll)
+    if args.once:
+        daemon.tick()
+        return 0
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+import logging
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .engine import ACTION_LABELS, compute_allocation
+from .history import SignalHistory
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG, calculate_indicators
+from .providers import provider_from_spec
+from .regime import DEFAULT_RULES, DEFENSIVE_FALLBACK, compute_defensive, rule_assets
+from .screener import screen, to_panel
+from .store import BarStore
+from .validate import indicator_windows, validate_bars
+
+logger = logging.getLogger(__name__)
+
+# 대시보드 보조 시계열 (기초지수 · 변동성)
+AUX_TICKERS = ['QQQ', '^VIX']
+
+
+class TQQQAnalyzer:
+    """데이터 로드 · 지표 · 배분 분석 (UI 비의존 — 경고는 logging과 self.warnings로 전달)"""
+
+    def __init__(self, store=None, provider=None, tickers=None, aux_tickers=None, rules=None,
+                 fallback=DEFENSIVE_FALLBACK):
+        self.tickers = list(tickers or ['TQQQ'])
+        self.aux_tickers = list(AUX_TICKERS if aux_tickers is None else aux_tickers)
+        # 하락 국면 현금 몫을 돌릴 방어 자산 규칙표 (빈 목록이면 현금 그대로)
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.fallback = fallback
+        self.stoch_config = dict(DEFAULT_STOCH_CONFIG)
+        self.ma_periods = list(DEFAULT_MA_PERIODS)
+        self._store = store
+        self.provider = provider or provider_from_spec()
+        self.warnings = []
+        # 마지막 get_data의 검증 리포트 (validate.validate_bars 참고)
+        self.validation = None
+
+    @property
+    def store(self):
+        """일봉 저장소 — 처음 쓸 때 기본 경로로 만듦 (파일만 읽는 경로는 data/bars.sqlite를 만들지 않음)"""
+        if self._store is None:
+            self._store = BarStore()
+        return self._store
+
+    def _warn(self, message):
+        logger.warning(message)
+        self.warnings.append(message)
+
+    def get_data(self, days_back=400, sync=True):
+        """TQQQ 데이터 가져오기 (로컬 저장소 증분 갱신, sync=False면 저장소만 사용, days_back=None이면 전체 히스토리)
+
+        보조 시계열 · 방어 자산도 같은 동기화에서 동시에 요청하며, 이들의 실패는 본 데이터에 영향을 주지 않는다.
+        """
+        start_date = datetime.now() - timedelta(days=days_back) if days_back else None
+        if sync:
+            primary = self.tickers[0]
+            extra = list(dict.fromkeys(self.aux_tickers + self.defensive_tickers))
+            try:
+                self.store.sync_many([primary] + extra, self.provider)
+                if primary in self.store.errors:
+                    raise self.store.errors[primary]
+            except Exception as e:
+                self._warn(f"최신 데이터 갱신 실패, 저장된 데이터 사용: {e}")
+            for ticker in extra:
+                if ticker in self.store.errors:
+                    logger.info('보조 시계열 %s 갱신 실패: %s', ticker, self.store.errors[ticker])
+        try:
+            df = self.store.load(self.tickers[0], start=start_date)
+            if df.empty:
+                return None
+            return self.validate(df)
+        except Exception as e:
+            self._warn(f"데이터 로드 실패: {e}")
+            return None
+
+    def validate(self, df):
+        """달력 · 이상치 · 분할 검증 후 보정된 일봉 — 최근 지표 창 안의 이슈만 경고로 올림 (파일 입력도 같은 경로)"""
+        data, self.validation = validate_bars(df, self.stoch_config, self.ma_periods)
+        issues = self.validation['issues']
+        if issues.empty or data.empty:
+            return data
+        logger.info('%s 일봉 검증 이슈 %d건: %s', self.tickers[0], len(issues),
+                    issues['kind'].value_counts().to_dict())
+        window = max(indicator_windows(self.stoch_config, self.ma_periods).values())
+        recent = issues[issues.index >= data.index[-min(window, len(data))]]
+        if not recent.empty:
+            detail = ', '.join(f"{date:%Y-%m-%d} {row.kind} {row.detail}".rstrip()
+                               for date, row in recent.iterrows())
+            self._warn(f"최근 일봉 이상 감지 · 보정 ({len(recent)}건): {detail}")
+        return data
+
+    def get_aux(self, days_back=30):
+        """보조 시계열 최근 종가 요약 — {티커: (종가, 전일 대비 %)}, 저장소에 없으면 제외"""
+        start_date = datetime.now() - timedelta(days=days_back)
+        summary = {}
+        for ticker in self.aux_tickers:
+            close = self.store.load(ticker, start=start_date)['Close']
+            if len(close) >= 2:
+                summary[ticker] = (close.iloc[-1], (close.iloc[-1] / close.iloc[-2] - 1) * 100)
+        return summary
+
+    @property
+    def defensive_tickers(self):
+        return rule_assets(self.rules, self.fallback) if self.rules else []
+
+    def get_defensive(self, start=None):
+        """방어 자산 종가 와이드 프레임 (저장소에 없는 자산은 빈 열) — MA 워밍업을 위해 start 이전 1년을 더 읽음"""
+        if start is not None:
+            start = pd.Timestamp(start) - timedelta(days=365)
+        return pd.DataFrame(
+            {t: self.store.load(t, start=start)['Close'] for t in self.defensive_tickers},
+            columns=self.defensive_tickers,
+        )
+
+    def get_panel(self, days_back=400, sync=True):
+        """전체 티커를 배치 요청 한 번으로 동기화 후 티커별로 검증한 와이드 패널 반환"""
+        start_date = datetime.now() - timedelta(days=days_back)
+        if sync:
+            try:
+                self.store.sync_many(self.tickers, self.provider)
+            except Exception as e:
+                self._warn(f"최신 데이터 갱신 실패, 저장된 데이터 사용: {e}")
+        # 티커마다 따로 검증 · 보정 (빠진 거래일 · 분할) 후 합침 — 지표는 티커별 날짜로 계산 (calculate_wide_indicators)
+        frames = {}
+        for ticker in self.tickers:
+            frames[ticker], report = validate_bars(self.store.load(ticker, start=start_date),
+                                                   self.stoch_config, self.ma_periods)
+            if not report['issues'].empty:
+                logger.info('%s 일봉 검증 이슈 %d건: %s', ticker, len(report['issues']),
+                            report['issues']['kind'].value_counts().to_dict())
+        panel = to_panel(frames)
+        return panel if not panel['Close'].empty else None
+
+    def history(self, update=True):
+        """시그널 이력 (일봉 저장소와 같은 파일) — update면 저장소의 최신 봉까지 이어 붙임"""
+        history = SignalHistory(self.store.path, self.stoch_config, self.ma_periods)
+        if update:
+            try:
+                history.sync(self.tickers[0], self.store)
+            except Exception as e:
+                self._warn(f"시그널 이력 갱신 실패: {e}")
+        return history
+
+    def screen(self, panel):
+        return screen(panel, self.stoch_config, self.ma_periods)
+
+    def calculate_indicators(self, data):
+        return calculate_indicators(data, self.stoch_config, self.ma_periods)
+
+    def analyze(self, data, defensive=None):
+        """마지막 봉의 배분 요약 — defensive(방어 자산 종가 와이드 프레임)를 주면 현금 몫을 규칙표대로 나눔"""
+        alloc = compute_allocation(data, self.ma_periods)
+        last = alloc.iloc[-1]
+        rotation = {}
+        cash = last['Cash']
+        if defensive is not None and self.rules:
+            tail = compute_defensive(data, alloc['TQQQ'], defensive, self.rules, self.fallback).iloc[-1]
+            cash = tail.pop('Cash')
+            rotation = tail.to_dict()
+        curr = data.iloc[-1]
+        prev = data.iloc[-2]
+
+        is_bullish = curr['%K'] > curr['%D']
+        ma_signals = {p: curr['Close'] > curr[f'MA{p}'] for p in self.ma_periods}
+
+        return {
+            'price': curr['Close'],
+            'prev_price': prev['Close'],
+            'price_change': curr['Close'] - prev['Close'],
+            'price_change_pct': (curr['Close'] - prev['Close']) / prev['Close'] * 100,
+            'tqqq': last['TQQQ'],
+            'cash': cash,
+            'defensive': rotation,
+            'prev_tqqq': last['PrevTQQQ'],
+            'change': last['Change'],
+            'action': ACTION_LABELS[int(last['Action'])],
+            'is_bullish': is_bullish,
+            'ma_signals': ma_signals,
+            'stoch_k': curr['%K'],
+            'stoch_d': curr['%D'],
+            'deviations': {p: curr[f'Dev{p}'] for p in self.ma_periods},
+            'ma_values': {p: curr[f'MA{p}'] for p in self.ma_periods},
+            'date': curr.name
+        }
+
+
+def action_text(r):
+    """시그널 카드 문구 — 'TQQQ 25% 매수' / 'TQQQ 25% 매도' / 'HOLD'"""
+    if r['action'] == 'BUY':
+        return f"TQQQ {r['change']:.0%} 매수"
+    if r['action'] == 'SELL':
+        return f"TQQQ {abs(r['change']):.0%} 매도"
+    return "HOLD"
+
+
+def to_payload(r):
+    """analyze() 결과 → JSON 직렬화 가능한 dict"""
+    payload = {}
+    for key, value in r.items():
+        if key == 'date':
+            payload[key] = value.strftime('%Y-%m-%d')
+        elif isinstance(value, dict):
+            payload[key] = {str(p): (bool(v) if key == 'ma_signals' else float(v)) for p, v in value.items()}
+        elif key == 'is_bullish':
+            payload[key] = bool(value)
+        elif key == 'action':
+            payload[key] = value
+        else:
+            payload[key] = float(value)
+    payload['action_text'] = action_text(r)
+    return payload
@@ -0,0 +1,220 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from .engine import SIGNAL_THRESHOLD, compute_allocation
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG, calculate_indicators
+from .providers import normalize_ohlc
+
+TRADING_DAYS = 252
+
+
+def load_price_file(path):
+    """로컬 일봉 파일 (CSV/Parquet, Date 인덱스 + OHLC) 로드"""
+    if str(path).endswith('.parquet'):
+        data = pd.read_parquet(path)
+    else:
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+    return normalize_ohlc(data)
+
+
+def simulate(close, target, cost_bps=0.0, slippage_bps=0.0, cash_rate=0.0, threshold=SIGNAL_THRESHOLD):
+    """목표 비중 배열을 종가 체결로 재생한 자산 곡선 (시작 자산 1.0)
+
+    목표가 threshold 이상 바뀐 날만 리밸런싱하고, 그 사이에는 TQQQ/현금이 각자 수익률대로 표류한다.
+    구간 수익은 누적곱으로 한 번에 계산하므로 파이썬 루프가 없다.
+    반환: (자산 곡선, 실효 비중, 거래일 마스크, 회전율 배열)
+    """
+    close = np.asarray(close, dtype=float)
+    target = np.asarray(target, dtype=float)
+    n = len(close)
+
+    trade = np.zeros(n, dtype=bool)
+    trade[0] = True
+    # 임계값 미만 변화는 무시되므로 직전 '체결' 비중과 비교해야 하지만,
+    # 규칙 비중은 0.25 단위라 전일 비교와 결과가 같다
+    trade[1:] = np.abs(np.diff(target)) > threshold
+    starts = np.flatnonzero(trade)
+    seg = np.cumsum(trade) - 1
+    w_seg = target[starts]
+
+    # 현금 지수 (연 cash_rate, 거래일 복리)
+    cash = np.exp(np.log1p(cash_rate) / TRADING_DAYS * np.arange(n))
+
+    s = starts[seg]
+    growth = w_seg[seg] * close / close[s] + (1 - w_seg[seg]) * cash / cash[s]
+
+    # 각 구간이 다음 거래일에 끝날 때의 성장률과 그 시점의 표류 비중
+    nxt = starts[1:]
+    prev_start = starts[:-1]
+    seg_end = w_seg[:-1] * close[nxt] / close[prev_start] + (1 - w_seg[:-1]) * cash[nxt] / cash[prev_start]
+    drifted = w_seg[:-1] * close[nxt] / close[prev_start] / seg_end
+
+    turnover = np.abs(w_seg - np.concatenate([[0.0], drifted]))
+    cost = (cost_bps + slippage_bps) / 1e4
+    fee_factor = 1 - cost * turnover
+
+    start_value = np.cumprod(fee_factor) * np.concatenate([[1.0], np.cumprod(seg_end)])
+    equity = start_value[seg] * growth
+
+    turnover_daily = np.zeros(n)
+    turnover_daily[starts] = turnover
+    return equity, w_seg[seg], trade, turnover_daily
+
+
+def simulate_paths(close, target, cost_bps=0.0, slippage_bps=0.0, cash_rate=0.0, threshold=SIGNAL_THRESHOLD):
+    """simulate()의 경로 배치판 — close · target은 (일수, 경로 수), 경로끼리는 독립
+
+    경로들을 시간축으로 이어 붙여 simulate()와 같은 구간 누적곱으로 한 번에 계산한다.
+    경로 첫날은 항상 새 구간이라 구간이 경로 경계를 넘지 않고, 구간 시작 자산은 로그 누적합을
+    경로 첫 구간 기준으로 빼서 경로마다 1.0에서 다시 시작한다.
+    반환: (자산 곡선, 회전율) — 둘 다 (일수, 경로 수)
+    """
+    close = np.asarray(close, dtype=float)
+    target = np.asarray(target, dtype=float)
+    n, paths = close.shape
+    c = close.T.ravel()
+    w = target.T.ravel()
+    day = np.tile(np.arange(n), paths)
+
+    trade = np.ones((paths, n), dtype=bool)
+    trade[:, 1:] = np.abs(np.diff(target.T, axis=1)) > threshold
+    trade = trade.ravel()
+    starts = np.flatnonzero(trade)
+    seg = np.cumsum(trade) - 1
+    w_seg = w[starts]
+    first = day[starts] == 0  # 경로 첫 구간
+
+    cash = np.exp(np.log1p(cash_rate) / TRADING_DAYS * day)
+    s = starts[seg]
+    growth = w_seg[seg] * c / c[s] + (1 - w_seg[seg]) * cash / cash[s]
+
+    # 각 구간이 다음 거래일에 끝날 때의 성장률과 표류 비중 — 다음 구간이 새 경로면 쓰지 않음
+    nxt = starts[1:]
+    prev_start = starts[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risky = w_seg[:-1] * c[nxt] / c[prev_start]
+        seg_end = np.where(first[1:], 1.0, risky + (1 - w_seg[:-1]) * cash[nxt] / cash[prev_start])
+        drifted = np.concatenate([[0.0], np.where(first[1:], 0.0, risky / seg_end)])
+
+    turnover = np.abs(w_seg - drifted)
+    fee_factor = 1 - (cost_bps + slippage_bps) / 1e4 * turnover
+
+    # 구간 시작 자산 = 이번 구간 수수료 × (경로 첫 구간부터 직전 구간까지의 수수료 · 구간 성장률 곱)
+    log_before = np.concatenate([[0.0], np.cumsum(np.log(fee_factor[:-1]) + np.log(seg_end))])
+    path_first = np.flatnonzero(first)[np.cumsum(first) - 1]
+    start_value = fee_factor * np.exp(log_before - log_before[path_first])
+    equity = start_value[seg] * growth
+
+    turnover_daily = np.zeros(n * paths)
+    turnover_daily[starts] = turnover
+    return equity.reshape(paths, n).T, turnover_daily.reshape(paths, n).T
+
+
+def path_stats(equity, years, turnover=None, cash_rate=0.0):
+    """경로별 CAGR · MDD · Sharpe · 연 회전율 — 입력은 (일수, 경로 수), 결과는 {지표: (경로 수,)}"""
+    equity = np.asarray(equity, dtype=float)
+    daily = equity[1:] / equity[:-1] - 1
+    excess = daily - (np.exp(np.log1p(cash_rate) / TRADING_DAYS) - 1)
+    std = excess.std(axis=0, ddof=1)
+
+    stats = {
+        'total_return': equity[-1] / equity[0] - 1,
+        'cagr': (equity[-1] / equity[0]) ** (1 / years) - 1,
+        'max_drawdown': (equity / np.maximum.accumulate(equity, axis=0) - 1).min(axis=0),
+        'sharpe': np.divide(excess.mean(axis=0), std, out=np.zeros_like(std), where=std > 0) * np.sqrt(TRADING_DAYS),
+    }
+    if turnover is not None:
+        stats['turnover'] = turnover.sum(axis=0) / years
+    return stats
+
+
+def performance_stats(equity, dates, turnover=None, trade=None, cash_rate=0.0):
+    """CAGR · MDD · Sharpe · 연 회전율 · 거래 횟수"""
+    equity = np.asarray(equity, dtype=float)
+    years = max((dates[-1] - dates[0]).days / 365.25, 1e-9)
+    daily = equity[1:] / equity[:-1] - 1
+    excess = daily - (np.exp(np.log1p(cash_rate) / TRADING_DAYS) - 1)
+    std = excess.std(ddof=1) if len(excess) > 1 else 0.0
+
+    stats = {
+        'start': dates[0].strftime('%Y-%m-%d'),
+        'end': dates[-1].strftime('%Y-%m-%d'),
+        'total_return': float(equity[-1] / equity[0] - 1),
+        'cagr': float((equity[-1] / equity[0]) ** (1 / years) - 1),
+        'max_drawdown': float((equity / np.maximum.accumulate(equity) - 1).min()),
+        'sharpe': float(excess.mean() / std * np.sqrt(TRADING_DAYS)) if std > 0 else 0.0,
+    }
+    if turnover is not None:
+        stats['turnover'] = float(turnover.sum() / years)
+    if trade is not None:
+        stats['trades'] = int(trade[1:].sum())
+    return stats
+
+
+def run_backtest(data, stoch_config=None, ma_periods=None, cost_bps=5.0, slippage_bps=5.0,
+                 cash_rate=0.0, lag=1, start=None, end=None):
+    """일봉 OHLC 전체 히스토리로 Sniper 배분 규칙 백테스트
+
+    lag: 시그널 확정 후 체결까지의 거래일 수 (1 = 다음 날 종가, 0 = 당일 종가)
+    """
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+
+    ind = calculate_indicators(data, stoch_config, ma_periods)
+    target = compute_allocation(ind, ma_periods)['TQQQ']
+    if start is not None:
+        target = target[target.index >= pd.Timestamp(start)]
+    if end is not None:
+        target = target[target.index <= pd.Timestamp(end)]
+
+    # 체결 지연만큼 비중을 뒤로 밀고, 첫 구간은 현금 보유
+    executed = target.shift(lag).fillna(0.0)
+    close = ind['Close'].reindex(executed.index)
+
+    equity, weights, trade, turnover = simulate(
+        close.to_numpy(), executed.to_numpy(), cost_bps, slippage_bps, cash_rate
+    )
+    dates = executed.index
+    benchmark = close.to_numpy() / close.iloc[0]
+
+    return {
+        'equity': pd.Series(equity, index=dates, name='Strategy'),
+        'benchmark': pd.Series(benchmark, index=dates, name='TQQQ'),
+        'weights': pd.Series(weights, index=dates, name='TQQQ'),
+        'trades': pd.Series(turnover[trade], index=dates[trade], name='Turnover'),
+        'stats': performance_stats(equity, dates, turnover, trade, cash_rate),
+        'benchmark_stats': performance_stats(benchmark, dates, cash_rate=cash_rate),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TQQQ Sniper 배분 규칙 백테스트')
+    parser.add_argument('prices', help='일봉 CSV/Parquet 파일')
+    parser.add_argument('--cost-bps', type=float, default=5.0)
+    parser.add_argument('--slippage-bps', type=float, default=5.0)
+    parser.add_argument('--cash-rate', type=float, default=0.0, help='현금 연 수익률 (0.04 = 4%%)')
+    parser.add_argument('--lag', type=int, default=1)
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    result = run_backtest(
+        load_price_file(args.prices), cost_bps=args.cost_bps, slippage_bps=args.slippage_bps,
+        cash_rate=args.cash_rate, lag=args.lag, start=args.start, end=args.end,
+    )
+    if args.json:
+        print(json.dumps({'strategy': result['stats'], 'benchmark': result['benchmark_stats']}, indent=2))
+        return
+    for name, stats in (('Strategy', result['stats']), ('Buy & Hold', result['benchmark_stats'])):
+        print(f"[{name}] {stats['start']} ~ {stats['end']}")
+        print(f"  CAGR {stats['cagr']:.2%} · MDD {stats['max_drawdown']:.2%} · Sharpe {stats['sharpe']:.2f}")
+        if 'trades' in stats:
+            print(f"  회전율 {stats['turnover']:.2f}/년 · 거래 {stats['trades']}회")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .analyzer import TQQQAnalyzer
+from .backtest import load_price_file
+from .store import BarStore
+from .synthetic import synthetic_ohlc
+from .validate import validate_bars
+
+DEFAULT_SIZES = [400, 5000, 50000]
+
+# --compare 시 이 비율 이상 느려지면 회귀로 판정
+REGRESSION_RATIO = 1.25
+
+
+def _measure(fn, repeat):
+    """(지연시간 ms 배열, 최대 메모리 KB) — 메모리는 타이밍과 분리해 한 번 더 실행"""
+    fn()  # 워밍업 (import · 캐시)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(times), peak / 1024
+
+
+def _stages(data, workdir):
+    """단계 이름 → 측정 함수 (실 네트워크 요청은 재현성이 없어 로컬 저장소 로드로 대체)"""
+    store = BarStore(os.path.join(workdir, f'bench_{len(data)}.sqlite'))
+    store.replace('BENCH', data)
+    analyzer = TQQQAnalyzer(store=store, tickers=['BENCH'])
+    ind = analyzer.calculate_indicators(data)
+
+    stages = {
+        'load': lambda: store.load('BENCH'),
+        'validate': lambda: validate_bars(data, analyzer.stoch_config, analyzer.ma_periods),
+        'indicators': lambda: analyzer.calculate_indicators(data),
+        'analyze': lambda: analyzer.analyze(ind),
+    }
+    try:
+        import plotly  # noqa: F401
+        from .chart import build_chart
+        stages['render'] = lambda: build_chart(ind, analyzer.ma_periods)
+    except ImportError:
+        pass
+    return stages
+
+
+def run_benchmarks(sizes=None, fixture=None, repeat=20, seed=0):
+    """데이터셋 × 크기 × 단계별 p50/p95 지연과 최대 메모리"""
+    sizes = sizes or DEFAULT_SIZES
+    datasets = [('synthetic', n, synthetic_ohlc(n, seed=seed)) for n in sizes]
+    if fixture:
+        full = load_price_file(fixture)
+        datasets += [('fixture', n, full.iloc[-n:]) for n in sizes if n <= len(full)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, n, data in datasets:
+            for stage, fn in _stages(data, workdir).items():
+                times, peak_kb = _measure(fn, repeat)
+                results.append({
+                    'dataset': name,
+                    'bars': n,
+                    'stage': stage,
+                    'p50_ms': float(np.percentile(times, 50)),
+                    'p95_ms': float(np.percentile(times, 95)),
+                    'mean_ms': float(times.mean()),
+                    'peak_kb': float(peak_kb),
+                })
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, ratio=REGRESSION_RATIO):
+    """이전 결과 대비 p50 비율 표 — ratio 이상 느려진 항목은 regression=True"""
+    key = lambda r: (r['dataset'], r['bars'], r['stage'])
+    base = {key(r): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        b = base.get(key(r))
+        if b is None or b['p50_ms'] <= 0:
+            continue
+        change = r['p50_ms'] / b['p50_ms']
+        rows.append({'dataset': r['dataset'], 'bars': r['bars'], 'stage': r['stage'],
+                     'base_p50_ms': b['p50_ms'], 'p50_ms': r['p50_ms'],
+                     'ratio': change, 'regression': change >= ratio})
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='데이터 로드 · 검증 · 지표 · 분석 · 렌더 벤치마크')
+    parser.add_argument('--sizes', type=lambda s: [int(v) for v in s.split(',')], default=DEFAULT_SIZES)
+    parser.add_argument('--fixture', help='실제 일봉 CSV/Parquet (크기별 최근 구간 사용)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--out', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.fixture, args.repeat)
+    table = pd.DataFrame(report['results'])
+    print(table.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            diff = compare(report, json.load(f))
+        print()
+        print(diff.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+        if diff['regression'].any():
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .metrics import registry
+
+
+class SharedCache:
+    """프로세스 전역 캐시 — 모든 세션이 공유, 키별로 한 세션만 재계산
+
+    만료된 키를 여러 세션이 동시에 요청하면 첫 세션만 compute를 실행하고
+    나머지는 같은 키의 락에서 기다렸다가 그 결과를 그대로 받는다.
+    키별 락은 기다리는 세션이 있는 동안만 두고 마지막 세션이 나갈 때 지운다 (키가 계속 바뀌어도 쌓이지 않음).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._key_locks = {}  # 키 → [락, 사용 중인 세션 수]
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def _locked(self, key):
+        with self._guard:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._guard:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._key_locks[key]
+
+    def _fresh(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None and now < entry[1]:
+            return entry
+        return None
+
+    def get(self, key):
+        entry = self._fresh(key, datetime.now(timezone.utc))
+        return entry[0] if entry else None
+
+    def get_or_compute(self, key, compute, expires_at):
+        """캐시 값 반환, 만료 시 compute() 결과를 expires_at(tz-aware)까지 보관
+
+        expires_at이 호출 가능하면 계산된 값으로 만료 시각을 정한다 (잠정 결과는 짧게 보관하는 용도).
+        compute()가 None을 반환하면 (로드 실패) 저장하지 않아 다음 요청이 재시도한다.
+        """
+        name = key[0] if isinstance(key, tuple) else key
+        entry = self._fresh(key, datetime.now(timezone.utc))
+        if entry:
+            registry.inc('cache_requests', cache=name, result='hit')
+            return entry[0]
+
+        with self._locked(key):
+            # 대기하는 동안 다른 세션이 이미 채웠으면 재사용
+            entry = self._fresh(key, datetime.now(timezone.utc))
+            if entry:
+                registry.inc('cache_requests', cache=name, result='wait')
+                return entry[0]
+            registry.inc('cache_requests', cache=name, result='miss')
+            value = compute()
+            if value is not None:
+                self._evict_expired()
+                self._entries[key] = (value, expires_at(value) if callable(expires_at) else expires_at)
+            return value
+
+    def _evict_expired(self):
+        """만료 항목 정리 — 데이터 버전별 키(차트 등)가 쌓이지 않도록"""
+        now = datetime.now(timezone.utc)
+        with self._guard:
+            for key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                del self._entries[key]
+
+    def invalidate(self, key=None):
+        with self._guard:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# 모듈은 프로세스당 한 번만 import 되므로 Streamlit 재실행·세션 간에 유지된다
+shared_cache = SharedCache()
@@ -0,0 +1,156 @@
+from functools import lru_cache
+
+import numpy as np
+
+MA_COLORS = ['#ffb800', '#00d4ff', '#a855f7', '#ff6b9d']
+
+# 차트 기간 → 최근 거래일 수 (None = 전체) — 기본은 기존 대시보드와 같은 최근 80봉
+LOOKBACKS = {'80D': 80, '1Y': 252, '5Y': 5 * 252, 'MAX': None}
+DEFAULT_LOOKBACK = '80D'
+# 트레이스당 최대 점 수 — 캔들은 주봉 · 월봉으로 묶고, 선은 LTTB로 줄여 이 안에 맞춘다
+POINT_BUDGET = 260
+
+
+def data_version(data):
+    """지표 프레임 버전 키 — 마지막 봉 날짜 · 행 수 · 종가 (DataFrame · CompactFrame 모두 float32 기준으로 같은 키)"""
+    return (data.index[-1].strftime('%Y-%m-%d'), len(data), float(np.float32(np.asarray(data['Close'])[-1])))
+
+
+# -----------------------------------------------------------
+# 다운샘플링
+# -----------------------------------------------------------
+def resample_ohlc(index, open_, high, low, close, freq):
+    """일봉 → 주봉('W') · 월봉('M') — 각 봉의 x는 그 구간의 마지막 거래일"""
+    periods = index.to_period(freq)
+    starts = np.flatnonzero(np.concatenate([[True], periods[1:] != periods[:-1]]))
+    ends = np.append(starts[1:], len(index)) - 1
+    return (index[ends], open_[starts], np.maximum.reduceat(high, starts), np.minimum.reduceat(low, starts),
+            close[ends])
+
+
+def candle_interval(n, budget=POINT_BUDGET):
+    """봉 수가 예산을 넘으면 일봉 → 주봉 → 월봉 순으로 묶음 (None = 일봉 그대로)"""
+    if n <= budget:
+        return None
+    if n / 5 <= budget:
+        return 'W'
+    return 'M'
+
+
+def lttb(y, threshold):
+    """Largest-Triangle-Three-Buckets — 선 모양을 유지하며 threshold개 점의 위치 인덱스 선택
+
+    x는 거래일 순번으로 본다. 버킷 순서대로 직전 선택점에 의존하므로 버킷 단위 루프이고,
+    버킷 안의 삼각형 넓이는 한 번에 계산한다.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (nxt_lo + max(nxt_hi, nxt_lo + 1) - 1) / 2
+        avg_y = y[nxt_lo:max(nxt_hi, nxt_lo + 1)].mean()
+        xs = np.arange(lo, hi)
+        area = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# -----------------------------------------------------------
+# Figure 템플릿 — 레이아웃 · 트레이스 스타일은 MA 구성별로 한 번만 만들고, 렌더마다 데이터만 교체
+# -----------------------------------------------------------
+@lru_cache(maxsize=8)
+def _template(ma_periods):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.08,
+        row_heights=[0.7, 0.3]
+    )
+
+    # 캔들스틱
+    fig.add_trace(go.Candlestick(
+        name='TQQQ',
+        increasing_line_color='#00ff88',
+        decreasing_line_color='#ff4757',
+        increasing_fillcolor='#00ff88',
+        decreasing_fillcolor='#ff4757'
+    ), row=1, col=1)
+
+    # 이동평균선
+    for i, ma in enumerate(ma_periods):
+        fig.add_trace(go.Scatter(
+            name=f'MA{ma}',
+            line=dict(color=MA_COLORS[i % len(MA_COLORS)], width=1.5),
+            opacity=0.9
+        ), row=1, col=1)
+
+    # Stochastic
+    fig.add_trace(go.Scatter(name='%K', line=dict(color='#00d4ff', width=1.5)), row=2, col=1)
+    fig.add_trace(go.Scatter(name='%D', line=dict(color='#ffb800', width=1.5)), row=2, col=1)
+
+    fig.update_layout(
+        height=420,
+        margin=dict(l=0, r=0, t=0, b=0),
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(13, 17, 23, 0.5)',
+        xaxis_rangeslider_visible=False,
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='center',
+            x=0.5,
+            bgcolor='rgba(0,0,0,0)',
+            font=dict(size=10)
+        ),
+        font=dict(family='JetBrains Mono', color='#8b949e', size=10)
+    )
+
+    fig.update_xaxes(gridcolor='rgba(48, 54, 61, 0.3)', showgrid=True)
+    fig.update_yaxes(gridcolor='rgba(48, 54, 61, 0.3)', showgrid=True)
+    fig.update_yaxes(range=[0, 100], row=2, col=1)
+    # 템플릿은 검증을 마친 dict로 보관 — 렌더마다 make_subplots · 스타일 검증을 다시 하지 않음
+    return fig.to_plotly_json()
+
+
+def build_chart(data, ma_periods, lookback=DEFAULT_LOOKBACK, budget=POINT_BUDGET):
+    """lookback 기간의 캔들스틱 + MA + Stochastic Figure (data는 DataFrame 또는 CompactFrame)
+
+    기간이 길면 캔들은 주봉 · 월봉으로, 선은 LTTB로 줄여 트레이스당 점 수를 budget 이하로 유지한다.
+    plotly는 무거워서 (import 수백 ms) 차트를 실제로 그릴 때만 불러온다.
+    """
+    import plotly.graph_objects as go
+
+    bars = LOOKBACKS[lookback] or len(data)
+    start = max(len(data) - bars, 0)
+    index = data.index[start:]
+
+    def column(name):
+        return np.asarray(data[name], dtype=np.float64)[start:]
+
+    ohlc = index, column('Open'), column('High'), column('Low'), column('Close')
+    freq = candle_interval(len(index), budget)
+    if freq:
+        ohlc = resample_ohlc(*ohlc, freq)
+
+    lines = [f'MA{ma}' for ma in ma_periods] + ['%K', '%D']
+
+    template = _template(tuple(ma_periods))
+    traces = [dict(template['data'][0], x=ohlc[0], open=ohlc[1], high=ohlc[2], low=ohlc[3], close=ohlc[4])]
+    for trace, name in zip(template['data'][1:], lines):
+        y = column(name)
+        keep = lttb(y, budget)
+        traces.append(dict(trace, x=index[keep], y=y[keep]))
+    return go.Figure(data=traces, layout=template['layout'], skip_invalid=True)
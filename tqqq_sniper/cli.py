@@ -0,0 +1,169 @@
+"""헤드리스 실행 진입점 — python -m tqqq_sniper <명령>
+
+Streamlit·plotly를 불러오지 않으며, 하위 명령 모듈은 실행 시점에만 import 한다.
+"""
+import argparse
+import importlib
+import json
+import logging
+import sys
+
+# 자체 argparse를 가진 하위 명령 → 모듈
+DELEGATED = {
+    'alerts': 'tqqq_sniper.alerts',
+    'backtest': 'tqqq_sniper.backtest',
+    'bench': 'tqqq_sniper.bench',
+    'execution': 'tqqq_sniper.execution',
+    'live': 'tqqq_sniper.live',
+    'montecarlo': 'tqqq_sniper.montecarlo',
+    'snapshot': 'tqqq_sniper.snapshot',
+    'sweep': 'tqqq_sniper.sweep',
+    'validate': 'tqqq_sniper.validate',
+    'walkforward': 'tqqq_sniper.walkforward',
+}
+
+
+def _load_prices(args):
+    from .backtest import load_price_file
+    return load_price_file(args.prices)
+
+
+def cmd_signal(args):
+    from .analyzer import TQQQAnalyzer, action_text, to_payload
+    from .providers import provider_from_spec
+    from .store import BarStore
+
+    analyzer = TQQQAnalyzer(
+        store=BarStore(args.store) if args.store else None,
+        provider=provider_from_spec(args.provider),
+        tickers=[args.ticker],
+    )
+    if args.prices:
+        data = analyzer.validate(_load_prices(args))
+    else:
+        data = analyzer.get_data(days_back=args.days, sync=not args.offline)
+    if data is None or data.empty:
+        print('데이터를 불러올 수 없습니다.', file=sys.stderr)
+        return 1
+
+    ind = analyzer.calculate_indicators(data)
+    if len(ind) < 2:
+        print('지표 계산에 필요한 데이터가 부족합니다.', file=sys.stderr)
+        return 1
+    r = analyzer.analyze(ind, None if args.prices else analyzer.get_defensive(ind.index[0]))
+    order = _signal_order(args, r)
+
+    if args.json:
+        payload = {'ticker': args.ticker, **to_payload(r)}
+        if order is not None:
+            payload['order'] = order
+        print(json.dumps(payload, ensure_ascii=False))
+        return 0
+
+    regime = 'BULLISH' if r['is_bullish'] else 'BEARISH'
+    print(f"{args.ticker} {r['date']:%Y.%m.%d} ${r['price']:.2f} ({r['price_change_pct']:+.2f}%) · {regime}")
+    print(f"%K {r['stoch_k']:.1f} · %D {r['stoch_d']:.1f}")
+    print(f"ACTION  {action_text(r)} (비중 {r['prev_tqqq']:.0%} → {r['tqqq']:.0%})")
+    defensive = ''.join(f" · {t} {w:.0%}" for t, w in r['defensive'].items() if w >= 0.005)
+    print(f"TQQQ {r['tqqq']:.0%}{defensive} · CASH {r['cash']:.0%}")
+    if order is not None:
+        side = '매수' if order['shares'] > 0 else '매도' if order['shares'] < 0 else '주문 없음'
+        print(f"ORDER   {side} {abs(order['shares']):g}주 (${abs(order['notional']):,.2f}, 수수료 ${order['fee']:.2f})"
+              f" → 보유 {order['position']:g}주 · 현금 ${order['cash']:,.2f}")
+    return 0
+
+
+def _signal_order(args, r):
+    """--cash / --shares가 주어지면 오늘 목표 비중을 종가 기준 주식 수 주문으로 변환 (없으면 None)"""
+    if args.cash is None and args.shares is None:
+        return None
+    from .execution import plan_orders
+
+    plan = plan_orders(args.cash or 0.0, args.shares or 0.0, r['price'], r['tqqq'], args.lot, args.band,
+                       args.fee_bps)
+    return {
+        'shares': float(plan['order']),
+        'notional': round(float(plan['notional']), 2),
+        'fee': round(float(plan['fee']), 2),
+        'position': float(plan['shares']),
+        'cash': round(float(plan['cash']), 2),
+    }
+
+
+def cmd_history(args):
+    import pandas as pd
+
+    from .analyzer import TQQQAnalyzer
+    from .store import BarStore
+
+    analyzer = TQQQAnalyzer(store=BarStore(args.store) if args.store else None, tickers=[args.ticker])
+    if not args.offline:
+        analyzer.get_data(sync=True)
+    history = analyzer.history()
+    for message in analyzer.warnings:
+        print(message, file=sys.stderr)
+
+    if args.date:
+        row = history.on(args.ticker, args.date)
+        table = row.to_frame().T if row is not None else None
+    elif args.start or args.end:
+        table = history.range(args.ticker, args.start, args.end)
+    else:
+        table = history.flips(args.ticker, args.flips)
+    if table is None or table.empty:
+        print('시그널 이력이 없습니다.', file=sys.stderr)
+        return 1
+
+    if args.json:
+        table.index = pd.DatetimeIndex(table.index).strftime('%Y-%m-%d')
+        print(table.rename_axis('Date').reset_index().to_json(orient='records', force_ascii=False))
+    else:
+        print(table.to_string(float_format=lambda v: f'{v:.2f}'))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='tqqq_sniper', description='TQQQ Sniper 헤드리스 실행')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    signal = sub.add_parser('signal', help='오늘의 배분 시그널 출력')
+    signal.add_argument('--json', action='store_true', help='JSON 한 줄로 출력')
+    signal.add_argument('--ticker', default='TQQQ')
+    signal.add_argument('--store', help='SQLite 저장소 경로 (기본: TQQQ_STORE_PATH)')
+    signal.add_argument('--provider', help="공급자 설정 ('yfinance', 'file:<dir>', 'https://…{ticker}…', 기본: TQQQ_PROVIDER)")
+    signal.add_argument('--prices', help='저장소 대신 사용할 일봉 CSV/Parquet 파일')
+    signal.add_argument('--offline', action='store_true', help='공급자 동기화 없이 저장소만 사용')
+    signal.add_argument('--days', type=int, default=400, help='조회 기간 (일)')
+    signal.add_argument('--cash', type=float, help='보유 현금 ($) — 주면 주문 수량까지 계산')
+    signal.add_argument('--shares', type=float, help='보유 TQQQ 수량 (주)')
+    signal.add_argument('--lot', type=float, default=1, help='주문 단위 (주)')
+    signal.add_argument('--band', type=float, default=0.0, help='리밸런싱 허용 밴드 (비중)')
+    signal.add_argument('--fee-bps', type=float, default=0.0)
+    signal.set_defaults(func=cmd_signal)
+
+    history = sub.add_parser('history', help='시그널 이력 조회 (기본: 최근 변경 10건)')
+    history.add_argument('--ticker', default='TQQQ')
+    history.add_argument('--store', help='SQLite 저장소 경로 (기본: TQQQ_STORE_PATH)')
+    history.add_argument('--offline', action='store_true', help='공급자 동기화 없이 저장소만 사용')
+    history.add_argument('--flips', type=int, default=10, help='최근 시그널 변경 N건')
+    history.add_argument('--date', help='해당일 (휴장일이면 직전 거래일) 배분')
+    history.add_argument('--start', help='기간 조회 시작일')
+    history.add_argument('--end', help='기간 조회 종료일 (포함)')
+    history.add_argument('--json', action='store_true', help='JSON 레코드 배열로 출력')
+    history.set_defaults(func=cmd_history)
+
+    for name in DELEGATED:
+        sub.add_parser(name, help=f'{name} (세부 옵션: {name} --help)', add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in DELEGATED:
+        return importlib.import_module(DELEGATED[argv[0]]).main(argv[1:]) or 0
+
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    return args.func(args)
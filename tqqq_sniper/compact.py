@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+class CompactFrame:
+    """읽기 전용 열 지향 float32 지표 블록 — 세션 간 공유용
+
+    값은 (열 수 × 행 수) C-연속 배열 하나에 열별로 이어 붙여 저장하고, 열 이름 → 위치 색인만 따로 둔다.
+    float64 DataFrame 대비 메모리가 절반 이하이고 열 조회는 복사 없는 뷰다.
+    float32 유효숫자는 약 7자리라 가격 · 지표 표시(소수 1~2자리)에는 충분하지만,
+    종가와 MA의 대소 비교처럼 경계값에 민감한 판정은 압축 전 float64 프레임으로 계산해야 한다.
+    """
+
+    __slots__ = ('values', 'index', 'columns', '_pos')
+
+    def __init__(self, values, index, columns):
+        values = np.ascontiguousarray(values)
+        values.flags.writeable = False
+        self.values = values
+        self.index = pd.DatetimeIndex(index)
+        self.columns = tuple(columns)
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, df, dtype=np.float32):
+        return cls(df.to_numpy(dtype=dtype).T, df.index, df.columns)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, column):
+        return column in self._pos
+
+    def __getitem__(self, column):
+        """열 하나 — 읽기 전용 뷰 (float32)"""
+        return self.values[self._pos[column]]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.index.nbytes
+
+    def tail(self, n):
+        """최근 n개 행 → float64 DataFrame (차트 · 표 등 소량 표시용)"""
+        n = min(n, len(self))
+        start = len(self) - n
+        return pd.DataFrame(
+            self.values[:, start:].T.astype(np.float64),
+            index=self.index[start:],
+            columns=list(self.columns),
+        )
+
+    def to_frame(self):
+        return self.tail(len(self))
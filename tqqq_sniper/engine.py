@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# main()의 매수/매도 표시 기준 (비중 변화 ±1%p)
+SIGNAL_THRESHOLD = 0.01
+
+BUY, HOLD, SELL = 1, 0, -1
+ACTION_LABELS = {BUY: 'BUY', HOLD: 'HOLD', SELL: 'SELL'}
+
+# 하락 국면에서 비중을 판단하는 단기 MA 개수 (기본 MA20 · MA45)
+BEAR_MA_COUNT = 2
+
+
+def allocation_from_arrays(k, d, close, ma):
+    """전 구간 TQQQ 비중 — 시간축은 axis 0
+
+    k, d, close: (T,) 또는 (T, N)  ·  ma: (MA 개수, T) 또는 (MA 개수, T, N)
+    상승 국면 (%K > %D): 종가 > MA 개수 × 1/MA 개수 (기본 25%씩)
+    하락 국면: 단기 MA 두 개만 사용, 개당 50%
+    """
+    above = np.asarray(close) > np.asarray(ma)
+    bull_ratio = above.mean(axis=0)
+    bear_ratio = above[:BEAR_MA_COUNT].mean(axis=0)
+    return np.where(np.asarray(k) > np.asarray(d), bull_ratio, bear_ratio)
+
+
+def signals_from_allocation(tqqq, threshold=SIGNAL_THRESHOLD):
+    """비중 배열 → (전일 비중, 변화량, BUY/HOLD/SELL 코드). 첫 행은 변화 없음으로 처리"""
+    tqqq = np.asarray(tqqq, dtype=float)
+    prev = np.empty_like(tqqq)
+    prev[1:] = tqqq[:-1]
+    prev[:1] = tqqq[:1]
+    change = tqqq - prev
+    action = np.where(change > threshold, BUY, np.where(change < -threshold, SELL, HOLD)).astype(np.int8)
+    return prev, change, action
+
+
+def compute_allocation(data, ma_periods):
+    """지표 프레임 전체 행에 대한 비중 · 변화 · 시그널 프레임"""
+    close = data['Close'].to_numpy()
+    k = data['%K'].to_numpy()
+    d = data['%D'].to_numpy()
+    ma = np.stack([data[f'MA{p}'].to_numpy() for p in ma_periods])
+
+    tqqq = allocation_from_arrays(k, d, close, ma)
+    prev, change, action = signals_from_allocation(tqqq)
+    return pd.DataFrame({
+        'TQQQ': tqqq,
+        'Cash': 1 - tqqq,
+        'PrevTQQQ': prev,
+        'Change': change,
+        'Action': action,
+    }, index=data.index)
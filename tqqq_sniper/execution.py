@@ -0,0 +1,208 @@
+"""체결 시뮬레이터 — 목표 비중을 계좌 규모 · 보유 수량 · 주문 단위 · 수수료 · 현금 이자를 반영한 주식 수 주문으로 변환
+
+모든 함수는 계좌 축으로 브로드캐스트되므로 리밸런싱 정책(허용 밴드 · 주문 단위)이 다른 계좌 수천~수만 개를
+한 번에 시뮬레이션할 수 있다. 시간축은 날짜 순 루프, 각 날짜는 모든 계좌를 한 번에 갱신한다.
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from .backtest import TRADING_DAYS, load_price_file
+from .engine import compute_allocation
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG, calculate_indicators
+
+ACCOUNT_STATS = ['cagr', 'max_drawdown', 'sharpe', 'fees_pct', 'trades', 'turnover', 'cash_drag']
+
+
+def plan_orders(cash, shares, price, target, lot=1, band=0.0, fee_bps=0.0, fee_per_share=0.0, min_fee=0.0):
+    """목표 비중 → 주문 수량 (매수 +, 매도 -) — 인자는 모두 계좌 축으로 브로드캐스트
+
+    현재 비중이 목표에서 band 이하로 벗어나 있으면 주문하지 않는다.
+    목표 수량은 lot 단위로 반올림하고, 매수는 수수료까지 포함해 보유 현금 안에서 lot 단위로 내림한다.
+    반환: {'order', 'notional', 'fee', 'shares', 'cash', 'weight'} (weight는 주문 전 비중)
+    """
+    cash, shares, price, target, lot, band = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (cash, shares, price, target, lot, band))
+    )
+    value = cash + shares * price
+    weight = np.divide(shares * price, value, out=np.zeros_like(value), where=value > 0)
+
+    desired = np.floor(target * value / price / lot + 0.5) * lot
+    order = np.where(np.abs(target - weight) > band, desired - shares, 0.0)
+    affordable = np.floor(np.maximum(cash - min_fee, 0) / (price * (1 + fee_bps / 1e4) + fee_per_share) / lot) * lot
+    order = np.where(order > 0, np.minimum(order, affordable), order)
+
+    notional = order * price
+    fee = np.where(order != 0, np.maximum(np.abs(notional) * fee_bps / 1e4 + np.abs(order) * fee_per_share, min_fee), 0.0)
+    return {
+        'order': order,
+        'notional': notional,
+        'fee': fee,
+        'shares': shares + order,
+        'cash': cash - notional - fee,
+        'weight': weight,
+    }
+
+
+def simulate_accounts(close, target, cash, shares=0.0, lot=1, band=0.0, fee_bps=0.0, fee_per_share=0.0,
+                      min_fee=0.0, cash_rate=0.0, record=False):
+    """계좌별 전체 기간 리밸런싱 — close는 (일수,), target은 (일수,) 또는 (일수, 계좌 수), 체결은 종가
+
+    현금은 연 cash_rate로 거래일 복리 이자를 받는다. 계좌 수 × 일수 자산 곡선은 크기가 커서 (1만 계좌 × 15년 ≈ 300MB)
+    MDD · Sharpe는 루프 안에서 누적 통계로 계산하고, 곡선은 record=True일 때만 보관한다.
+    반환: 계좌별 {'final', 'max_drawdown', 'sharpe', 'fees', 'trades', 'turnover', 'cash_drag', 'shares', 'cash'}
+    (+ record면 'equity': (일수, 계좌 수))
+    """
+    close = np.asarray(close, dtype=float)
+    target = np.asarray(target, dtype=float)
+    cash, shares, lot, band = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (cash, shares, lot, band)))
+    cash, shares = cash.copy(), shares.copy()
+    n, accounts = len(close), cash.shape[0]
+    cash_growth = np.exp(np.log1p(cash_rate) / TRADING_DAYS)
+
+    equity = np.empty((n, accounts)) if record else None
+    fees = np.zeros(accounts)
+    trades = np.zeros(accounts)
+    turnover = np.zeros(accounts)
+    cash_weight = np.zeros(accounts)
+    max_drawdown = np.zeros(accounts)
+    excess_sum = np.zeros(accounts)
+    excess_sq = np.zeros(accounts)
+    peak = prev = None
+    for t in range(n):
+        if t:
+            cash *= cash_growth
+        plan = plan_orders(cash, shares, close[t], target[t], lot, band, fee_bps, fee_per_share, min_fee)
+        value = cash + shares * close[t]
+        cash, shares = plan['cash'], plan['shares']
+        now = cash + shares * close[t]
+        fees += plan['fee']
+        trades += plan['order'] != 0
+        turnover += np.divide(np.abs(plan['notional']), value, out=np.zeros_like(value), where=value > 0)
+        # 목표 비중보다 더 들고 있는 현금 (주문 단위 · 밴드 · 현금 부족 때문에 투자되지 못한 몫)
+        # 평가액이 0인 계좌 (빈 계좌 · 전액 손실)는 비율 지표를 0으로 둬 inf · NaN이 번지지 않게 함
+        cash_weight += np.maximum(np.divide(cash, now, out=np.zeros_like(cash), where=now > 0) - (1 - target[t]), 0)
+
+        if t:
+            excess = np.divide(now, prev, out=np.full_like(now, cash_growth), where=prev > 0) - cash_growth
+            excess_sum += excess
+            excess_sq += excess * excess
+            peak = np.maximum(peak, now)
+        else:
+            peak = now.copy()
+        np.minimum(max_drawdown, np.divide(now, peak, out=np.ones_like(now), where=peak > 0) - 1, out=max_drawdown)
+        prev = now
+        if record:
+            equity[t] = now
+
+    days = max(n - 1, 2)
+    mean = excess_sum / days
+    std = np.sqrt(np.maximum(excess_sq - days * mean ** 2, 0) / (days - 1))
+    result = {
+        'final': prev, 'max_drawdown': max_drawdown,
+        'sharpe': np.divide(mean, std, out=np.zeros_like(std), where=std > 0) * np.sqrt(TRADING_DAYS),
+        'fees': fees, 'trades': trades, 'turnover': turnover, 'cash_drag': cash_weight / n,
+        'shares': shares, 'cash': cash,
+    }
+    if record:
+        result['equity'] = equity
+    return result
+
+
+def synthetic_accounts(n, bands, lots, size_range=(1e3, 1e6), seed=0):
+    """계좌 n개 — 시작 현금은 로그 균등 분포, (band, lot) 정책 조합은 계좌 순서대로 돌려 배정"""
+    if size_range[0] <= 0 or size_range[1] < size_range[0]:
+        raise ValueError(f'계좌 규모 범위가 잘못됨: {size_range} (0 < 최소 ≤ 최대)')
+    rng = np.random.default_rng(seed)
+    policies = [(b, l) for b in bands for l in lots]
+    policy = np.arange(n) % len(policies)
+    low, high = np.log(size_range[0]), np.log(size_range[1])
+    return pd.DataFrame({
+        'cash': np.exp(rng.uniform(low, high, n)),
+        'band': np.array([policies[p][0] for p in policy], dtype=float),
+        'lot': np.array([policies[p][1] for p in policy], dtype=float),
+    }).rename_axis('account')
+
+
+def run_execution(data, accounts, stoch_config=None, ma_periods=None, fee_bps=1.0, fee_per_share=0.0,
+                  min_fee=0.0, cash_rate=0.0, lag=1, start=None):
+    """일봉 전체 히스토리에 배분 규칙을 적용해 계좌별로 실제 주문 체결을 재생
+
+    accounts: cash · band · lot 열을 가진 프레임 (synthetic_accounts 참고)
+    반환: {'accounts': 계좌별 성과표, 'summary': (band, lot) 정책별 중앙값, 'dates'}
+    수익률 · 수수료 비율의 기준이 시작 현금이므로 0 이하인 계좌가 있으면 ValueError.
+    """
+    if (accounts['cash'] <= 0).any():
+        raise ValueError(f"시작 현금이 0 이하인 계좌 {int((accounts['cash'] <= 0).sum())}개 — 성과 비율을 계산할 수 없음")
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    ind = calculate_indicators(data, stoch_config, ma_periods)
+    target = compute_allocation(ind, ma_periods)['TQQQ'].shift(lag).fillna(0.0)
+    if start is not None:
+        target = target[target.index >= pd.Timestamp(start)]
+    close = ind['Close'].reindex(target.index).to_numpy()
+
+    result = simulate_accounts(
+        close, target.to_numpy(), accounts['cash'].to_numpy(), 0.0, accounts['lot'].to_numpy(),
+        accounts['band'].to_numpy(), fee_bps, fee_per_share, min_fee, cash_rate,
+    )
+    dates = target.index
+    years = max((dates[-1] - dates[0]).days / 365.25, 1e-9)
+    initial = accounts['cash'].to_numpy()
+
+    table = accounts.copy()
+    table['final'] = result['final']
+    table['cagr'] = (result['final'] / initial) ** (1 / years) - 1
+    table['max_drawdown'] = result['max_drawdown']
+    table['sharpe'] = result['sharpe']
+    table['fees_pct'] = result['fees'] / initial * 100
+    table['trades'] = result['trades']
+    table['turnover'] = result['turnover'] / years
+    table['cash_drag'] = result['cash_drag']
+    summary = table.groupby(['band', 'lot'])[ACCOUNT_STATS].median()
+    summary['accounts'] = table.groupby(['band', 'lot']).size()
+    return {'accounts': table, 'summary': summary, 'dates': dates}
+
+
+def _float_list(text):
+    return [float(v) for v in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='계좌별 주문 체결 시뮬레이션 (밴드 · 주문 단위 · 수수료 · 현금 이자)')
+    parser.add_argument('prices', help='일봉 CSV/Parquet 파일')
+    parser.add_argument('--accounts', type=int, default=10000, help='합성 계좌 수')
+    parser.add_argument('--bands', type=_float_list, default=[0.0, 0.05, 0.1], help='리밸런싱 허용 밴드 (비중)')
+    parser.add_argument('--lots', type=_float_list, default=[1, 10], help='주문 단위 (주)')
+    parser.add_argument('--min-size', type=float, default=1e3, help='최소 계좌 규모 ($)')
+    parser.add_argument('--max-size', type=float, default=1e6, help='최대 계좌 규모 ($)')
+    parser.add_argument('--fee-bps', type=float, default=1.0)
+    parser.add_argument('--fee-per-share', type=float, default=0.0)
+    parser.add_argument('--min-fee', type=float, default=0.0)
+    parser.add_argument('--cash-rate', type=float, default=0.0, help='현금 연 수익률 (0.04 = 4%%)')
+    parser.add_argument('--lag', type=int, default=1)
+    parser.add_argument('--start')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='계좌별 성과표 CSV 저장 경로')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    accounts = synthetic_accounts(args.accounts, args.bands, args.lots, (args.min_size, args.max_size), args.seed)
+    result = run_execution(
+        load_price_file(args.prices), accounts, fee_bps=args.fee_bps, fee_per_share=args.fee_per_share,
+        min_fee=args.min_fee, cash_rate=args.cash_rate, lag=args.lag, start=args.start,
+    )
+    if args.out:
+        result['accounts'].to_csv(args.out)
+    summary = result['summary']
+    if args.json:
+        summary.index = [f'band={b:g},lot={l:g}' for b, l in summary.index]
+        print(json.dumps(summary.to_dict(orient='index'), indent=2))
+    else:
+        print(summary.to_string(float_format=lambda v: f'{v:.4f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import math
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .engine import ACTION_LABELS, HOLD, compute_allocation
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG, calculate_indicators
+from .params import warmup_length
+from .store import ADJUST_TOLERANCE, DEFAULT_STORE_PATH, _Transaction
+from .validate import validate_bars
+
+COLUMNS = ['date', 'close', 'k', 'd', 'ma_mask', 'tqqq', 'change', 'action']
+
+
+class SignalHistory:
+    """(티커, 파라미터, 날짜) 키 시그널 이력 — 일봉 저장소와 같은 SQLite 파일의 signals 테이블
+
+    처음 한 번 전체 히스토리로 만들고, 이후에는 마지막 저장일부터 (지표 워밍업 구간만 다시 계산해) 이어 붙인다.
+    MA별 위/아래는 비트마스크 한 열(ma_mask, i번째 비트 = ma_periods[i])로 저장한다.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, stoch_config=None, ma_periods=None):
+        self.path = path
+        self.stoch_config = dict(stoch_config or DEFAULT_STOCH_CONFIG)
+        self.ma_periods = list(ma_periods or DEFAULT_MA_PERIODS)
+        self.config = '{period}-{k_period}-{d_period}|'.format(**self.stoch_config) + '-'.join(map(str, self.ma_periods))
+        self._lock = threading.Lock()
+        with self._connect() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS signals (
+                    ticker  TEXT NOT NULL,
+                    config  TEXT NOT NULL,
+                    date    TEXT NOT NULL,
+                    close   REAL, k REAL, d REAL,
+                    ma_mask INTEGER,
+                    tqqq    REAL, change REAL,
+                    action  INTEGER,
+                    PRIMARY KEY (ticker, config, date)
+                )
+            """)
+            # 시그널 변경일만 담는 부분 인덱스 — '최근 N번 변경' 조회용
+            con.execute('CREATE INDEX IF NOT EXISTS signals_flips ON signals (ticker, config, date) WHERE action != 0')
+
+    def _connect(self):
+        return _Transaction(sqlite3.connect(self.path, timeout=30))
+
+    # -------------------------------------------------------
+    # 생성 · 증분 갱신
+    # -------------------------------------------------------
+    def last_dates(self, ticker, n=1):
+        """최근 저장일 n개 (내림차순)"""
+        with self._connect() as con:
+            rows = con.execute(
+                'SELECT date FROM signals WHERE ticker = ? AND config = ? ORDER BY date DESC LIMIT ?',
+                (ticker, self.config, n),
+            ).fetchall()
+        return [pd.Timestamp(r[0]) for r in rows]
+
+    def last_date(self, ticker):
+        dates = self.last_dates(ticker)
+        return dates[0] if dates else None
+
+    def update(self, ticker, bars):
+        """일봉(전체 히스토리)으로 이력 갱신, 기록한 행 수 반환
+
+        BarStore.sync_many와 같이 직전 완성 봉(마지막 저장일은 장중 미완성 봉일 수 있음)을 기준으로
+        그날부터 다시 써서 덮어쓰고, 기준일 종가가 일봉과 다르면 (수정주가 소급 변경) 전체를 다시 만든다.
+        """
+        with self._lock:
+            recent = self.last_dates(ticker, n=2)
+            anchor = recent[-1] if recent else None
+            if anchor is not None and not self._consistent(ticker, anchor, bars):
+                self.delete(ticker)
+                anchor = None
+            if anchor is not None:
+                # 기준일 전날의 비중까지 나오도록 워밍업 + 1개 봉을 앞에 붙여 계산
+                pos = bars.index.searchsorted(anchor)
+                bars = bars.iloc[max(pos - warmup_length(self.stoch_config, self.ma_periods) - 1, 0):]
+
+            ind = calculate_indicators(bars, self.stoch_config, self.ma_periods)
+            if ind.empty:
+                return 0
+            alloc = compute_allocation(ind, self.ma_periods)
+            if anchor is not None:
+                keep = ind.index >= anchor
+                ind, alloc = ind[keep], alloc[keep]
+
+            close = ind['Close'].to_numpy()
+            mask = sum((close > ind[f'MA{p}'].to_numpy()).astype(np.int64) << i for i, p in enumerate(self.ma_periods))
+            rows = list(zip(
+                [ticker] * len(ind), [self.config] * len(ind), ind.index.strftime('%Y-%m-%d'),
+                close.tolist(), ind['%K'].tolist(), ind['%D'].tolist(), mask.tolist(),
+                alloc['TQQQ'].tolist(), alloc['Change'].tolist(), alloc['Action'].astype(int).tolist(),
+            ))
+            with self._connect() as con:
+                con.executemany('INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            return len(rows)
+
+    def sync(self, ticker, store):
+        """일봉 저장소의 전체 히스토리로 갱신 (대시보드와 같은 검증 · 보정을 거친 일봉 기준)"""
+        return self.update(ticker, validate_bars(store.load(ticker), self.stoch_config, self.ma_periods)[0])
+
+    def _consistent(self, ticker, anchor, bars):
+        if anchor not in bars.index:
+            return False
+        with self._connect() as con:
+            row = con.execute(
+                'SELECT close FROM signals WHERE ticker = ? AND config = ? AND date = ?',
+                (ticker, self.config, anchor.strftime('%Y-%m-%d')),
+            ).fetchone()
+        return row is not None and math.isclose(row[0], bars.loc[anchor, 'Close'], rel_tol=ADJUST_TOLERANCE)
+
+    def delete(self, ticker):
+        with self._connect() as con:
+            con.execute('DELETE FROM signals WHERE ticker = ? AND config = ?', (ticker, self.config))
+
+    # -------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------
+    def _frame(self, rows):
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        out = pd.DataFrame(index=pd.DatetimeIndex(df['date'], name='Date'))
+        out['Close'] = df['close'].to_numpy(dtype=float)
+        out['%K'] = df['k'].to_numpy(dtype=float)
+        out['%D'] = df['d'].to_numpy(dtype=float)
+        mask = df['ma_mask'].to_numpy(dtype=int)
+        for i, p in enumerate(self.ma_periods):
+            out[f'Above{p}'] = (mask >> i & 1).astype(bool)
+        out['TQQQ'] = df['tqqq'].to_numpy(dtype=float)
+        out['Change'] = df['change'].to_numpy(dtype=float)
+        out['Action'] = [ACTION_LABELS[a] for a in df['action']]
+        return out
+
+    def _query(self, where, params, order='ASC', limit=None):
+        sql = f"SELECT {', '.join(COLUMNS)} FROM signals WHERE ticker = ? AND config = ? {where} ORDER BY date {order}"
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        with self._connect() as con:
+            return con.execute(sql, params).fetchall()
+
+    def range(self, ticker, start=None, end=None):
+        """기간 이력 (start 포함, end 포함)"""
+        where, params = '', [ticker, self.config]
+        if start is not None:
+            where += ' AND date >= ?'
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            where += ' AND date <= ?'
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        return self._frame(self._query(where, params))
+
+    def on(self, ticker, date):
+        """date 시점의 배분 (휴장일이면 직전 거래일) — 없으면 None"""
+        rows = self._query(' AND date <= ?', [ticker, self.config, pd.Timestamp(date).strftime('%Y-%m-%d')],
+                           order='DESC', limit=1)
+        return self._frame(rows).iloc[0] if rows else None
+
+    def flips(self, ticker, n=10):
+        """최근 n번의 시그널 변경 (BUY/SELL, 최신순)"""
+        rows = self._query(f' AND action != {HOLD}', [ticker, self.config], order='DESC', limit=n)
+        return self._frame(rows)
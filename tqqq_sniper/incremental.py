@@ -0,0 +1,159 @@
+import math
+from collections import deque
+from itertools import islice
+
+NAN = float('nan')
+
+
+class RollingMean:
+    """고정 창 이동평균 — 누적합으로 봉당 O(1) 갱신
+
+    창 길이만큼 갱신될 때마다 fsum으로 합계를 다시 맞춰 부동소수 오차 누적을 막는다 (분할상환 O(1)).
+    NaN은 pandas rolling(min_periods=window)처럼 창에 남아 있는 동안 값을 NaN으로 만든다 (합계에는 0으로 보관).
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self._since_resync = 0
+        self._since_nan = window  # 마지막 NaN 이후 push 횟수 (window 이상이면 창에 NaN 없음)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window and self._since_nan >= self.window
+
+    @property
+    def value(self):
+        return self.total / self.window if self.ready else NAN
+
+    def push(self, x):
+        if math.isnan(x):
+            x = 0.0
+            self._since_nan = 0
+        else:
+            self._since_nan += 1
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self.total = math.fsum(self.values)
+            self._since_resync = 0
+        return self.value
+
+    def peek(self, x):
+        """x를 추가했을 때의 평균 (상태 변경 없음)"""
+        n = len(self.values) + 1
+        if n < self.window or math.isnan(x) or self._since_nan + 1 < self.window:
+            return NAN
+        dropped = self.values[0] if n > self.window else 0.0
+        return (self.total + x - dropped) / self.window
+
+
+class RollingExtreme:
+    """고정 창 최댓값/최솟값 — 단조 덱으로 봉당 분할상환 O(1)
+
+    NaN은 덱에 넣지 않고, 창에 남아 있는 동안 값을 NaN으로 만든다 (pandas rolling과 같음).
+    """
+
+    def __init__(self, window, mode='max'):
+        self.window = window
+        self.sign = 1.0 if mode == 'max' else -1.0
+        self.deque = deque()  # (인덱스, 부호 적용 값) — 값 내림차순
+        self.count = 0
+        self._last_nan = -window  # 마지막 NaN의 인덱스
+
+    @property
+    def ready(self):
+        return self.count >= self.window and self._last_nan <= self.count - 1 - self.window
+
+    @property
+    def value(self):
+        return self.sign * self.deque[0][1] if self.ready else NAN
+
+    def push(self, x):
+        i = self.count
+        self.count += 1
+        if math.isnan(x):
+            self._last_nan = i
+        else:
+            v = self.sign * x
+            while self.deque and self.deque[-1][1] <= v:
+                self.deque.pop()
+            self.deque.append((i, v))
+        while self.deque and self.deque[0][0] <= i - self.window:
+            self.deque.popleft()
+        return self.value
+
+    def peek(self, x):
+        """x를 추가했을 때의 극값 (상태 변경 없음)"""
+        if self.count + 1 < self.window or math.isnan(x) or self._last_nan > self.count - self.window:
+            return NAN
+        v = self.sign * x
+        oldest = self.count + 1 - self.window
+        # 한 봉 추가 시 만료되는 원소는 최대 하나 (맨 앞)
+        for idx, best in islice(self.deque, 2):
+            if idx >= oldest:
+                v = max(v, best)
+                break
+        return self.sign * v
+
+
+class IncrementalIndicators:
+    """calculate_indicators의 상태 유지형 버전 — 봉 추가 시 HH/LL/%K/%D/MA/Dev를 O(1)로 갱신
+
+    update()는 봉을 확정 반영하고, preview()는 장중 미완성 봉을 반영했을 때의 값을 상태 변경 없이 계산한다.
+    NaN 봉은 배치와 같게 각 창을 창 길이만큼 NaN으로 만든다 (%K 창에 들어간 NaN 원시값 포함).
+    """
+
+    def __init__(self, stoch_config, ma_periods):
+        self.stoch_config = dict(stoch_config)
+        self.ma_periods = list(ma_periods)
+        p, k, d = self.stoch_config['period'], self.stoch_config['k_period'], self.stoch_config['d_period']
+        self.hh = RollingExtreme(p, 'max')
+        self.ll = RollingExtreme(p, 'min')
+        self.k = RollingMean(k)
+        self.d = RollingMean(d)
+        self.ma = {m: RollingMean(m) for m in self.ma_periods}
+        self.row = None
+
+    def seed(self, data):
+        """일봉 프레임 전체를 순서대로 반영"""
+        for high, low, close in zip(data['High'].to_numpy(), data['Low'].to_numpy(), data['Close'].to_numpy()):
+            self.update(high, low, close)
+        return self
+
+    def update(self, high, low, close):
+        hh = self.hh.push(high)
+        ll = self.ll.push(low)
+        raw = (close - ll) / (hh - ll) * 100
+        k = self.k.push(raw)
+        d = self.d.push(k)
+        mas = {m: self.ma[m].push(close) for m in self.ma_periods}
+        self.row = self._row(high, low, close, hh, ll, k, d, mas)
+        return self.row
+
+    def preview(self, high, low, close):
+        hh = self.hh.peek(high)
+        ll = self.ll.peek(low)
+        raw = (close - ll) / (hh - ll) * 100
+        k = self.k.peek(raw)
+        d = self.d.peek(k)
+        mas = {m: self.ma[m].peek(close) for m in self.ma_periods}
+        return self._row(high, low, close, hh, ll, k, d, mas)
+
+    def _row(self, high, low, close, hh, ll, k, d, mas):
+        row = {'High': high, 'Low': low, 'Close': close, 'HH': hh, 'LL': ll, '%K': k, '%D': d}
+        for m, ma in mas.items():
+            row[f'MA{m}'] = ma
+            row[f'Dev{m}'] = (close - ma) / ma * 100
+        return row
+
+    @property
+    def ready(self):
+        """모든 지표가 유효한 값 (dropna 이후 구간)인지"""
+        return self.row is not None and not any(
+            isinstance(v, float) and math.isnan(v) for v in self.row.values()
+        )
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from .rolling import STOCH_ROWS, indicator_block
+
+# 오프라인 최적화로 정한 기본 파라미터
+DEFAULT_STOCH_CONFIG = {'period': 166, 'k_period': 57, 'd_period': 19}
+DEFAULT_MA_PERIODS = [20, 45, 151, 212]
+
+
+def calculate_indicators(data, stoch_config=None, ma_periods=None):
+    """Slow Stochastic (HH/LL/%K/%D) + 이동평균 · 이격도, 워밍업 구간은 제거
+
+    롤링 연산은 rolling.indicator_block 한 번으로 계산한다 (pandas rolling 연쇄와 같은 값 · 같은 NaN 워밍업).
+    """
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    block = indicator_block(data['High'], data['Low'], data['Close'], stoch_config, ma_periods)
+
+    m = len(ma_periods)
+    columns = {c: data[c].to_numpy() for c in data.columns}
+    columns.update(zip(STOCH_ROWS, block[:4]))
+    for i, ma in enumerate(ma_periods):
+        columns[f'MA{ma}'] = block[4 + i]
+        columns[f'Dev{ma}'] = block[4 + m + i]
+
+    return pd.DataFrame(columns, index=data.index).dropna()
@@ -0,0 +1,153 @@
+import argparse
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .engine import ACTION_LABELS, BUY, HOLD, SELL, SIGNAL_THRESHOLD, allocation_from_arrays
+from .incremental import IncrementalIndicators
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG
+from .providers import normalize_minutes
+
+# 장중 분봉 폴링 주기 (초) — 모든 세션이 한 번의 요청 결과를 공유
+LIVE_POLL_SECONDS = 30
+
+
+class LiveAllocator:
+    """분봉 스트림으로 오늘의 잠정 일봉을 만들고 잠정 배분을 봉당 O(1)로 갱신
+
+    확정 일봉으로 지표 상태를 시드한 뒤, 분봉이 들어올 때마다 오늘 봉(시가 고정 · 고가/저가 누적 · 종가 최신)을
+    IncrementalIndicators.preview()에 넣어 '지금 장이 끝나면' 나올 비중을 계산한다.
+    날짜가 바뀌면 전일 잠정 봉을 확정 반영한다.
+    """
+
+    def __init__(self, daily, stoch_config=None, ma_periods=None, until=None):
+        self.stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+        self.ma_periods = list(ma_periods or DEFAULT_MA_PERIODS)
+        self.indicators = IncrementalIndicators(self.stoch_config, self.ma_periods)
+        self._lock = threading.Lock()
+        self.session = None
+        self.bar = None
+        self.last_ts = None
+        self.state = None
+
+        if until is not None:
+            daily = daily[daily.index < pd.Timestamp(until)]
+        row = None
+        for high, low, close in zip(daily['High'].to_numpy(), daily['Low'].to_numpy(), daily['Close'].to_numpy()):
+            row = self.indicators.update(high, low, close)
+        self.base_tqqq = self._allocation(row) if row else 0.0
+        self.last_date = daily.index[-1] if len(daily) else pd.Timestamp.min
+
+    def _allocation(self, row):
+        ma = np.array([row[f'MA{p}'] for p in self.ma_periods])
+        return float(allocation_from_arrays(row['%K'], row['%D'], row['Close'], ma))
+
+    def _commit(self):
+        """진행 중이던 세션의 잠정 봉을 확정 일봉으로 반영"""
+        _, high, low, close = self.bar
+        row = self.indicators.update(high, low, close)
+        self.base_tqqq = self._allocation(row)
+        self.last_date = self.session
+        self.session = None
+        self.bar = None
+
+    def on_bar(self, ts, open_, high, low, close):
+        """분봉 하나 반영 후 잠정 상태 반환 (이미 반영한 시각 · 확정 일봉 날짜의 분봉은 무시)"""
+        ts = pd.Timestamp(ts)
+        day = ts.normalize()
+        with self._lock:
+            if (self.last_ts is not None and ts <= self.last_ts) or day <= self.last_date:
+                return self.state
+            if self.session is not None and day > self.session:
+                self._commit()
+            if self.session is None:
+                self.session = day
+                self.bar = [open_, high, low, close]
+            else:
+                self.bar[1] = max(self.bar[1], high)
+                self.bar[2] = min(self.bar[2], low)
+                self.bar[3] = close
+            self.last_ts = ts
+            self.state = self._evaluate(ts)
+            return self.state
+
+    def consume(self, bars):
+        """분봉 프레임 (Open/High/Low/Close, 시각 인덱스) 중 새 봉만 반영"""
+        if self.last_ts is not None:
+            bars = bars[bars.index > self.last_ts]
+        for ts, o, h, l, c in zip(bars.index, bars['Open'].to_numpy(), bars['High'].to_numpy(),
+                                  bars['Low'].to_numpy(), bars['Close'].to_numpy()):
+            self.on_bar(ts, o, h, l, c)
+        return self.state
+
+    def _evaluate(self, ts):
+        open_, high, low, close = self.bar
+        row = self.indicators.preview(high, low, close)
+        tqqq = self._allocation(row)
+        change = tqqq - self.base_tqqq
+        action = BUY if change > SIGNAL_THRESHOLD else SELL if change < -SIGNAL_THRESHOLD else HOLD
+        return {
+            'time': ts,
+            'session': self.session,
+            'open': open_,
+            'high': high,
+            'low': low,
+            'price': close,
+            'stoch_k': row['%K'],
+            'stoch_d': row['%D'],
+            'is_bullish': row['%K'] > row['%D'],
+            'ma_signals': {p: close > row[f'MA{p}'] for p in self.ma_periods},
+            'base_tqqq': self.base_tqqq,
+            'tqqq': tqqq,
+            'change': change,
+            'action': ACTION_LABELS[action],
+        }
+
+
+def load_minute_bars(path):
+    """분봉 파일 (CSV/Parquet, 시각 인덱스 + OHLC) — tz 정보가 있으면 뉴욕 시각으로 변환"""
+    if str(path).endswith('.parquet'):
+        return normalize_minutes(pd.read_parquet(path))
+    return normalize_minutes(pd.read_csv(path, index_col=0))
+
+
+def replay(allocator, bars, only_changes=True):
+    """분봉을 순서대로 재생하며 잠정 상태를 내보냄 (only_changes면 잠정 시그널이 바뀔 때만)"""
+    last_action = None
+    for ts, o, h, l, c in zip(bars.index, bars['Open'].to_numpy(), bars['High'].to_numpy(),
+                              bars['Low'].to_numpy(), bars['Close'].to_numpy()):
+        state = allocator.on_bar(ts, o, h, l, c)
+        if state is None:
+            continue
+        if not only_changes or (state['action'], state['tqqq']) != last_action:
+            last_action = (state['action'], state['tqqq'])
+            yield state
+
+
+def main(argv=None):
+    from .backtest import load_price_file
+
+    parser = argparse.ArgumentParser(description='분봉 재생으로 장중 잠정 배분 확인')
+    parser.add_argument('daily', help='확정 일봉 CSV/Parquet')
+    parser.add_argument('minutes', help='재생할 분봉 CSV/Parquet')
+    parser.add_argument('--all', action='store_true', help='변화가 없어도 모든 분봉 상태 출력')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    bars = load_minute_bars(args.minutes)
+    allocator = LiveAllocator(load_price_file(args.daily), until=bars.index[0].normalize())
+    for state in replay(allocator, bars, only_changes=not args.all):
+        if args.json:
+            print(json.dumps({k: (v.isoformat() if isinstance(v, pd.Timestamp) else
+                                  {str(p): bool(s) for p, s in v.items()} if isinstance(v, dict) else
+                                  v if isinstance(v, str) else float(v))
+                              for k, v in state.items()}))
+        else:
+            print(f"{state['time']:%Y-%m-%d %H:%M} ${state['price']:.2f} · %K {state['stoch_k']:.1f} %D {state['stoch_d']:.1f}"
+                  f" · 잠정 비중 {state['base_tqqq']:.0%} → {state['tqqq']:.0%} ({state['action']})")
+
+
+if __name__ == '__main__':
+    main()
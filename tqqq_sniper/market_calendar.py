@@ -0,0 +1,154 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+NY = ZoneInfo('America/New_York')
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+# 종가 확정 후 공급자에 일봉이 반영되기까지의 여유 시간
+DATA_DELAY = timedelta(minutes=20)
+
+# 규칙으로 계산되지 않는 임시 휴장일 (국장·자연재해)
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29), date(2012, 10, 30),
+    date(2018, 12, 5),
+    date(2025, 1, 9),
+}
+
+
+def _observed(d):
+    """토요일 → 금요일, 일요일 → 월요일 대체 휴일"""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def _nth_weekday(year, month, weekday, n):
+    d = date(year, month, 1)
+    d += timedelta(days=(weekday - d.weekday()) % 7)
+    return d + timedelta(weeks=n - 1)
+
+
+def _last_weekday(year, month, weekday):
+    d = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """그레고리력 부활절 (Anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """NYSE 정규 휴장일 집합"""
+    days = {
+        _nth_weekday(year, 1, 0, 3),               # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),               # Washington's Birthday
+        _easter(year) - timedelta(days=2),         # Good Friday
+        _last_weekday(year, 5, 0),                 # Memorial Day
+        _observed(date(year, 7, 4)),               # Independence Day
+        _nth_weekday(year, 9, 0, 1),               # Labor Day
+        _nth_weekday(year, 11, 3, 4),              # Thanksgiving
+        _observed(date(year, 12, 25)),             # Christmas
+    }
+    # 신정이 토요일이면 전년도 12/31 대체 휴장 없음
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))     # Juneteenth
+    days |= {d for d in SPECIAL_CLOSURES if d.year == year}
+    return frozenset(days)
+
+
+def is_trading_day(d):
+    if isinstance(d, datetime):
+        d = d.date()
+    return d.weekday() < 5 and d not in nyse_holidays(d.year)
+
+
+@lru_cache(maxsize=None)
+def _holiday_calendar(first_year, last_year):
+    holidays = sorted(set().union(*(nyse_holidays(y) for y in range(first_year, last_year + 1))))
+    return np.busdaycalendar(holidays=np.array(holidays, dtype='datetime64[D]'))
+
+
+def session_days(start, end):
+    """[start, end] 구간 거래일 (datetime64[D] 배열) — np.is_busday로 주말 · 휴장일을 한 번에 제외"""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    days = np.arange(start.to_datetime64(), end.to_datetime64() + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+    return days[np.is_busday(days, busdaycal=_holiday_calendar(start.year, end.year))]
+
+
+def trading_days(start, end):
+    """[start, end] 구간 거래일 인덱스"""
+    return pd.DatetimeIndex(session_days(start, end).astype('datetime64[ns]'))
+
+
+def is_market_open(now=None):
+    """정규장 진행 중 여부 (뉴욕 시간, 조기 폐장은 고려하지 않음)"""
+    now = (now or datetime.now(NY)).astimezone(NY)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def _session_close(d):
+    return datetime.combine(d, MARKET_CLOSE, tzinfo=NY)
+
+
+def next_close(now=None):
+    """now 이후 첫 정규장 마감 시각 (뉴욕 시간)"""
+    now = (now or datetime.now(NY)).astimezone(NY)
+    d = now.date()
+    if is_trading_day(d) and now < _session_close(d):
+        return _session_close(d)
+    d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return _session_close(d)
+
+
+def next_open(now=None):
+    """now 이후 (장중이면 지금 세션 포함하지 않음) 첫 정규장 개장 시각 (뉴욕 시간)"""
+    now = (now or datetime.now(NY)).astimezone(NY)
+    d = now.date()
+    if is_trading_day(d) and now < datetime.combine(d, MARKET_OPEN, tzinfo=NY):
+        return datetime.combine(d, MARKET_OPEN, tzinfo=NY)
+    d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return datetime.combine(d, MARKET_OPEN, tzinfo=NY)
+
+
+def previous_close(now=None):
+    """now 이전 마지막 정규장 마감 시각 (뉴욕 시간)"""
+    now = (now or datetime.now(NY)).astimezone(NY)
+    d = now.date()
+    if is_trading_day(d) and now >= _session_close(d):
+        return _session_close(d)
+    d -= timedelta(days=1)
+    while not is_trading_day(d):
+        d -= timedelta(days=1)
+    return _session_close(d)
+
+
+def bar_expiry(now=None):
+    """now 시점에 받은 일봉 데이터의 만료 시각 — 새 일봉이 생길 수 있는 가장 이른 시각"""
+    now = (now or datetime.now(NY)).astimezone(NY)
+    return next_close(now - DATA_DELAY) + DATA_DELAY
@@ -0,0 +1,154 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """프로세스 전역 계측값 — 단계별 소요시간 요약 · 카운터 (Prometheus 텍스트로 노출)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}   # (이름, 라벨) → [count, sum, max, last]
+        self._counters = {}  # (이름, 라벨) → 값
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            t = self._timings.setdefault(key, [0, 0.0, 0.0, 0.0])
+            t[0] += 1
+            t[1] += seconds
+            t[2] = max(t[2], seconds)
+            t[3] = seconds
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            timings = {k: list(v) for k, v in self._timings.items()}
+            counters = dict(self._counters)
+        return timings, counters
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        timings, counters = self.snapshot()
+        lines = []
+
+        def fmt(labels):
+            if not labels:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+        for name in sorted({k[0] for k in timings}):
+            series = sorted((labels, v) for (n, labels), v in timings.items() if n == name)
+            metric = f'tqqq_{name}_seconds'
+            lines.append(f'# TYPE {metric} summary')
+            for labels, (count, total, _, _) in series:
+                lines.append(f'{metric}_count{fmt(labels)} {count}')
+                lines.append(f'{metric}_sum{fmt(labels)} {total:.6f}')
+            for suffix, pos in (('max', 2), ('last', 3)):
+                lines.append(f'# TYPE {metric}_{suffix} gauge')
+                for labels, values in series:
+                    lines.append(f'{metric}_{suffix}{fmt(labels)} {values[pos]:.6f}')
+        for name in sorted({k[0] for k in counters}):
+            metric = f'tqqq_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f'{metric}{fmt(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RunTimer:
+    """재실행(rerun) 한 번의 단계별 소요시간 — 끝나면 구조화 로그 한 줄과 전역 레지스트리로 기록"""
+
+    def __init__(self, name='rerun'):
+        self.name = name
+        self.stages = []
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self.stages.append((stage, elapsed))
+            registry.observe('stage', elapsed, stage=stage)
+
+    def finish(self, **fields):
+        total = time.perf_counter() - self._t0
+        registry.observe('stage', total, stage=self.name)
+        logger.info(json.dumps({
+            'event': self.name,
+            'total_ms': round(total * 1000, 3),
+            'stages': {s: round(t * 1000, 3) for s, t in self.stages},
+            **fields,
+        }, ensure_ascii=False, default=str))
+        return total
+
+
+# -----------------------------------------------------------
+# /metrics HTTP 엔드포인트 (선택)
+# -----------------------------------------------------------
+_server = None
+_server_lock = threading.Lock()
+
+
+def _metrics_handler():
+    """/metrics 요청 핸들러 클래스 — http.server는 서버를 띄울 때만 import (CLI 경로를 가볍게)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """백그라운드 스레드로 /metrics 서버 시작 — 프로세스당 한 번만
+
+    기본은 로컬에서만 접속 가능 — 다른 호스트의 수집기가 읽어야 하면 host='0.0.0.0' 등으로 명시한다.
+    """
+    global _server
+    from http.server import ThreadingHTTPServer
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _metrics_handler())
+            threading.Thread(target=_server.serve_forever, daemon=True, name='tqqq-metrics').start()
+    return _server
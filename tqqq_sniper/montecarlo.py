@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .backtest import TRADING_DAYS, load_price_file, path_stats, simulate_paths
+from .engine import allocation_from_arrays
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG
+from .params import warmup_length
+from .rolling import indicator_block
+from .synthetic import bootstrap_paths, leveraged_paths
+
+METHODS = ('bootstrap', 'leveraged')
+STAT_COLUMNS = ['cagr', 'max_drawdown', 'sharpe', 'turnover', 'total_return']
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# -----------------------------------------------------------
+# 워커 — 원본 일봉과 설정은 초기화 때 한 번만 전달, 경로는 워커가 직접 생성
+# -----------------------------------------------------------
+_ctx = {}
+
+
+def _init_worker(source, settings):
+    _ctx.clear()
+    _ctx.update(source=source, settings=settings)
+
+
+def _generate(n_paths, seed):
+    s = _ctx['settings']
+    if s['method'] == 'leveraged':
+        return leveraged_paths(_ctx['source'], n_paths, s['n_days'], s['leverage'], s['expense_ratio'],
+                               s['block'], seed)
+    return bootstrap_paths(_ctx['source'], n_paths, s['n_days'], s['block'], seed)
+
+
+def _evaluate(job):
+    """경로 묶음 하나 — 지표 · 배분 · 체결을 (일수, 경로 수) 배열로 한 번에 계산"""
+    n_paths, seed = job
+    s = _ctx['settings']
+    stoch, mas = s['stoch_config'], s['ma_periods']
+    high, low, close = _generate(n_paths, seed)
+
+    block = indicator_block(high, low, close, stoch, mas, batch=True)
+    tqqq = allocation_from_arrays(block[2], block[3], close, block[4:4 + len(mas)])
+
+    # 워밍업 이후 구간만 평가, lag일 뒤 체결 (run_backtest와 같은 규칙)
+    start, lag = s['start'], s['lag']
+    executed = np.concatenate([np.zeros((lag, n_paths)), tqqq[:len(tqqq) - lag]])[start:]
+    close = close[start:]
+    years = len(close) / TRADING_DAYS
+
+    equity, turnover = simulate_paths(close, executed, s['cost_bps'], s['slippage_bps'], s['cash_rate'])
+    strategy = path_stats(equity, years, turnover, s['cash_rate'])
+    benchmark = path_stats(close / close[0], years, cash_rate=s['cash_rate'])
+    return strategy, benchmark
+
+
+def _jobs(n_paths, chunk, seed):
+    """경로 묶음별 (경로 수, 독립 난수 시드) — 워커 수와 무관하게 같은 seed면 같은 결과"""
+    sizes = [min(chunk, n_paths - i) for i in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, seeds))
+
+
+def run_montecarlo(data, n_paths=1000, n_days=None, method='bootstrap', block=20, leverage=3.0,
+                   expense_ratio=0.0095, stoch_config=None, ma_periods=None, cost_bps=5.0, slippage_bps=5.0,
+                   cash_rate=0.0, lag=1, seed=0, workers=None, chunk=250):
+    """합성 경로 n_paths개에 배분 규칙을 적용한 성과 분포
+
+    method='bootstrap': data(TQQQ 일봉)의 일간 수익률을 block일 단위로 재표본
+    method='leveraged': data를 기초지수(QQQ 등) 일봉으로 보고 일간 leverage배 복리 경로 생성
+    n_days는 지표 워밍업을 포함한 경로 길이 (기본: data 길이), 성과는 워밍업 이후 구간으로 계산한다.
+    반환: {'paths': 경로별 성과표, 'summary': 지표별 분위수표}
+    """
+    if method not in METHODS:
+        raise ValueError(f'알 수 없는 방법: {method} ({", ".join(METHODS)})')
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    n_days = n_days or len(data)
+    start = warmup_length(stoch_config, ma_periods) + lag
+    if start >= n_days - 1:
+        raise ValueError('경로 길이가 지표 워밍업보다 짧습니다')
+
+    settings = {
+        'method': method, 'n_days': n_days, 'block': block, 'leverage': leverage,
+        'expense_ratio': expense_ratio, 'stoch_config': stoch_config, 'ma_periods': list(ma_periods),
+        'cost_bps': cost_bps, 'slippage_bps': slippage_bps, 'cash_rate': cash_rate, 'lag': lag, 'start': start,
+    }
+    source = data[['High', 'Low', 'Close']].astype(float)
+    jobs = _jobs(n_paths, chunk, seed)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    if workers == 1:
+        _init_worker(source, settings)
+        results = [_evaluate(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(source, settings)) as pool:
+            results = list(pool.map(_evaluate, jobs))
+
+    paths = pd.DataFrame({
+        **{c: np.concatenate([r[0][c] for r in results]) for c in STAT_COLUMNS},
+        **{f'bh_{c}': np.concatenate([r[1][c] for r in results]) for c in STAT_COLUMNS if c != 'turnover'},
+    })
+    paths.index.name = 'path'
+    summary = paths.quantile([p / 100 for p in PERCENTILES]).T
+    summary.columns = [f'p{p}' for p in PERCENTILES]
+    summary['mean'] = paths.mean()
+    return {'paths': paths, 'summary': summary}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='몬테카를로 · 부트스트랩 경로로 배분 규칙 성과 분포 추정')
+    parser.add_argument('prices', help="일봉 CSV/Parquet (bootstrap: TQQQ, leveraged: 기초지수 QQQ 등)")
+    parser.add_argument('--method', choices=METHODS, default='bootstrap')
+    parser.add_argument('--paths', type=int, default=1000)
+    parser.add_argument('--days', type=int, help='경로 길이 (워밍업 포함, 기본: 입력 길이)')
+    parser.add_argument('--block', type=int, default=20, help='부트스트랩 블록 길이 (일)')
+    parser.add_argument('--leverage', type=float, default=3.0)
+    parser.add_argument('--expense-ratio', type=float, default=0.0095)
+    parser.add_argument('--cost-bps', type=float, default=5.0)
+    parser.add_argument('--slippage-bps', type=float, default=5.0)
+    parser.add_argument('--cash-rate', type=float, default=0.0)
+    parser.add_argument('--lag', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--out', help='경로별 성과표 CSV 저장 경로')
+    parser.add_argument('--json', action='store_true', help='분위수표를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    result = run_montecarlo(
+        load_price_file(args.prices), n_paths=args.paths, n_days=args.days, method=args.method,
+        block=args.block, leverage=args.leverage, expense_ratio=args.expense_ratio, cost_bps=args.cost_bps,
+        slippage_bps=args.slippage_bps, cash_rate=args.cash_rate, lag=args.lag, seed=args.seed,
+        workers=args.workers,
+    )
+    if args.out:
+        result['paths'].to_csv(args.out)
+    if args.json:
+        print(json.dumps(result['summary'].to_dict(orient='index'), indent=2))
+    else:
+        print(result['summary'].to_string(float_format=lambda v: f'{v:.4f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""파라미터 조합 · 워밍업 길이 · 탐색 워커 공용 컨텍스트
+
+sweep · walkforward가 같은 워커 컨텍스트(롤링 결과 캐시)를 쓰고, history · montecarlo는 워밍업 길이만 쓴다.
+CLI 모듈끼리 서로의 내부를 import하지 않도록 공용 부분을 여기에 둔다.
+"""
+import itertools
+
+import numpy as np
+
+from .engine import allocation_from_arrays
+from .rolling import rolling_max, rolling_mean, rolling_min
+
+
+# -----------------------------------------------------------
+# 파라미터 조합
+# -----------------------------------------------------------
+def param_grid(periods, k_periods, d_periods, ma_sets):
+    """격자 탐색 조합 — (stoch_config, ma_periods) 리스트"""
+    return [
+        ({'period': p, 'k_period': k, 'd_period': d}, list(mas))
+        for p, k, d, mas in itertools.product(periods, k_periods, d_periods, ma_sets)
+    ]
+
+
+def random_params(n, period_range=(50, 250), k_range=(5, 80), d_range=(3, 40),
+                  ma_range=(5, 250), ma_count=4, seed=None):
+    """무작위 탐색 조합 — MA는 오름차순 (앞의 두 개가 하락 국면 단기 MA)"""
+    rng = np.random.default_rng(seed)
+    combos = []
+    for _ in range(n):
+        stoch = {
+            'period': int(rng.integers(period_range[0], period_range[1] + 1)),
+            'k_period': int(rng.integers(k_range[0], k_range[1] + 1)),
+            'd_period': int(rng.integers(d_range[0], d_range[1] + 1)),
+        }
+        mas = sorted(rng.choice(np.arange(ma_range[0], ma_range[1] + 1), ma_count, replace=False).tolist())
+        combos.append((stoch, mas))
+    return combos
+
+
+def chunks(combos, workers):
+    """워커에 나눠 줄 조합 순번 묶음 — 같은 스토캐스틱 기간끼리 묶어 워커별 HH/LL 캐시 적중률을 높임
+
+    순번(combos 위치)을 돌려주므로 결과를 원래 순서로 되돌릴 때도 그대로 쓴다.
+    """
+    order = sorted(range(len(combos)), key=lambda i: (combos[i][0]['period'], combos[i][0]['k_period']))
+    size = max(1, len(order) // (workers * 4))
+    return [order[i:i + size] for i in range(0, len(order), size)]
+
+
+def warmup_length(stoch_config, ma_periods):
+    """지표가 모두 유효해지는 첫 인덱스"""
+    p, k, d = stoch_config['period'], stoch_config['k_period'], stoch_config['d_period']
+    return max(p + k + d - 3, max(ma_periods) - 1)
+
+
+def int_list(text):
+    """'20,45,151' → [20, 45, 151] (argparse type)"""
+    return [int(v) for v in text.split(',')]
+
+
+# -----------------------------------------------------------
+# 워커 컨텍스트 — 같은 창 길이의 롤링 결과는 프로세스 안에서 재사용
+# -----------------------------------------------------------
+context = {}
+
+
+def init_worker(high, low, close, dates, settings):
+    """프로세스 풀 initializer (workers=1이면 현재 프로세스에서 직접 호출)"""
+    context.clear()
+    context.update(high=high, low=low, close=close, dates=dates, settings=settings,
+                   ma={}, stoch={}, smooth={})
+
+
+def _cached(cache, key, fn):
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
+def _raw_stoch(p):
+    def compute():
+        hh = rolling_max(context['high'], p, batch=True)
+        ll = rolling_min(context['low'], p, batch=True)
+        return (context['close'] - ll) / (hh - ll) * 100
+    return _cached(context['stoch'], p, compute)
+
+
+def _k_line(p, k):
+    return _cached(context['smooth'], (p, k), lambda: rolling_mean(_raw_stoch(p), k, batch=True))
+
+
+def _d_line(p, k, d):
+    return _cached(context['smooth'], (p, k, d), lambda: rolling_mean(_k_line(p, k), d, batch=True))
+
+
+def _ma(period):
+    return _cached(context['ma'], period, lambda: rolling_mean(context['close'], period, batch=True))
+
+
+def target_weights(stoch_config, ma_periods):
+    """현재 워커 데이터 기준 전 구간 목표 비중 (캐시된 롤링 배열 사용)"""
+    p, k, d = stoch_config['period'], stoch_config['k_period'], stoch_config['d_period']
+    ma = np.stack([_ma(m) for m in ma_periods])
+    return allocation_from_arrays(_k_line(p, k), _d_line(p, k, d), context['close'], ma)
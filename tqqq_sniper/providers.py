@@ -0,0 +1,343 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class ProviderError(Exception):
+    """재시도 후에도 공급자 요청이 실패함"""
+
+
+def normalize_ohlc(data):
+    """공급자 응답을 표준 OHLC 프레임으로 정규화 (tz 제거 · 날짜 인덱스 · 정렬)"""
+    if data is None or len(data) == 0:
+        return pd.DataFrame(columns=OHLC_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+
+    df = pd.DataFrame({c: data[c] for c in OHLC_COLUMNS}).astype(float)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize()
+    df.index.name = 'Date'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.dropna()
+
+
+def normalize_minutes(data):
+    """분봉 응답을 표준 OHLC 프레임으로 정규화 (뉴욕 시각 · tz 제거 · 정렬)"""
+    if data is None or len(data) == 0:
+        return pd.DataFrame(columns=OHLC_COLUMNS, index=pd.DatetimeIndex([], name='Datetime'), dtype=float)
+
+    df = pd.DataFrame({c: data[c] for c in OHLC_COLUMNS}).astype(float)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert('America/New_York').tz_localize(None)
+    df.index = index
+    df.index.name = 'Datetime'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.dropna()
+
+
+def _clip(df, start, end=None):
+    df = df[df.index >= pd.Timestamp(start).normalize()]
+    if end is not None:
+        df = df[df.index < pd.Timestamp(end)]
+    return df
+
+
+# -----------------------------------------------------------
+# 재시도 · 타임아웃 정책
+# -----------------------------------------------------------
+# 자체 타임아웃이 없는 호출에 타임아웃을 강제하기 위한 공용 스레드 풀 — 응답 없는 호출은 여기 남고
+# 세션은 즉시 풀려나지만, 실행 중인 스레드는 취소되지 않으므로 HTTP 공급자는 요청 자체에 timeout을 건다
+_call_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='tqqq-provider')
+
+
+class RetryPolicy:
+    """시도당 timeout초 제한 + 지수 백오프 재시도
+
+    call(..., bounded=True)는 fn이 요청 자체에 timeout을 거는 경우 (requests · yfinance · urlopen의
+    timeout=self.timeout) — 스레드 풀 없이 호출 스레드에서 바로 실행해 멈춘 요청이 풀 작업자를 잡고 있지 않게 한다.
+    """
+
+    def __init__(self, attempts=3, timeout=10.0, backoff=0.5, max_backoff=4.0, retry_on=(Exception,)):
+        self.attempts = attempts
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+
+    def call(self, fn, *args, bounded=False):
+        last = None
+        for attempt in range(self.attempts):
+            try:
+                if bounded:
+                    return fn(*args)
+                future = _call_pool.submit(fn, *args)
+                return future.result(timeout=self.timeout)
+            except FuturesTimeout as e:
+                # 3.11부터 FuturesTimeout은 내장 TimeoutError — bounded 호출의 소켓 타임아웃도 여기로 옴
+                if bounded:
+                    last = e
+                else:
+                    future.cancel()
+                    last = TimeoutError(f'{self.timeout:.1f}초 내 응답 없음')
+            except self.retry_on as e:
+                last = e
+            if attempt + 1 < self.attempts:
+                time.sleep(min(self.backoff * 2 ** attempt, self.max_backoff))
+        raise ProviderError(f'{getattr(fn, "__qualname__", fn)} 실패 ({self.attempts}회 시도): {last}') from last
+
+
+NO_RETRY = RetryPolicy(attempts=1, timeout=30.0)
+
+# 동시 요청용 풀 (타임아웃 풀과 분리해 서로의 작업자를 잠식하지 않게 함)
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='tqqq-fetch')
+
+
+def fetch_concurrent(provider, tickers, start, end=None, deadline=None):
+    """여러 티커를 동시에 요청 — (성공 {티커: OHLC}, 실패 {티커: 예외})
+
+    각 요청은 공급자의 retry 정책을 따르고, deadline(초)이 지나도 끝나지 않은 요청은
+    TimeoutError로 실패 처리한다. 전체 소요시간은 가장 느린 요청 하나와 비슷하다.
+    """
+    futures = {_fetch_pool.submit(provider.fetch, t, start, end): t for t in dict.fromkeys(tickers)}
+    done, pending = wait(futures, timeout=deadline)
+
+    frames, errors = {}, {}
+    for future in done:
+        ticker = futures[future]
+        try:
+            frames[ticker] = future.result()
+        except Exception as e:
+            errors[ticker] = e
+    for future in pending:
+        future.cancel()
+        errors[futures[future]] = TimeoutError(f'{deadline}초 내 응답 없음')
+    for ticker, e in errors.items():
+        logger.warning('%s 요청 실패: %s', ticker, e)
+    return frames, errors
+
+
+# -----------------------------------------------------------
+# 공급자 인터페이스
+# -----------------------------------------------------------
+class DataProvider:
+    """일봉 공급자 기본 클래스 — 하위 클래스는 _fetch(ticker, start, end)만 구현
+
+    모든 요청은 retry 정책(타임아웃 · 재시도)을 거치고 표준 OHLC 프레임으로 정규화된다.
+    bounded=True인 공급자는 HTTP 요청 자체에 retry.timeout을 걸어 타임아웃용 스레드 풀을 거치지 않는다.
+    batch=True인 공급자는 _fetch_many로 여러 티커를 한 번에 요청하고,
+    나머지는 티커별 요청을 동시에 보낸다 (fetch_concurrent).
+    """
+
+    retry = RetryPolicy()
+    batch = False
+    bounded = False
+
+    def __init__(self, retry=None):
+        if retry is not None:
+            self.retry = retry
+
+    def fetch(self, ticker, start, end=None):
+        return normalize_ohlc(self.retry.call(self._fetch, ticker, start, end, bounded=self.bounded))
+
+    def fetch_many(self, tickers, start, end=None):
+        """{티커: OHLC} — 실패한 티커는 결과에서 빠지고 경고 로그만 남긴다"""
+        if self.batch:
+            frames = self.retry.call(self._fetch_many, list(tickers), start, end, bounded=self.bounded)
+            return {t: normalize_ohlc(df) for t, df in frames.items()}
+        frames, _ = fetch_concurrent(self, tickers, start, end)
+        return frames
+
+    def fetch_intraday(self, ticker):
+        """오늘(최근 세션) 분봉 OHLC — 장중 라이브 모드용"""
+        return normalize_minutes(self.retry.call(self._fetch_intraday, ticker, bounded=self.bounded))
+
+    def _fetch(self, ticker, start, end):
+        raise NotImplementedError
+
+    def _fetch_many(self, tickers, start, end):
+        raise NotImplementedError
+
+    def _fetch_intraday(self, ticker):
+        raise NotImplementedError(f'{type(self).__name__}는 분봉을 제공하지 않습니다')
+
+
+class YFinanceProvider(DataProvider):
+    """yfinance 일봉 공급자"""
+
+    batch = True
+    bounded = True
+
+    def __init__(self, retry=None, session=None):
+        super().__init__(retry)
+        self.session = session
+
+    def _fetch(self, ticker, start, end):
+        import yfinance as yf
+        kwargs = {'session': self.session} if self.session is not None else {}
+        return yf.Ticker(ticker, **kwargs).history(
+            start=start, end=end, auto_adjust=True, timeout=self.retry.timeout
+        )
+
+    def _fetch_many(self, tickers, start, end):
+        """yf.download 한 번으로 여러 티커 일봉 요청"""
+        import yfinance as yf
+        kwargs = {'session': self.session} if self.session is not None else {}
+        data = yf.download(
+            tickers, start=start, end=end, auto_adjust=True, group_by='ticker',
+            threads=True, progress=False, timeout=self.retry.timeout, **kwargs,
+        )
+        frames = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker in data.columns.get_level_values(0):
+                    frames[ticker] = data[ticker]
+            else:
+                frames[ticker] = data
+        return frames
+
+    def _fetch_intraday(self, ticker):
+        import yfinance as yf
+        kwargs = {'session': self.session} if self.session is not None else {}
+        return yf.Ticker(ticker, **kwargs).history(
+            period='1d', interval='1m', auto_adjust=True, timeout=self.retry.timeout
+        )
+
+
+class FileProvider(DataProvider):
+    """로컬 파일 공급자 — <디렉터리>/<티커>.parquet 또는 .csv (분봉은 <티커>_1m.csv)
+
+    OHLC 열만 선택적으로 읽고 (Parquet columns / CSV usecols + memory_map),
+    파싱 결과는 파일 수정 시각이 바뀔 때까지 메모리에 보관한다.
+    """
+
+    retry = NO_RETRY
+
+    def __init__(self, directory, retry=None):
+        super().__init__(retry)
+        self.directory = directory
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker):
+        for ext in ('.parquet', '.csv'):
+            path = os.path.join(self.directory, f'{ticker}{ext}')
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(os.path.join(self.directory, f'{ticker}.parquet|csv'))
+
+    def _read(self, path):
+        if path.endswith('.parquet'):
+            try:
+                data = pd.read_parquet(path, columns=['Date'] + OHLC_COLUMNS).set_index('Date')
+            except Exception:
+                # 날짜가 열이 아니라 pandas 인덱스로 저장된 파일
+                data = pd.read_parquet(path, columns=OHLC_COLUMNS)
+            return normalize_ohlc(data)
+        data = pd.read_csv(
+            path, index_col=0, parse_dates=True, memory_map=True,
+            usecols=lambda c: c in OHLC_COLUMNS or c.lower() in ('date', 'datetime') or c.startswith('Unnamed'),
+        )
+        return normalize_ohlc(data)
+
+    def _fetch(self, ticker, start, end):
+        path = self._path(ticker)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self._read(path))
+            with self._lock:
+                self._cache[path] = cached
+        return _clip(cached[1], start, end)
+
+    def _fetch_intraday(self, ticker):
+        path = self._path(f'{ticker}_1m')
+        return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path, index_col=0)
+
+
+class MockProvider(DataProvider):
+    """메모리 공급자 (테스트용) — 호출 기록 · 인위적 지연 · 실패 티커 지정 가능"""
+
+    retry = NO_RETRY
+
+    def __init__(self, frames, latency=0.0, failing=(), retry=None):
+        super().__init__(retry)
+        self.frames = {t: normalize_ohlc(df) for t, df in frames.items()}
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+
+    def _fetch(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        if self.latency:
+            time.sleep(self.latency)
+        if ticker in self.failing:
+            raise ProviderError(f'{ticker}: 모의 실패')
+        return _clip(self.frames.get(ticker, normalize_ohlc(None)), start, end)
+
+
+class HttpJsonProvider(DataProvider):
+    """사내 바 피드 등 HTTP JSON 공급자 (requests 세션으로 연결 풀 재사용)
+
+    url 템플릿 예: 'https://feed.internal/bars/{ticker}?start={start}&end={end}'
+    응답은 레코드 리스트 또는 열 배열 dict, records_key 지정 시 그 하위 값을 사용한다.
+    fields로 응답 필드명 → Date/Open/High/Low/Close 매핑을 바꿀 수 있다.
+    """
+
+    DEFAULT_FIELDS = {'date': 'Date', 'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'}
+    bounded = True
+
+    def __init__(self, url, fields=None, records_key=None, headers=None, pool_size=16, retry=None):
+        super().__init__(retry)
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = url
+        self.fields = fields or self.DEFAULT_FIELDS
+        self.records_key = records_key
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _fetch(self, ticker, start, end):
+        url = self.url.format(
+            ticker=ticker,
+            start=pd.Timestamp(start).strftime('%Y-%m-%d'),
+            end=pd.Timestamp(end).strftime('%Y-%m-%d') if end is not None else '',
+        )
+        response = self.session.get(url, timeout=self.retry.timeout)
+        response.raise_for_status()
+        payload = response.json()
+        if self.records_key:
+            payload = payload[self.records_key]
+        df = pd.DataFrame(payload).rename(columns=self.fields)
+        df['Date'] = pd.to_datetime(df['Date'])
+        return _clip(df.set_index('Date'), start, end)
+
+
+def provider_from_spec(spec=None):
+    """설정 문자열 → 공급자 (TQQQ_PROVIDER 환경변수 기본)
+
+    'yfinance' · 'file:<디렉터리>' · 'http(s)://…{ticker}…'
+    """
+    spec = spec or os.environ.get('TQQQ_PROVIDER', 'yfinance')
+    if spec == 'yfinance':
+        return YFinanceProvider()
+    if spec.startswith('file:'):
+        return FileProvider(spec[len('file:'):])
+    if spec.startswith(('http://', 'https://')):
+        return HttpJsonProvider(spec)
+    raise ValueError(f'알 수 없는 공급자 설정: {spec}')
@@ -0,0 +1,145 @@
+"""국면별 방어 자산 배분 — TQQQ를 뺀 나머지(현금 몫)를 규칙표에 따라 SHV · TLT · GLD 등으로 돌림
+
+규칙 하나는 (자산, 국면, MA 기간, 가중치)이다. 해당 국면인 날 자산 종가가 자기 MA 위면 켜지고,
+켜진 규칙은 그 국면 규칙 가중치 합 중 자기 몫만큼 비TQQQ 몫을 자산에 배분한다. 꺼진 몫은 fallback(기본 SHV),
+fallback 데이터도 없으면 현금으로 남는다. 규칙표는 (규칙 수, 일수) 배열로 한 번에 평가하고
+자산별 합산은 행렬곱 한 번이라, 자산 · 규칙이 늘어도 파이썬 루프는 서로 다른 MA 기간 수만큼만 돈다.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .rolling import rolling_mean
+
+# ma=None이면 국면만 맞으면 항상 켜짐
+Rule = namedtuple('Rule', ['asset', 'regime', 'ma', 'weight'], defaults=(None, 1.0))
+
+BULL, BEAR, ANY = 'bull', 'bear', 'any'
+
+# 기본 규칙표 — 하락 국면 (%K < %D)의 비TQQQ 몫을 장기채 · 금의 50/200일 추세에 따라 나눔, 나머지는 SHV
+DEFAULT_RULES = [
+    Rule('TLT', BEAR, 50),
+    Rule('TLT', BEAR, 200),
+    Rule('GLD', BEAR, 50),
+    Rule('GLD', BEAR, 200),
+]
+DEFENSIVE_FALLBACK = 'SHV'
+
+# 방어 자산 종가가 이 일수(달력일)보다 오래되면 없는 것으로 봄 — 동기화가 멈춘 시계열을 계속 끌어 쓰지 않도록
+STALE_DAYS = 5
+_NEVER = -(10 ** 9)
+
+
+def rule_assets(rules=None, fallback=DEFENSIVE_FALLBACK):
+    """규칙표가 쓰는 자산 목록 (등장 순서, fallback 포함)"""
+    rules = DEFAULT_RULES if rules is None else rules
+    assets = [r.asset for r in rules] + ([fallback] if fallback else [])
+    return list(dict.fromkeys(assets))
+
+
+def compile_rules(rules, assets):
+    """규칙표 → 평가용 배열 (자산 인덱스, MA 기간 인덱스, 국면 코드, 가중치, MA 기간 목록)
+
+    MA 기간 인덱스 len(periods)는 'MA 없음' (항상 켜짐) 자리다.
+    """
+    periods = sorted({r.ma for r in rules if r.ma})
+    for r in rules:
+        if r.regime not in (BULL, BEAR, ANY):
+            raise ValueError(f'알 수 없는 국면: {r.regime!r}')
+    return (
+        np.array([assets.index(r.asset) for r in rules], dtype=np.intp),
+        np.array([periods.index(r.ma) if r.ma else len(periods) for r in rules], dtype=np.intp),
+        np.array([r.regime for r in rules]),
+        np.array([r.weight for r in rules], dtype=float),
+        periods,
+    )
+
+
+def defensive_from_arrays(bullish, leg, close, ma, compiled, fallback=None):
+    """방어 자산 비중 (일수, 자산 수)과 남은 현금 (일수,)
+
+    bullish, leg: (T,) — 상승 국면 여부 · 비TQQQ 몫
+    close: (T, A) 자산 종가 (없으면 NaN)  ·  ma: (MA 기간 수 + 1, T, A), 마지막 행은 -inf
+    fallback: 꺼진 몫을 받을 자산 인덱스 (None이면 현금)
+    """
+    asset, ma_idx, regime, weight, _ = compiled
+    bullish = np.asarray(bullish, dtype=bool)
+    leg = np.asarray(leg, dtype=float)
+
+    # (규칙 수, 일수) — 그날 국면에 해당하는 규칙 · 켜진 규칙
+    active = (regime[:, None] == ANY) | np.where(regime[:, None] == BULL, bullish, ~bullish)
+    fired = active & (close.T[asset] > ma[ma_idx, :, asset])
+    budget = (active * weight[:, None]).sum(axis=0)
+    share = np.divide(fired * weight[:, None], budget, out=np.zeros(fired.shape), where=budget > 0)
+
+    onehot = np.zeros((len(asset), close.shape[1]))
+    onehot[np.arange(len(asset)), asset] = 1
+    weights = (share.T @ onehot) * leg[:, None]
+
+    # 규칙이 있는 국면에서 꺼진 몫 → fallback, 규칙이 없는 국면은 현금 그대로
+    rest = leg * (1 - share.sum(axis=0))
+    if fallback is not None:
+        to_fallback = (budget > 0) & ~np.isnan(close[:, fallback])
+        weights[:, fallback] += np.where(to_fallback, rest, 0.0)
+        rest = np.where(to_fallback, 0.0, rest)
+    return weights, rest
+
+
+def align_closes(closes, index, periods):
+    """방어 자산 종가 프레임 → index 날짜 기준 (종가, MA 스택)
+
+    MA는 자산마다 자기 실제 봉만으로 계산한다 — 다른 자산 날짜의 빈칸 · 데이터 공백이 창을 NaN으로 만들지 않아
+    공백이 끝나면 바로 다시 유효하다. 신선도는 정렬된 출력에서만 자산별로 본다 — 마지막 실제 봉에서
+    STALE_DAYS보다 지난 날짜는 종가 · MA를 NaN으로 두므로 끊긴 자산의 전일 값이 이어지지 않는다.
+    지표 프레임은 워밍업이 잘려 있으므로 MA는 자산 자체 히스토리에서 계산한 뒤 각 날짜의 직전 값을 가져온다.
+    """
+    closes = closes.sort_index()
+    raw = closes.to_numpy(dtype=float)
+    if not len(raw):
+        close = np.full((len(index), raw.shape[1]), np.nan)
+        return close, np.broadcast_to(close, (len(periods) + 1,) + close.shape)
+
+    # 열별 마지막 실제 봉 날짜 (일 단위 정수, 아직 없으면 아주 먼 과거)
+    day = closes.index.to_numpy().astype('datetime64[D]').astype(np.int64)
+    last = np.maximum.accumulate(np.where(np.isnan(raw), _NEVER, day[:, None]), axis=0)
+    full = closes.ffill().to_numpy(dtype=float, copy=True)
+    ma = np.full((len(periods) + 1,) + raw.shape, np.nan)
+    ma[-1] = -np.inf
+    for j in range(raw.shape[1]):
+        real = ~np.isnan(raw[:, j])
+        if not real.any():
+            continue
+        own = raw[real, j]
+        at = np.cumsum(real) - 1     # 각 행 시점의 마지막 실제 봉 (자산 히스토리 기준 위치)
+        for i, p in enumerate(periods):
+            ma[i, :, j] = np.where(at >= 0, rolling_mean(own, p)[np.maximum(at, 0)], np.nan)
+
+    pos = closes.index.searchsorted(index, side='right') - 1
+    target = np.asarray(index).astype('datetime64[D]').astype(np.int64)
+    valid = (pos >= 0)[:, None] & (target[:, None] - last[np.maximum(pos, 0)] <= STALE_DAYS)
+    pos = np.maximum(pos, 0)
+    close = np.where(valid, full[pos], np.nan)
+    ma = ma[:, pos]
+    ma[:-1] = np.where(valid, ma[:-1], np.nan)
+    return close, ma
+
+
+def compute_defensive(data, tqqq, closes, rules=None, fallback=DEFENSIVE_FALLBACK):
+    """지표 프레임 전체 행의 방어 자산 배분 — 열: 규칙표 자산들 + Cash (TQQQ 비중은 tqqq 그대로)
+
+    data: 지표 프레임 (%K · %D)  ·  tqqq: 같은 행의 TQQQ 비중  ·  closes: 자산별 종가 와이드 프레임
+    """
+    rules = DEFAULT_RULES if rules is None else rules
+    assets = rule_assets(rules, fallback)
+    compiled = compile_rules(rules, assets)
+    close, ma = align_closes(closes.reindex(columns=assets), data.index, compiled[4])
+
+    bullish = data['%K'].to_numpy() > data['%D'].to_numpy()
+    weights, cash = defensive_from_arrays(
+        bullish, 1 - np.asarray(tqqq, dtype=float), close, ma, compiled,
+        assets.index(fallback) if fallback else None,
+    )
+    out = pd.DataFrame(weights, index=data.index, columns=assets)
+    out['Cash'] = cash
+    return out
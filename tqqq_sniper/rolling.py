@@ -0,0 +1,121 @@
+"""롤링 연산 · 지표 커널 — 시간축은 axis 0, (T,) 또는 (T, N) 배열
+
+numba가 있으면 rolling_kernels(pandas rolling의 보정 합(Kahan) 갱신 · 단조 덱을 그대로 옮긴 커널)를
+컴파일해 쓰고, 아니면 pandas rolling으로 열 전체를 한 번에 계산한다 — 두 경로 모두
+pandas rolling().mean() · max() · min()과 비트 단위로 같다 (NaN 처리도 min_periods=window와 같음).
+numba import · 캐시 로드만 수백 ms라, 크기(일수 × 열 수)가 JIT_MIN_CELLS 이상이거나 batch=True로 부르는
+반복 작업(sweep · walkforward · montecarlo)만 numba를 쓰고 CLI · 대시보드의 단일 시계열 경로는 pandas로 계산한다.
+TQQQ_NUMBA=0이면 항상 pandas, 1이면 크기와 관계없이 numba (설치돼 있을 때).
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+NUMBA_MODE = os.environ.get('TQQQ_NUMBA', 'auto')
+JIT_MIN_CELLS = 200_000
+
+# indicator_block() 결과 행 순서 (뒤에 MA{p} · Dev{p}가 ma_periods 순서로 붙음)
+STOCH_ROWS = ['HH', 'LL', '%K', '%D']
+
+
+@lru_cache(maxsize=None)
+def _jit():
+    """numba 커널 모듈 (rolling_jit) — numba가 없으면 None"""
+    try:
+        from . import rolling_jit
+    except ImportError:
+        return None
+    return rolling_jit
+
+
+def _kernels(cells, batch=False):
+    """numba 커널 모듈 — 작업이 작거나 numba가 없으면 None (pandas 경로)"""
+    if NUMBA_MODE != '0' and (NUMBA_MODE == '1' or batch or cells >= JIT_MIN_CELLS):
+        return _jit()
+    return None
+
+
+def _columns(x):
+    """(T,) · (T, N) → (N, T) 연속 배열"""
+    return np.ascontiguousarray((x[:, None] if x.ndim == 1 else x).T)
+
+
+def _by_column(name, x, *args, buffer=False, batch=False):
+    """열마다 numba 커널 실행 — numba를 쓰지 않는 작업이면 None"""
+    kernels = _kernels(x.size, batch)
+    if kernels is None:
+        return None
+    fn = getattr(kernels, name)
+    cols = _columns(x)
+    out = np.empty(cols.shape)
+    for j, col in enumerate(cols):
+        extra = (np.empty(len(col), dtype=np.int64),) if buffer else ()
+        fn(col, *args, *extra, out[j])
+    return out.T.reshape(x.shape)
+
+
+def _rolling(x, window, how, *args, buffer=False, batch=False):
+    """numba 커널 또는 pandas rolling 한 번 (열 전체를 벡터화)"""
+    x = np.asarray(x, dtype=float)
+    out = _by_column(how if how == 'mean' else 'extreme', x, window, *args, buffer=buffer, batch=batch)
+    if out is None:
+        frame = pd.DataFrame(x if x.ndim > 1 else x[:, None])
+        out = getattr(frame.rolling(window), how)().to_numpy().reshape(x.shape)
+    return out
+
+
+# -----------------------------------------------------------
+# 공개 함수
+# -----------------------------------------------------------
+def rolling_mean(x, window, batch=False):
+    """pandas rolling(window).mean()과 같은 값 · 같은 NaN 워밍업 (batch=True면 크기와 관계없이 numba)"""
+    return _rolling(x, window, 'mean', batch=batch)
+
+
+def rolling_max(x, window, batch=False):
+    return _rolling(x, window, 'max', 1.0, buffer=True, batch=batch)
+
+
+def rolling_min(x, window, batch=False):
+    return _rolling(x, window, 'min', -1.0, buffer=True, batch=batch)
+
+
+def indicator_block(high, low, close, stoch_config, ma_periods, batch=False):
+    """(4 + 2 × MA 개수, *close.shape) 배열 하나에 HH · LL · %K · %D · MA* · Dev* 계산
+
+    행 순서는 STOCH_ROWS + MA{p}… + Dev{p}…, 워밍업 구간은 NaN.
+    batch=True는 같은 계산을 여러 번 반복하는 작업용 — numba가 있으면 크기와 관계없이 사용한다.
+    numba 경로는 열마다 한 번의 시간축 순회, pandas 경로는 롤링 연쇄를 열 전체에 한 번씩 적용한다.
+    """
+    p, k, d = stoch_config['period'], stoch_config['k_period'], stoch_config['d_period']
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    m = len(ma_periods)
+    out = np.empty((4 + 2 * m,) + close.shape)
+
+    kernels = _kernels(close.size, batch)
+    if kernels is not None:
+        cols = list(zip(_columns(high), _columns(low), _columns(close)))
+        res = np.empty((len(cols), 4 + m, len(close)))
+        periods = np.asarray(ma_periods, dtype=np.int64)
+        for j, (h, l, c) in enumerate(cols):
+            buffers = np.empty(len(c), dtype=np.int64), np.empty(len(c), dtype=np.int64)
+            kernels.block(h, l, c, p, k, d, periods, *buffers, res[j])
+        out[:4 + m] = res.transpose(1, 2, 0).reshape((4 + m,) + close.shape)
+    else:
+        out[0] = _rolling(high, p, 'max')
+        out[1] = _rolling(low, p, 'min')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw = (close - out[1]) / (out[0] - out[1]) * 100
+        out[2] = _rolling(raw, k, 'mean')
+        out[3] = _rolling(out[2], d, 'mean')
+        for i, period in enumerate(ma_periods):
+            out[4 + i] = _rolling(close, period, 'mean')
+
+    ma = out[4:4 + m]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.subtract(close, ma, out=out[4 + m:])
+        out[4 + m:] /= ma
+        out[4 + m:] *= 100
+    return out
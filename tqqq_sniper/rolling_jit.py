@@ -0,0 +1,26 @@
+"""numba 커널 — rolling_kernels의 순수 파이썬 커널을 그대로 컴파일 (rolling이 큰 작업에서만 import)
+
+커널 본문은 rolling_kernels 하나뿐이라 두 경로의 연산 순서가 같다. 커널이 부르는 도우미(kahan 등)는
+컴파일된 것으로 바꿔 끼운 전역 사전으로 함수를 다시 만든다. 클로저가 아니라 모듈 전역 함수라
+numba 디스크 캐시(cache=True)가 프로세스 간에 적중한다.
+"""
+import types
+
+from numba import njit
+
+from . import rolling_kernels as source
+
+jit = njit(cache=True, error_model='numpy')
+
+_globals = dict(vars(source))
+for _name in ('signbit', 'kahan', 'mean_value', '_raw_stochastic'):
+    _globals[_name] = jit(getattr(source, _name))
+
+
+def _compile(fn):
+    return jit(types.FunctionType(fn.__code__, _globals, fn.__name__, fn.__defaults__))
+
+
+mean = _compile(source.mean)
+extreme = _compile(source.extreme)
+block = _compile(source.block)
@@ -0,0 +1,200 @@
+"""롤링 커널 원본 — rolling_jit이 numba로 컴파일하는 소스 (numba 없이도 import · 실행 가능한 순수 파이썬)
+
+pandas aggregations.pyx의 add_mean · remove_mean · calc_mean과 같은 순서로 연산해 결과가 비트 단위로 같다.
+창 상태는 (합, 추가 보정, 제거 보정, 개수, 음수 개수, 연속 같은 값 개수, 직전 값).
+배열 할당은 호출 쪽(rolling)에서 하고 (덱 버퍼 · 출력), 2-D 출력은 out[i][t]로 접근한다.
+이 모듈은 다른 패키지 모듈을 import하지 않는다 (rolling_jit이 전역을 바꿔 끼워 컴파일하는 말단 모듈).
+"""
+import math
+
+NAN = math.nan
+
+
+def signbit(v):
+    return math.copysign(1.0, v) < 0
+
+
+def kahan(total, comp, val):
+    y = val - comp
+    t = total + y
+    return t, t - total - y
+
+
+def mean_value(total, nobs, neg, same, prev, window):
+    if nobs < window or nobs <= 0:
+        return NAN
+    if same >= nobs:
+        return prev
+    result = total / nobs
+    if neg == 0 and result < 0:
+        return 0.0
+    if neg == nobs and result > 0:
+        return 0.0
+    return result
+
+
+def mean(x, window, out):
+    total = add_comp = remove_comp = 0.0
+    nobs = neg = same = 0
+    prev = x[0] if len(x) else NAN
+    for t in range(len(x)):
+        if window == 1:
+            total = add_comp = 0.0
+            nobs = neg = same = 0
+            prev = x[t]
+        elif t >= window:
+            v = x[t - window]
+            if v == v:
+                nobs -= 1
+                total, remove_comp = kahan(total, remove_comp, -v)
+                neg -= signbit(v)
+        v = x[t]
+        if v == v:
+            nobs += 1
+            total, add_comp = kahan(total, add_comp, v)
+            neg += signbit(v)
+            same = same + 1 if v == prev else 1
+            prev = v
+        out[t] = mean_value(total, nobs, neg, same, prev, window)
+
+
+def extreme(x, window, sign, dq, out):
+    """단조 덱 이동 최댓값(sign=1) · 최솟값(sign=-1), NaN은 건너뛰고 개수로 판정 — dq는 길이 len(x) 정수 버퍼"""
+    head = tail = nobs = 0
+    for t in range(len(x)):
+        if t >= window and x[t - window] == x[t - window]:
+            nobs -= 1
+        while head < tail and dq[head] <= t - window:
+            head += 1
+        v = x[t]
+        if v == v:
+            nobs += 1
+            while head < tail and sign * x[dq[tail - 1]] <= sign * v:
+                tail -= 1
+            dq[tail] = t
+            tail += 1
+        out[t] = x[dq[head]] if nobs >= window and head < tail else NAN
+
+
+def block(high, low, close, p, k, d, ma_periods, hq, lq, out):
+    """HH · LL · %K · %D · MA를 한 번의 시간축 순회로 계산 — hq · lq는 덱 버퍼, out은 (4 + MA 개수) 행
+
+    시점마다 덱 · 보정 합 상태만 갱신한다. %K 창에서 뺄 원시 스토캐스틱 값은
+    이미 채운 HH · LL 행으로 다시 계산한다 (같은 연산이라 같은 값).
+    """
+    T = len(close)
+    m = len(ma_periods)
+    hh, ll, pk, pd_ = out[0], out[1], out[2], out[3]
+    h_head = h_tail = l_head = l_tail = h_obs = l_obs = 0
+    # %K · %D 창 상태
+    k_total = k_add = k_remove = d_total = d_add = d_remove = 0.0
+    k_obs = k_neg = k_same = d_obs = d_neg = d_same = 0
+    k_prev = d_prev = NAN
+    # MA별 창 상태
+    ma_total = [0.0] * m
+    ma_add = [0.0] * m
+    ma_remove = [0.0] * m
+    ma_obs = [0] * m
+    ma_neg = [0] * m
+    ma_same = [0] * m
+    ma_prev = [close[0] if T else NAN] * m
+
+    for t in range(T):
+        # 이동 최고가 · 최저가
+        if t >= p:
+            h_obs -= high[t - p] == high[t - p]
+            l_obs -= low[t - p] == low[t - p]
+        while h_head < h_tail and hq[h_head] <= t - p:
+            h_head += 1
+        while l_head < l_tail and lq[l_head] <= t - p:
+            l_head += 1
+        if high[t] == high[t]:
+            h_obs += 1
+            while h_head < h_tail and high[hq[h_tail - 1]] <= high[t]:
+                h_tail -= 1
+            hq[h_tail] = t
+            h_tail += 1
+        if low[t] == low[t]:
+            l_obs += 1
+            while l_head < l_tail and low[lq[l_tail - 1]] >= low[t]:
+                l_tail -= 1
+            lq[l_tail] = t
+            l_tail += 1
+        hh[t] = high[hq[h_head]] if h_obs >= p and h_head < h_tail else NAN
+        ll[t] = low[lq[l_head]] if l_obs >= p and l_head < l_tail else NAN
+
+        # %K — 원시 스토캐스틱의 k일 평균 (HH == LL이면 pandas처럼 ±inf · NaN)
+        if k == 1:
+            k_total = k_add = 0.0
+            k_obs = k_neg = k_same = 0
+        elif t >= k:
+            v = _raw_stochastic(close[t - k], hh[t - k], ll[t - k])
+            if v == v:
+                k_obs -= 1
+                k_total, k_remove = kahan(k_total, k_remove, -v)
+                k_neg -= signbit(v)
+        v = _raw_stochastic(close[t], hh[t], ll[t])
+        if t == 0 or k == 1:
+            k_prev = v
+        if v == v:
+            k_obs += 1
+            k_total, k_add = kahan(k_total, k_add, v)
+            k_neg += signbit(v)
+            k_same = k_same + 1 if v == k_prev else 1
+            k_prev = v
+        pk[t] = mean_value(k_total, k_obs, k_neg, k_same, k_prev, k)
+
+        # %D — %K의 d일 평균
+        if d == 1:
+            d_total = d_add = 0.0
+            d_obs = d_neg = d_same = 0
+        elif t >= d:
+            v = pk[t - d]
+            if v == v:
+                d_obs -= 1
+                d_total, d_remove = kahan(d_total, d_remove, -v)
+                d_neg -= signbit(v)
+        v = pk[t]
+        if t == 0 or d == 1:
+            d_prev = v
+        if v == v:
+            d_obs += 1
+            d_total, d_add = kahan(d_total, d_add, v)
+            d_neg += signbit(v)
+            d_same = d_same + 1 if v == d_prev else 1
+            d_prev = v
+        pd_[t] = mean_value(d_total, d_obs, d_neg, d_same, d_prev, d)
+
+        # 이동평균
+        v = close[t]
+        for i in range(m):
+            w = ma_periods[i]
+            row = out[4 + i]
+            if w == 1:
+                ma_total[i] = ma_add[i] = 0.0
+                ma_obs[i] = ma_neg[i] = ma_same[i] = 0
+                ma_prev[i] = v
+            elif t >= w:
+                old = close[t - w]
+                if old == old:
+                    ma_obs[i] -= 1
+                    ma_total[i], ma_remove[i] = kahan(ma_total[i], ma_remove[i], -old)
+                    ma_neg[i] -= signbit(old)
+            if v == v:
+                ma_obs[i] += 1
+                ma_total[i], ma_add[i] = kahan(ma_total[i], ma_add[i], v)
+                ma_neg[i] += signbit(v)
+                ma_same[i] = ma_same[i] + 1 if v == ma_prev[i] else 1
+                ma_prev[i] = v
+            row[t] = mean_value(ma_total[i], ma_obs[i], ma_neg[i], ma_same[i], ma_prev[i], w)
+
+
+def _raw_stochastic(close, hh, ll):
+    """(종가 - LL) / (HH - LL) × 100 — NumPy 나눗셈과 같게 0으로 나누면 ±inf · NaN"""
+    num = close - ll
+    den = hh - ll
+    if den == 0:
+        if num == 0 or num != num:
+            return NAN
+        return math.copysign(math.inf, num) * math.copysign(1.0, den)
+    return num / den * 100
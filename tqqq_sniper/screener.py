@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from .engine import ACTION_LABELS, allocation_from_arrays, signals_from_allocation
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG
+from .rolling import STOCH_ROWS, indicator_block
+
+SCREEN_TICKERS = ['TQQQ', 'SOXL', 'UPRO', 'TECL', 'QLD']
+
+
+def to_panel(frames):
+    """{티커: OHLC} → {필드: 날짜×티커 와이드 프레임} (날짜는 합집합)"""
+    frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+    return {
+        field: pd.DataFrame({t: df[field] for t, df in frames.items()}).sort_index()
+        for field in ('Open', 'High', 'Low', 'Close')
+    }
+
+
+def calculate_wide_indicators(panel, stoch_config=None, ma_periods=None):
+    """와이드 프레임에 대해 지표를 계산 — 티커마다 자기 봉이 있는 날짜만으로 창을 구성
+
+    날짜는 티커 합집합이라 한 티커에만 빠진 날이 NaN으로 창 전체에 번지지 않도록, 종가가 있는 날짜 집합이
+    같은 티커끼리 묶어 indicator_block을 한 번씩 부른다 (검증된 패널은 보통 상장일 · 최신일 차이뿐이라 묶음이 적음).
+    봉이 없는 날짜의 지표는 NaN.
+    """
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    close = panel['Close']
+    high, low, values = (panel[f].to_numpy(dtype=float) for f in ('High', 'Low', 'Close'))
+    has_bar = ~np.isnan(values)
+    groups = {}
+    for j in range(values.shape[1]):
+        groups.setdefault(has_bar[:, j].tobytes(), []).append(j)
+
+    block = np.full((len(STOCH_ROWS) + 2 * len(ma_periods),) + values.shape, np.nan)
+    for cols in groups.values():
+        rows = np.flatnonzero(has_bar[:, cols[0]])
+        at = np.ix_(rows, cols)
+        block[:, rows[:, None], cols] = indicator_block(high[at], low[at], values[at], stoch_config, ma_periods)
+
+    def wide(values):
+        return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+    m = len(ma_periods)
+    out = {'Close': close}
+    out.update((name, wide(block[i])) for i, name in enumerate(STOCH_ROWS))
+    for i, ma in enumerate(ma_periods):
+        out[f'MA{ma}'] = wide(block[4 + i])
+        out[f'Dev{ma}'] = wide(block[4 + m + i])
+    return out
+
+
+def screen(panel, stoch_config=None, ma_periods=None):
+    """티커별 최신 시그널 요약 (행 = 티커)
+
+    상장일이 달라 워밍업 구간이 티커마다 다르므로, 각 티커의 마지막 유효 행과 그 전일을 사용한다.
+    """
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    ind = calculate_wide_indicators(panel, stoch_config, ma_periods)
+    tickers = ind['Close'].columns
+    dates = ind['Close'].index
+
+    close = ind['Close'].to_numpy()
+    k = ind['%K'].to_numpy()
+    d = ind['%D'].to_numpy()
+    ma = np.stack([ind[f'MA{p}'].to_numpy() for p in ma_periods])
+
+    valid = ~(np.isnan(close) | np.isnan(d) | np.isnan(ma).any(axis=0))
+    tqqq = allocation_from_arrays(k, d, close, ma)
+    _, change, action = signals_from_allocation(tqqq)
+
+    # 티커별 마지막 유효 행 (유효 행이 2개 미만이면 제외)
+    has_rows = valid.sum(axis=0) >= 2
+    last = len(dates) - 1 - np.argmax(valid[::-1], axis=0)
+    cols = np.arange(len(tickers))
+    prev_close = np.where(last > 0, close[np.maximum(last - 1, 0), cols], np.nan)
+
+    summary = pd.DataFrame({
+        'Date': dates[last],
+        'Close': close[last, cols],
+        'Change%': (close[last, cols] / prev_close - 1) * 100,
+        '%K': k[last, cols],
+        '%D': d[last, cols],
+        'Regime': np.where(k[last, cols] > d[last, cols], 'BULL', 'BEAR'),
+        'Allocation': tqqq[last, cols],
+        'PrevAllocation': tqqq[np.maximum(last - 1, 0), cols],
+        'Change': change[last, cols],
+        'Action': [ACTION_LABELS[int(a)] for a in action[last, cols]],
+    }, index=pd.Index(tickers, name='Ticker'))
+    for p in ma_periods:
+        summary[f'Dev{p}'] = ind[f'Dev{p}'].to_numpy()[last, cols]
+    return summary[has_rows]
@@ -0,0 +1,128 @@
+"""정적 스냅샷 — 데이터 갱신 시 한 번만 페이지를 그려 index.html · snapshot.json으로 저장
+
+조회만 하는 사용자는 Streamlit 세션 없이 이 파일을 정적 서버(nginx, S3 등)로 받는다.
+Plotly Figure는 한 번만 JSON으로 직렬화해 HTML과 JSON 번들에 같은 문자열을 그대로 넣는다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from .analyzer import to_payload
+from .chart import build_chart, data_version
+from .market_calendar import NY
+
+SNAPSHOT_HTML = 'index.html'
+SNAPSHOT_JSON = 'snapshot.json'
+
+
+def snapshot_version(data, stoch_config, ma_periods):
+    """스냅샷 버전 키 — 지표 데이터 버전 + 파라미터 (JSON 왕복 후에도 같은 값)"""
+    return [*data_version(data), list(stoch_config.values()), list(ma_periods)]
+
+
+def build_snapshot(r, data, aux, stoch_config, ma_periods, ticker='TQQQ', fig=None, generated_at=None):
+    """(HTML, JSON 번들 문자열) — fig를 주면 (앱의 차트 캐시 등) 다시 만들지 않는다"""
+    from .ui import render_page
+
+    generated_at = generated_at or datetime.now(NY)
+    figure_json = (fig if fig is not None else build_chart(data, ma_periods)).to_json()
+
+    html = render_page(r, aux, stoch_config, ma_periods, figure_json, generated_at, ticker)
+    meta = {
+        'version': snapshot_version(data, stoch_config, ma_periods),
+        'generated_at': generated_at.isoformat(timespec='seconds'),
+        'ticker': ticker,
+        'signal': to_payload(r),
+        'aux': {t: {'close': float(close), 'change_pct': float(pct)} for t, (close, pct) in aux.items()},
+    }
+    # 직렬화된 Figure를 다시 파싱하지 않고 그대로 이어 붙임
+    bundle = json.dumps(meta, ensure_ascii=False)[:-1] + f', "figure": {figure_json}}}'
+    return html, bundle
+
+
+def stored_version(directory):
+    """저장된 스냅샷의 버전 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(os.path.join(directory, SNAPSHOT_JSON), encoding='utf-8') as f:
+            return json.load(f).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, text):
+    """임시 파일에 쓴 뒤 교체 — 읽는 쪽은 항상 완전한 파일만 본다"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_snapshot(directory, r, data, aux, stoch_config, ma_periods, ticker='TQQQ', fig=None, force=False):
+    """스냅샷 파일 갱신 — 같은 버전이 이미 있으면 건너뛰고 False
+
+    HTML을 먼저, 버전이 담긴 JSON을 나중에 교체하므로 중간에 실패해도 다음 실행이 다시 쓴다.
+    """
+    version = snapshot_version(data, stoch_config, ma_periods)
+    if not force and stored_version(directory) == version:
+        return False
+    os.makedirs(directory, exist_ok=True)
+    html, bundle = build_snapshot(r, data, aux, stoch_config, ma_periods, ticker, fig)
+    _write_atomic(os.path.join(directory, SNAPSHOT_HTML), html)
+    _write_atomic(os.path.join(directory, SNAPSHOT_JSON), bundle)
+    return True
+
+
+def main(argv=None):
+    from .analyzer import TQQQAnalyzer
+    from .backtest import load_price_file
+    from .providers import provider_from_spec
+    from .store import BarStore
+
+    parser = argparse.ArgumentParser(description='대시보드 정적 스냅샷 (index.html + snapshot.json) 생성')
+    parser.add_argument('--out', default=os.environ.get('TQQQ_SNAPSHOT_DIR', 'snapshot'),
+                        help='출력 디렉터리 (기본: TQQQ_SNAPSHOT_DIR 또는 ./snapshot)')
+    parser.add_argument('--force', action='store_true', help='같은 데이터 버전이어도 다시 생성')
+    parser.add_argument('--ticker', default='TQQQ')
+    parser.add_argument('--store', help='SQLite 저장소 경로 (기본: TQQQ_STORE_PATH)')
+    parser.add_argument('--provider', help='공급자 설정 (기본: TQQQ_PROVIDER)')
+    parser.add_argument('--prices', help='저장소 대신 사용할 일봉 CSV/Parquet 파일 (보조 시계열 없음)')
+    parser.add_argument('--offline', action='store_true', help='공급자 동기화 없이 저장소만 사용')
+    parser.add_argument('--days', type=int, default=400, help='조회 기간 (일)')
+    args = parser.parse_args(argv)
+
+    analyzer = TQQQAnalyzer(
+        store=BarStore(args.store) if args.store else None,
+        provider=provider_from_spec(args.provider),
+        tickers=[args.ticker],
+    )
+    if args.prices:
+        data, aux = analyzer.validate(load_price_file(args.prices)), {}
+    else:
+        data = analyzer.get_data(days_back=args.days, sync=not args.offline)
+        aux = analyzer.get_aux()
+    if data is None or data.empty:
+        print('데이터를 불러올 수 없습니다.', file=sys.stderr)
+        return 1
+
+    ind = analyzer.calculate_indicators(data)
+    if len(ind) < 2:
+        print('지표 계산에 필요한 데이터가 부족합니다.', file=sys.stderr)
+        return 1
+    r = analyzer.analyze(ind, None if args.prices else analyzer.get_defensive(ind.index[0]))
+
+    written = write_snapshot(args.out, r, ind, aux, analyzer.stoch_config, analyzer.ma_periods,
+                             ticker=args.ticker, force=args.force)
+    print(f"{args.out}: {'생성' if written else '변경 없음 (같은 데이터 버전)'}")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
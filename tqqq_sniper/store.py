@@ -0,0 +1,245 @@
+import math
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+
+from .metrics import registry
+from .providers import OHLC_COLUMNS, ProviderError, fetch_concurrent, normalize_ohlc
+
+# TQQQ 상장일 — 저장소는 이 날짜부터 전체 히스토리를 보관
+HISTORY_START = '2010-02-09'
+DEFAULT_STORE_PATH = os.environ.get('TQQQ_STORE_PATH', os.path.join('data', 'bars.sqlite'))
+
+# 수정주가 소급 변경(배당·분할) 판정 허용 오차
+ADJUST_TOLERANCE = 1e-4
+# 한 배치 요청으로 묶는 티커 간 기준일 차이 상한 — 더 뒤처진 티커는 따로 요청
+MAX_ANCHOR_SPREAD = pd.Timedelta(days=7)
+
+
+class BarStore:
+    """(티커, 날짜) 키 SQLite 일봉 저장소 — 마지막 저장일 이후만 공급자에 요청"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.errors = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT NOT NULL,
+                    date   TEXT NOT NULL,
+                    open   REAL, high REAL, low REAL, close REAL,
+                    PRIMARY KEY (ticker, date)
+                )
+            """)
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        return _Transaction(con)
+
+    # -------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------
+    def last_dates(self, ticker, n=1):
+        """최근 저장일 n개 (내림차순)"""
+        with self._connect() as con:
+            rows = con.execute(
+                'SELECT date FROM bars WHERE ticker = ? ORDER BY date DESC LIMIT ?', (ticker, n)
+            ).fetchall()
+        return [pd.Timestamp(r[0]) for r in rows]
+
+    def last_date(self, ticker):
+        dates = self.last_dates(ticker)
+        return dates[0] if dates else None
+
+    def load(self, ticker, start=None, end=None):
+        """저장된 일봉을 OHLC 프레임으로 반환 (start 포함, end 미포함)"""
+        sql = 'SELECT date, open, high, low, close FROM bars WHERE ticker = ?'
+        params = [ticker]
+        if start is not None:
+            sql += ' AND date >= ?'
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            sql += ' AND date < ?'
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        sql += ' ORDER BY date'
+        with self._connect() as con:
+            rows = con.execute(sql, params).fetchall()
+
+        index = pd.DatetimeIndex([r[0] for r in rows], name='Date')
+        return pd.DataFrame([r[1:] for r in rows], index=index, columns=OHLC_COLUMNS, dtype=float)
+
+    # -------------------------------------------------------
+    # 쓰기
+    # -------------------------------------------------------
+    def write(self, ticker, data):
+        """일봉 upsert — 같은 날짜는 덮어씀 (장중 미완성 봉 갱신)"""
+        rows = _rows(ticker, data)
+        with self._connect() as con:
+            con.executemany('INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def replace(self, ticker, data):
+        """티커 전체를 data로 교체 — 삭제와 삽입을 한 트랜잭션으로 (다른 연결은 교체 전이나 후만 보고, 실패하면 그대로)"""
+        rows = _rows(ticker, data)
+        with self._connect() as con:
+            con.execute('DELETE FROM bars WHERE ticker = ?', (ticker,))
+            con.executemany('INSERT INTO bars VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def delete(self, ticker):
+        with self._connect() as con:
+            con.execute('DELETE FROM bars WHERE ticker = ?', (ticker,))
+
+    # -------------------------------------------------------
+    # 증분 동기화
+    # -------------------------------------------------------
+    def sync(self, ticker, provider, start=HISTORY_START, end=None):
+        """공급자에서 마지막 저장일 이후 봉만 받아 저장, 갱신된 행 수 반환
+
+        직전 완성 봉부터 다시 요청해 장중에 저장된 미완성 봉을 덮어쓰고,
+        그 완성 봉의 종가가 달라졌으면 (수정주가 소급 변경) 전체를 다시 적재한다.
+        """
+        counts = self.sync_many([ticker], provider, start, end)
+        if ticker in self.errors:
+            raise self.errors[ticker]
+        return counts[ticker]
+
+    def sync_many(self, tickers, provider, start=HISTORY_START, end=None):
+        """여러 티커를 배치 요청으로 동기화 (기준일이 가까운 티커끼리 한 요청) — {티커: 갱신 행 수}
+
+        일부 티커가 실패해도 나머지는 저장하며, 실패 내역은 self.errors에 남는다.
+        """
+        with self._lock:
+            self.errors = {}
+            anchors = {}
+            for ticker in tickers:
+                recent = self.last_dates(ticker, n=2)
+                anchors[ticker] = recent[-1] if recent else None
+
+            counts = {}
+            new = [t for t in tickers if anchors[t] is None]
+            known = [t for t in tickers if anchors[t] is not None]
+
+            # 기준일이 가까운 티커끼리의 증분 요청들과 신규 티커 전체 요청을 동시에 보냄
+            groups = anchor_groups({t: anchors[t] for t in known})
+            fresh = {}
+            with ThreadPoolExecutor(max_workers=len(groups) + 1) as pool:
+                fresh_jobs = [pool.submit(fetch_many, provider, group, since, end) for since, group in groups]
+                full_job = pool.submit(fetch_many, provider, new, start, end)
+                for job in fresh_jobs:
+                    frames, errors = job.result()
+                    fresh.update(frames)
+                    self.errors.update(errors)
+                full, full_errors = full_job.result()
+            self.errors.update(full_errors)
+
+            reload = []
+            for ticker in known:
+                df = fresh.get(ticker)
+                df = df[df.index >= anchors[ticker]] if df is not None else None
+                if df is None or df.empty:
+                    counts[ticker] = 0
+                elif self._adjusted(ticker, anchors[ticker], df):
+                    reload.append(ticker)
+                else:
+                    counts[ticker] = self.write(ticker, df)
+
+            if reload:
+                reloaded, reload_errors = fetch_many(provider, reload, start, end)
+                full.update(reloaded)
+                self.errors.update(reload_errors)
+            for ticker in new + reload:
+                df = full.get(ticker)
+                if df is None or df.empty:
+                    counts[ticker] = 0
+                    continue
+                counts[ticker] = self.replace(ticker, df)
+            return counts
+
+    def _adjusted(self, ticker, anchor, fresh):
+        """기준 완성 봉의 종가가 저장값과 다르면 True (배당·분할로 수정주가 재계산됨)"""
+        if anchor not in fresh.index:
+            return False
+        stored = self.load(ticker, start=anchor, end=anchor + pd.Timedelta(days=1))
+        if stored.empty:
+            return False
+        return not math.isclose(stored['Close'].iloc[0], fresh.loc[anchor, 'Close'], rel_tol=ADJUST_TOLERANCE)
+
+
+def anchor_groups(anchors):
+    """{티커: 기준일} → [(묶음의 가장 이른 기준일, [티커, ...])]
+
+    최신 기준일부터 MAX_ANCHOR_SPREAD 안에 드는 티커끼리 묶어, 오래 뒤처진 티커 하나 때문에
+    나머지까지 그 날짜부터 다시 받지 않게 한다.
+    """
+    groups = []
+    newest = None
+    for ticker in sorted(anchors, key=anchors.get, reverse=True):
+        if groups and newest - anchors[ticker] <= MAX_ANCHOR_SPREAD:
+            groups[-1][1].append(ticker)
+        else:
+            newest = anchors[ticker]
+            groups.append([None, [ticker]])
+        groups[-1][0] = anchors[ticker]
+    return [tuple(g) for g in groups]
+
+
+def fetch_many(provider, tickers, start, end=None):
+    """배치 공급자는 한 번에, 나머지는 티커별 동시 요청 — ({티커: OHLC}, {티커: 예외})"""
+    if not tickers:
+        return {}, {}
+    errors = {}
+    with registry.timer('provider', provider=type(provider).__name__):
+        try:
+            if len(tickers) > 1 and getattr(provider, 'batch', True) is False:
+                frames, errors = fetch_concurrent(provider, tickers, start, end)
+            elif len(tickers) > 1 and hasattr(provider, 'fetch_many'):
+                frames = provider.fetch_many(tickers, start, end)
+            else:
+                frames = {t: provider.fetch(t, start, end) for t in tickers}
+        except Exception as e:
+            return {}, {t: e for t in tickers}
+    frames = {t: normalize_ohlc(df) for t, df in frames.items()}
+    for t in tickers:
+        if t in errors:
+            continue
+        # 응답에서 빠진 티커와 빈 프레임은 같은 실패로 취급
+        if t not in frames or frames[t].empty:
+            frames.pop(t, None)
+            errors[t] = ProviderError(f'{t}: 응답에 데이터 없음')
+    return frames, errors
+
+
+def _rows(ticker, data):
+    """OHLC 프레임 → bars 테이블 행 튜플"""
+    df = normalize_ohlc(data)
+    return [
+        (ticker, d.strftime('%Y-%m-%d'), o, h, l, c)
+        for d, (o, h, l, c) in zip(df.index, df[OHLC_COLUMNS].itertuples(index=False))
+    ]
+
+
+class _Transaction:
+    """with 블록 종료 시 commit/rollback 후 연결까지 닫는 래퍼"""
+
+    def __init__(self, con):
+        self.con = con
+
+    def __enter__(self):
+        return self.con
+
+    def __exit__(self, exc_type, exc, tb):
+        with closing(self.con):
+            if exc_type is None:
+                self.con.commit()
+            else:
+                self.con.rollback()
+        return False
@@ -0,0 +1,106 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .backtest import load_price_file, performance_stats, simulate
+from .params import chunks, context, init_worker, int_list, param_grid, random_params, target_weights, warmup_length
+
+STAT_COLUMNS = ['cagr', 'max_drawdown', 'sharpe', 'turnover', 'trades']
+
+
+# -----------------------------------------------------------
+# 워커 — 롤링 결과 캐시는 params.context (walkforward와 공용)
+# -----------------------------------------------------------
+def _evaluate(combos):
+    s = context['settings']
+    start, lag = s['start'], s['lag']
+    close = context['close'][start:]
+    dates = context['dates'][start:]
+    rows = []
+    for stoch, mas in combos:
+        target = target_weights(stoch, mas)
+        executed = np.concatenate([np.zeros(lag), target[:len(target) - lag]])[start:]
+        equity, _, trade, turnover = simulate(
+            close, executed, s['cost_bps'], s['slippage_bps'], s['cash_rate']
+        )
+        stats = performance_stats(equity, dates, turnover, trade, s['cash_rate'])
+        rows.append({**stoch, 'ma_periods': ','.join(map(str, mas)),
+                     **{c: stats[c] for c in STAT_COLUMNS}})
+    return rows
+
+
+def run_sweep(data, combos, metric='sharpe', cost_bps=5.0, slippage_bps=5.0, cash_rate=0.0,
+              lag=1, start=None, workers=None):
+    """조합별 백테스트 → metric 내림차순 순위표
+
+    모든 조합을 같은 구간에서 비교하도록 가장 긴 워밍업 이후(또는 start 이후)부터 평가한다.
+    workers=1이면 프로세스 풀 없이 현재 프로세스에서 실행.
+    """
+    workers = workers or os.cpu_count() or 1
+    high, low, close = (data[c].to_numpy(dtype=float) for c in ('High', 'Low', 'Close'))
+    dates = data.index
+
+    first = max(warmup_length(s, m) for s, m in combos) + lag
+    if start is not None:
+        first = max(first, int(dates.searchsorted(pd.Timestamp(start))))
+    if first >= len(dates) - 1:
+        raise ValueError('평가 구간이 비어 있습니다 (데이터가 워밍업보다 짧음)')
+
+    settings = {'start': first, 'lag': lag, 'cost_bps': cost_bps,
+                'slippage_bps': slippage_bps, 'cash_rate': cash_rate}
+    init_args = (high, low, close, dates, settings)
+
+    if workers == 1:
+        init_worker(*init_args)
+        rows = _evaluate(combos)
+    else:
+        batches = [[combos[i] for i in chunk] for chunk in chunks(combos, workers)]
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=init_args) as pool:
+            rows = [r for batch in pool.map(_evaluate, batches) for r in batch]
+
+    table = pd.DataFrame(rows)
+    ascending = metric == 'turnover'
+    table = table.sort_values(metric, ascending=ascending).reset_index(drop=True)
+    table.index += 1
+    table.index.name = 'rank'
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='stoch_config · ma_periods 파라미터 탐색')
+    parser.add_argument('prices', help='일봉 CSV/Parquet 파일')
+    parser.add_argument('--random', type=int, help='무작위 탐색 조합 수 (미지정 시 격자 탐색)')
+    parser.add_argument('--periods', type=int_list, default=[120, 146, 166, 186, 206])
+    parser.add_argument('--k-periods', type=int_list, default=[37, 47, 57, 67])
+    parser.add_argument('--d-periods', type=int_list, default=[9, 14, 19, 24])
+    parser.add_argument('--ma-sets', nargs='+', type=int_list, default=[[20, 45, 151, 212]])
+    parser.add_argument('--metric', default='sharpe', choices=STAT_COLUMNS)
+    parser.add_argument('--cost-bps', type=float, default=5.0)
+    parser.add_argument('--slippage-bps', type=float, default=5.0)
+    parser.add_argument('--cash-rate', type=float, default=0.0)
+    parser.add_argument('--start')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--out', help='전체 순위표 CSV 저장 경로')
+    args = parser.parse_args(argv)
+
+    if args.random:
+        combos = random_params(args.random, seed=args.seed)
+    else:
+        combos = param_grid(args.periods, args.k_periods, args.d_periods, args.ma_sets)
+
+    table = run_sweep(
+        load_price_file(args.prices), combos, metric=args.metric, cost_bps=args.cost_bps,
+        slippage_bps=args.slippage_bps, cash_rate=args.cash_rate, start=args.start, workers=args.workers,
+    )
+    if args.out:
+        table.to_csv(args.out)
+    print(table.head(args.top).to_string(float_format=lambda v: f'{v:.4f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlc(n, seed=0, drift=0.0008, vol=0.035, start_price=50.0, end='2025-12-31'):
+    """재현 가능한 GBM 기반 일봉 OHLC (TQQQ와 비슷한 일간 변동성)"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(drift - vol ** 2 / 2, vol, n)))
+    open_ = np.concatenate([[start_price], close[:-1]]) * np.exp(rng.normal(0, vol / 4, n))
+    wick = np.abs(rng.normal(0, vol / 2, (2, n)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    index = pd.bdate_range(end=end, periods=n, name='Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close}, index=index)
+
+
+# -----------------------------------------------------------
+# 몬테카를로 경로 — 배열은 (일수, 경로 수), 시간축 axis 0
+# -----------------------------------------------------------
+def block_indices(n_source, n_days, n_paths, block, rng):
+    """고정 길이 블록 부트스트랩 인덱스 (n_days, n_paths) — 블록 안에서는 원래 순서를 유지해 변동성 군집을 보존"""
+    block = max(1, min(block, n_source))
+    n_blocks = -(-n_days // block)
+    starts = rng.integers(0, n_source - block + 1, size=(n_blocks, 1, n_paths))
+    idx = starts + np.arange(block)[None, :, None]
+    return idx.reshape(n_blocks * block, n_paths)[:n_days]
+
+
+def bootstrap_paths(data, n_paths, n_days, block=20, seed=0, start_price=50.0):
+    """일봉의 (종가 수익률, 고가/종가, 저가/종가)를 블록 단위로 재표본한 (고가, 저가, 종가) 경로"""
+    rng = np.random.default_rng(seed)
+    close = data['Close'].to_numpy(dtype=float)
+    ret = close[1:] / close[:-1]
+    high_ratio = data['High'].to_numpy(dtype=float)[1:] / close[1:]
+    low_ratio = data['Low'].to_numpy(dtype=float)[1:] / close[1:]
+
+    idx = block_indices(len(ret), n_days, n_paths, block, rng)
+    path_close = start_price * np.cumprod(ret[idx], axis=0)
+    return path_close * high_ratio[idx], path_close * low_ratio[idx], path_close
+
+
+def leveraged_paths(base, n_paths, n_days, leverage=3.0, expense_ratio=0.0095, block=20, seed=0,
+                    start_price=50.0):
+    """기초지수(QQQ 등) 일봉을 블록 재표본한 뒤 일간 leverage배로 복리 — 변동성 손실(volatility decay)이 그대로 반영됨
+
+    고가 · 저가도 전일 종가 대비 등락률에 leverage를 곱해 만든다. 하루 -1/leverage 이하 급락은 가격이 0 근처로 수렴.
+    """
+    rng = np.random.default_rng(seed)
+    close = base['Close'].to_numpy(dtype=float)
+    prev = close[:-1]
+    ret = close[1:] / prev - 1
+    high_ret = base['High'].to_numpy(dtype=float)[1:] / prev - 1
+    low_ret = base['Low'].to_numpy(dtype=float)[1:] / prev - 1
+
+    idx = block_indices(len(ret), n_days, n_paths, block, rng)
+    floor = 1e-4
+    growth = np.maximum(1 + leverage * ret[idx] - expense_ratio / 252, floor)
+    path_close = start_price * np.cumprod(growth, axis=0)
+    path_prev = np.concatenate([np.full((1, n_paths), start_price), path_close[:-1]])
+    high = np.maximum(path_prev * np.maximum(1 + leverage * high_ret[idx], floor), path_close)
+    low = np.minimum(path_prev * np.maximum(1 + leverage * low_ret[idx], floor), path_close)
+    return high, low, path_close
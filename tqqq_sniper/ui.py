@@ -0,0 +1,220 @@
+import os
+from functools import lru_cache
+from html import escape
+
+from .analyzer import action_text
+from .engine import BEAR_MA_COUNT
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+PLOTLY_CDN = 'https://cdn.plot.ly/plotly-2.35.2.min.js'
+
+DAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+# 시그널 → (카드 클래스, 아이콘, 문구 클래스)
+SIGNAL_STYLES = {
+    'BUY': ('signal-buy', '🚀', 'buy'),
+    'SELL': ('signal-sell', '⚠️', 'sell'),
+    'HOLD': ('signal-hold', '☕', 'hold'),
+}
+
+
+@lru_cache(maxsize=None)
+def load_css():
+    """대시보드 CSS — 프로세스당 한 번만 읽음"""
+    with open(os.path.join(STATIC_DIR, 'style.css'), encoding='utf-8') as f:
+        return f.read()
+
+
+# -----------------------------------------------------------
+# 화면 블록 HTML — Streamlit 페이지와 정적 스냅샷이 같은 마크업을 사용
+# -----------------------------------------------------------
+def header_html(date):
+    return f"""
+    <div class="app-header">
+        <div class="logo-area">
+            <div class="logo-icon">⚡</div>
+            <span class="logo-text">TQQQ SNIPER</span>
+        </div>
+        <div class="date-info">
+            <div class="live-dot"></div>
+            {date:%Y.%m.%d} ({DAY_NAMES[date.weekday()]})
+        </div>
+    </div>
+    """
+
+
+def price_card_html(r, aux, ticker='TQQQ'):
+    price_up = r['price_change'] >= 0
+    change_class = 'up' if price_up else 'down'
+    change_sign = '+' if price_up else ''
+    regime_class = 'regime-bull' if r['is_bullish'] else 'regime-bear'
+    regime_text = '📈 BULLISH' if r['is_bullish'] else '📉 BEARISH'
+    context = ' · '.join(
+        f"{t.lstrip('^')} {close:,.2f} <span class=\"{'up' if pct >= 0 else 'down'}\">{pct:+.2f}%</span>"
+        for t, (close, pct) in aux.items()
+    )
+    return f"""
+    <div class="price-card">
+        <div class="ticker-name">{escape(ticker)}</div>
+        <div class="price-row">
+            <span class="main-price">${r['price']:.2f}</span>
+            <span class="price-change {change_class}">{change_sign}${abs(r['price_change']):.2f} ({change_sign}{r['price_change_pct']:.2f}%)</span>
+        </div>
+        <div class="regime-pill {regime_class}">{regime_text}</div>
+        {f'<div class="market-context">{context}</div>' if context else ''}
+    </div>
+    """
+
+
+def signal_card_html(r):
+    sig_class, sig_icon, sig_action_class = SIGNAL_STYLES[r['action']]
+    return f"""
+    <div class="signal-card {sig_class}">
+        <div class="signal-icon">{sig_icon}</div>
+        <div class="signal-label">TODAY'S ACTION</div>
+        <div class="signal-action {sig_action_class}">{action_text(r)}</div>
+        <div class="signal-detail">비중 {r['prev_tqqq']:.0%} → {r['tqqq']:.0%}</div>
+    </div>
+    """
+
+
+def portfolio_html(r):
+    tqqq_pct = r['tqqq'] * 100
+    change_sign = '+' if r['change'] >= 0 else ''
+    change_class = 'up' if r['change'] >= 0 else 'down'
+    # 방어 자산 (국면별 규칙표) — 0.5% 미만은 생략
+    defensive = [(t, w) for t, w in r.get('defensive', {}).items() if w >= 0.005]
+    defensive_bar = ''.join(
+        f'<div class="alloc-defensive" style="width: {w * 100:.1f}%;">{f"{t} {w:.0%}" if w >= 0.12 else ""}</div>'
+        for t, w in defensive
+    )
+    defensive_items = ''.join(f"""
+            <div class="alloc-item">
+                <div class="alloc-dot dot-defensive"></div>
+                <span class="alloc-text">{t} {w:.0%}</span>
+            </div>""" for t, w in defensive)
+    return f"""
+    <div class="portfolio-section">
+        <div class="section-label">📊 PORTFOLIO ALLOCATION</div>
+        <div class="alloc-bar">
+            <div class="alloc-tqqq" style="width: {max(tqqq_pct, 5)}%;">{'TQQQ ' + str(int(r['tqqq']*100)) + '%' if tqqq_pct >= 15 else ''}</div>{defensive_bar}
+            <div class="alloc-cash">{'CASH ' + str(int(r['cash']*100)) + '%' if r['cash'] >= 0.12 or not defensive else ''}</div>
+        </div>
+        <div class="alloc-details">
+            <div class="alloc-item">
+                <div class="alloc-dot dot-tqqq"></div>
+                <span class="alloc-text">TQQQ {r['tqqq']:.0%}</span>
+                <span class="alloc-change {change_class}">{change_sign}{r['change']:.0%}</span>
+            </div>{defensive_items}
+            <div class="alloc-item">
+                <div class="alloc-dot dot-cash"></div>
+                <span class="alloc-text">CASH {r['cash']:.0%}</span>
+            </div>
+        </div>
+    </div>
+    """
+
+
+MA_SECTION_HTML = '<div class="section-label" style="margin: 16px 0 8px 0;">📡 MA SIGNALS</div>'
+
+
+def ma_contribution(r, index, n_ma):
+    """MA 하나의 비중 기여도(%)와 활성 여부 — 상승 국면은 전 MA 균등, 하락 국면은 단기 BEAR_MA_COUNT개만"""
+    if r['is_bullish']:
+        return 100 / n_ma, True
+    if index < BEAR_MA_COUNT:
+        return 100 / BEAR_MA_COUNT, True
+    return 0, False
+
+
+def ma_card_html(r, ma, index, n_ma):
+    is_above = r['ma_signals'][ma]
+    weight, is_active = ma_contribution(r, index, n_ma)
+    contrib = weight if is_above else 0
+
+    if not is_active:
+        card_class, status_class, status_text = 'disabled', 'na', 'N/A'
+    elif is_above:
+        card_class, status_class, status_text = 'active', 'above', '▲ ABOVE'
+    else:
+        card_class, status_class, status_text = 'inactive', 'below', '▼ BELOW'
+
+    contrib_class = 'positive' if contrib > 0 else 'zero'
+    contrib_text = f'+{contrib:.0f}%' if contrib > 0 else '—'
+    return f"""
+            <div class="ma-card {card_class}">
+                <div class="ma-period">{ma}</div>
+                <div class="ma-status {status_class}">{status_text}</div>
+                <div class="ma-dev">${r['ma_values'][ma]:.2f} ({r['deviations'][ma]:+.1f}%)</div>
+                <div class="ma-contrib {contrib_class}">{contrib_text}</div>
+            </div>
+            """
+
+
+def stochastic_html(r, stoch_config):
+    params = ', '.join(str(v) for v in stoch_config.values())
+    return f"""
+    <div class="stoch-section">
+        <div class="section-label">📊 STOCHASTIC ({params})</div>
+        <div class="stoch-row">
+            <div class="stoch-values">
+                <div class="stoch-item">
+                    <div class="stoch-label">%K</div>
+                    <div class="stoch-val stoch-k">{r['stoch_k']:.1f}</div>
+                </div>
+                <div class="stoch-item">
+                    <div class="stoch-label">%D</div>
+                    <div class="stoch-val stoch-d">{r['stoch_d']:.1f}</div>
+                </div>
+            </div>
+            <div class="regime-pill {'regime-bull' if r['is_bullish'] else 'regime-bear'}">
+                {'%K > %D' if r['is_bullish'] else '%K < %D'}
+            </div>
+        </div>
+    </div>
+    """
+
+
+def footer_html(updated):
+    return f"""
+    <div class="app-footer">
+        TQQQ Sniper v6.2 · 마지막 업데이트: {updated:%H:%M:%S} · Not Financial Advice
+    </div>
+    """
+
+
+# -----------------------------------------------------------
+# 정적 페이지 — Streamlit 없이 열 수 있는 단일 HTML (차트는 plotly.js CDN)
+# -----------------------------------------------------------
+def render_page(r, aux, stoch_config, ma_periods, figure_json, updated, ticker='TQQQ'):
+    """스냅샷 페이지 HTML — figure_json은 이미 직렬화된 Plotly Figure JSON 문자열"""
+    ma_cards = ''.join(ma_card_html(r, ma, i, len(ma_periods)) for i, ma in enumerate(ma_periods))
+    # </script>가 JSON 안에 있어도 스크립트 블록이 끊기지 않도록
+    figure_js = figure_json.replace('</', '<\\/')
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(ticker)} Sniper · {r['date']:%Y.%m.%d}</title>
+<style>{load_css()}</style>
+<script src="{PLOTLY_CDN}" charset="utf-8"></script>
+</head>
+<body class="snapshot">
+<div class="stApp"><div class="main"><div class="block-container">
+{header_html(r['date'])}
+{price_card_html(r, aux, ticker)}
+{signal_card_html(r)}
+{portfolio_html(r)}
+{MA_SECTION_HTML}
+<div class="ma-grid">{ma_cards}</div>
+{stochastic_html(r, stoch_config)}
+<div class="chart-container"><div id="chart"></div></div>
+{footer_html(updated)}
+</div></div></div>
+<script>
+const fig = {figure_js};
+Plotly.newPlot('chart', fig.data, fig.layout, {{displayModeBar: false, responsive: true}});
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,241 @@
+"""일봉 검증 · 보정 — calculate_indicators 직전 단계
+
+dropna()만 하면 빠진 거래일 · 잘못된 틱 · 수정되지 않은 분할이 166봉 스토캐스틱 창과 MA를 조용히 밀어낸다.
+모든 검사는 전 구간 배열 연산 (전체 히스토리 수 ms)이라 get_data 경로에 그대로 둘 수 있다.
+
+- 거래소 달력: 주말 봉은 버리고, 빠진 거래일은 직전 종가의 보합 봉으로 채움 (휴장일 봉은 표시만)
+- 결측 · OHLC 불일치: 종가가 있으면 O/H/L을 종가 기준으로 맞추고, 없으면 빠진 날로 처리
+- 튀는 틱: 하루 튀었다가 다음 날 거의 그대로 되돌아온 종가 → 앞뒤 종가의 기하평균 보합 봉으로 교체
+- 분할 의심: 분할 비율과 맞는 하루 급변이 되돌아오지 않고 다음 날이 평소 움직임이면 그 이전 가격을 비율로 나눠 수정
+  (분할일에도 평소만큼의 시장 움직임이 겹치므로 허용 오차는 시계열의 강건 변동성에 비례)
+- 그 밖의 큰 수익률은 표시만 한다 (실제 급락일일 수 있음)
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG
+from .market_calendar import session_days
+
+OHLC = ['Open', 'High', 'Low', 'Close']
+
+# 로그 수익률의 강건 z (MAD 기준)가 이 값을 넘고 절대 크기도 MIN_OUTLIER 이상이면 이상 수익률
+OUTLIER_Z = 8.0
+MIN_OUTLIER = 0.1
+# 튀는 틱 — 다음 날 되돌림 후 남은 움직임이 원래 움직임의 이 비율 이하
+SPIKE_REVERT = 0.25
+# 분할 비율 (가격 1/비율 · 역분할은 ×비율) — 1.5(3:2)는 실제 급락과 겹쳐 제외
+SPLIT_RATIOS = [2, 3, 4, 5, 10, 20]
+# 분할 비율과의 로그 수익률 허용 오차 — max(SPLIT_TOLERANCE, SPLIT_VOL_Z × 강건 일간 변동성),
+# 이웃 분할 비율끼리 구간이 겹치지 않도록 로그 간격의 절반을 넘지 않음
+SPLIT_TOLERANCE = 0.03
+SPLIT_VOL_Z = 3.0
+
+ISSUE_COLUMNS = ['kind', 'action', 'detail']
+
+
+def indicator_windows(stoch_config=None, ma_periods=None):
+    """지표 열 → 값 하나가 의존하는 봉 수 (창 길이, 연쇄 롤링은 합산)"""
+    stoch_config = stoch_config or DEFAULT_STOCH_CONFIG
+    ma_periods = ma_periods or DEFAULT_MA_PERIODS
+    p, k, d = stoch_config['period'], stoch_config['k_period'], stoch_config['d_period']
+    windows = {'Close': 1, 'HH': p, 'LL': p, '%K': p + k - 1, '%D': p + k + d - 2}
+    for ma in ma_periods:
+        windows[f'MA{ma}'] = ma
+        windows[f'Dev{ma}'] = ma
+    return windows
+
+
+def affected_mask(changed, windows):
+    """보정된 봉 마스크 → (일수, 지표 열 수) 영향 마스크 — 창 안에 보정 봉이 하나라도 있으면 True (누적합 차분)"""
+    counts = np.concatenate([[0], np.cumsum(changed)])
+    pos = np.arange(1, len(changed) + 1)[:, None]
+    return counts[pos] - counts[np.maximum(pos - np.array(list(windows.values())), 0)] > 0
+
+
+def _issues(index, mask, kind, action, detail=''):
+    """마스크 위치의 이슈 행 (detail은 스칼라 또는 선택된 행 순서의 값 목록) — 해당 없으면 None"""
+    where = np.flatnonzero(mask)
+    if not len(where):
+        return None
+    return pd.DataFrame({'kind': kind, 'action': action, 'detail': detail}, index=index[where])
+
+
+def validate_bars(data, stoch_config=None, ma_periods=None):
+    """일봉 검증 · 보정 → (보정된 프레임, 리포트)
+
+    리포트: {'issues': 날짜별 이슈표 (kind · action · detail), 'changed': 값이 바뀐 봉 마스크 (Series),
+            'affected': 지표 열별 영향 마스크 (DataFrame, 보정된 프레임과 같은 인덱스)}
+    """
+    issues = []
+    df = data[~data.index.duplicated(keep='last')].sort_index()
+    if len(df) < len(data):
+        dup = data.index[data.index.duplicated(keep='last')]
+        issues.append(pd.DataFrame({'kind': 'duplicate', 'action': 'dropped', 'detail': ''}, index=dup))
+    if df.empty:
+        return df, _report(df, issues, np.zeros(0, dtype=bool), stoch_config, ma_periods)
+
+    values = np.column_stack([df[c].to_numpy(dtype=float) for c in OHLC])
+    values[~(values > 0)] = np.nan
+
+    # 주말 봉 제거 · 휴장일 봉은 유지하고 표시 (달력이 놓친 임시 휴장일일 수도 있어서) — 날짜 비교는 일 단위 배열로
+    day = df.index.to_numpy().astype('datetime64[D]')
+    weekend = ~np.is_busday(day)
+    issues.append(_issues(df.index, weekend, 'weekend', 'dropped'))
+    sessions = session_days(df.index[0], df.index[-1])
+    at = np.minimum(np.searchsorted(sessions, day), max(len(sessions) - 1, 0))
+    holiday = ~weekend & (sessions[at] != day if len(sessions) else True)
+    issues.append(_issues(df.index, holiday, 'off_calendar', 'kept'))
+
+    # 종가 없는 봉은 빠진 날로, 종가만 있으면 O/H/L을 종가로 채움
+    no_close = np.isnan(values[:, 3])
+    partial = ~no_close & np.isnan(values).any(axis=1)
+    issues.append(_issues(df.index, no_close & ~weekend, 'nan', 'dropped', '종가 없음'))
+    issues.append(_issues(df.index, partial & ~weekend, 'nan', 'repaired', '시가 · 고가 · 저가 결측'))
+    values[partial] = np.where(np.isnan(values[partial]), values[partial, 3:4], values[partial])
+
+    keep = ~weekend & ~no_close
+    values, kept = values[keep], day[keep]
+    if not len(kept):
+        out = df.iloc[:0]
+        return out, _report(out, issues, np.zeros(0, dtype=bool), stoch_config, ma_periods)
+
+    # 달력 기준으로 재배치 — 빠진 거래일 · 종가 없는 날은 직전 종가 보합 봉 (마지막 정상 봉 이후는 채우지 않음)
+    grid = np.union1d(sessions, kept[holiday[keep]]) if holiday.any() else sessions
+    grid = grid[np.searchsorted(grid, kept[0]):np.searchsorted(grid, kept[-1], side='right')]
+    index = pd.DatetimeIndex(grid.astype('datetime64[ns]'), name=df.index.name)
+    pos = np.searchsorted(grid, kept)
+    missing = np.ones(len(grid), dtype=bool)
+    missing[pos] = False
+    issues.append(_issues(index, missing, 'missing', 'filled', '직전 종가 보합 봉'))
+    full = np.full((len(grid), 4), np.nan)
+    full[pos] = values
+    filled = np.maximum.accumulate(np.where(missing, 0, np.arange(len(grid))))
+    full[missing] = full[filled[missing], 3:4]
+    changed = missing.copy()
+    changed[pos[partial[keep]]] = True
+
+    # OHLC 불일치 — 고가는 시가 · 종가 이상, 저가는 이하로
+    o, h, l, c = full.T
+    bad = (h < np.maximum(o, c)) | (l > np.minimum(o, c)) | (h < l)
+    full[:, 1] = np.maximum(h, np.maximum(o, c))
+    full[:, 2] = np.minimum(l, np.minimum(o, c))
+    issues.append(_issues(index, bad, 'ohlc', 'repaired', '고가 · 저가를 시가 · 종가 범위로'))
+    changed |= bad
+
+    # 수익률 이상치 · 튀는 틱 · 분할 — ret[i]는 봉 i → i+1 로그 수익률
+    ret = np.diff(np.log(full[:, 3]))
+    scale = 1.4826 * np.median(np.abs(ret - np.median(ret))) if len(ret) else 0.0
+    big = np.abs(ret) > max(OUTLIER_Z * scale, MIN_OUTLIER)
+    nxt = np.append(ret[1:], np.nan)
+    reverts = np.abs(ret + nxt) <= SPIKE_REVERT * np.abs(ret)
+    spike = big & np.append(big[1:], False) & reverts
+    spike &= ~np.append(False, spike[:-1])
+    after_spike = np.append(False, spike[:-1])      # 되돌림 날 자체는 이상치가 아님
+
+    ratios = np.asarray(SPLIT_RATIOS, dtype=float)
+    gap = np.abs(np.abs(ret)[:, None] - np.log(ratios))
+    ratio = ratios[gap.argmin(axis=1)] if len(ret) else ret
+    tolerance = min(max(SPLIT_TOLERANCE, SPLIT_VOL_Z * scale), np.diff(np.log(ratios)).min() / 2)
+    # 분할은 다음 날 수익률이 평소 범위여야 함 — 되돌림 · 연속 급변이 아님을 확인 (마지막 봉은 jump로 표시만)
+    calm_next = np.abs(nxt) <= max(OUTLIER_Z * scale, MIN_OUTLIER)
+    split = big & ~reverts & ~after_spike & calm_next & (gap.min(axis=1, initial=np.inf) <= tolerance)
+    jump = big & ~spike & ~split & ~after_spike
+
+    def move(mask):
+        return [f'{v:+.1f}%' for v in np.expm1(ret[mask]) * 100]
+
+    def at_bar(mask):
+        bar = np.zeros(len(index), dtype=bool)
+        bar[np.flatnonzero(mask) + 1] = True
+        return bar
+
+    # 튀는 틱 → 앞뒤 종가의 기하평균 보합 봉
+    bar = at_bar(spike)
+    at = np.flatnonzero(bar)
+    issues.append(_issues(index[1:], spike, 'spike', 'repaired', move(spike)))
+    full[at] = np.sqrt(full[at - 1, 3] * full[at + 1, 3])[:, None]
+    changed |= bar
+
+    # 분할 → 분할일 이전 가격 전체를 비율로 조정 (역분할은 반대 방향)
+    factor = np.ones(len(index))
+    factor[at_bar(split)] = np.where(ret[split] < 0, 1 / ratio[split], ratio[split])
+    adjust = np.append(np.cumprod(factor[::-1])[::-1][1:], 1.0)
+    issues.append(_issues(index[1:], split, 'split', 'adjusted',
+                          [f'{r:g}:1' if v < 0 else f'1:{r:g}' for r, v in zip(ratio[split], ret[split])]))
+    full *= adjust[:, None]
+    changed |= adjust != 1.0
+
+    issues.append(_issues(index[1:], jump, 'jump', 'flagged', move(jump)))
+
+    # 주말 봉을 버린 다음 봉은 창 구성이 바뀌었으므로 영향 범위에 포함
+    after = np.searchsorted(grid, day[weekend | no_close])
+    changed[after[after < len(grid)]] = True
+
+    out = pd.DataFrame(full, index=index, columns=OHLC)
+    extra = [c for c in df.columns if c not in OHLC]
+    for col in extra:
+        out[col] = df[col].reindex(index).ffill().to_numpy()
+    if extra or list(df.columns) != OHLC:
+        out = out[list(df.columns)]
+    return out, _report(out, issues, changed, stoch_config, ma_periods)
+
+
+def _report(out, issues, changed, stoch_config, ma_periods):
+    frames = [f for f in issues if f is not None]
+    table = pd.concat(frames).sort_index() if frames else pd.DataFrame(columns=ISSUE_COLUMNS)
+    windows = indicator_windows(stoch_config, ma_periods)
+    return {
+        'issues': table.rename_axis('Date'),
+        'changed': pd.Series(changed, index=out.index),
+        'affected': pd.DataFrame(affected_mask(changed, windows), index=out.index, columns=list(windows)),
+    }
+
+
+def affected_ranges(affected):
+    """지표 열별 영향 요약 — (봉 수, 첫 날짜, 마지막 날짜), 영향 없는 열은 제외"""
+    rows = {}
+    for name, mask in affected.items():
+        where = np.flatnonzero(mask.to_numpy())
+        if len(where):
+            rows[name] = (len(where), affected.index[where[0]], affected.index[where[-1]])
+    return pd.DataFrame.from_dict(rows, orient='index', columns=['rows', 'first', 'last'])
+
+
+def main(argv=None):
+    from .backtest import load_price_file
+    from .store import BarStore
+
+    parser = argparse.ArgumentParser(description='일봉 검증 · 보정 리포트 (달력 · 이상치 · 분할 의심)')
+    parser.add_argument('prices', nargs='?', help='일봉 CSV/Parquet 파일 (없으면 저장소)')
+    parser.add_argument('--ticker', default='TQQQ')
+    parser.add_argument('--store', help='SQLite 저장소 경로 (기본: TQQQ_STORE_PATH)')
+    parser.add_argument('--out', help='보정된 일봉 CSV 저장 경로')
+    args = parser.parse_args(argv)
+
+    if args.prices:
+        data = load_price_file(args.prices)
+    else:
+        data = (BarStore(args.store) if args.store else BarStore()).load(args.ticker)
+    if data.empty:
+        print('데이터를 불러올 수 없습니다.', file=sys.stderr)
+        return 1
+
+    clean, report = validate_bars(data)
+    if args.out:
+        clean.to_csv(args.out)
+    issues = report['issues']
+    if issues.empty:
+        print(f'{len(data)}봉 · 이슈 없음')
+        return 0
+    print(f"{len(data)}봉 → {len(clean)}봉 · 이슈 {len(issues)}건 ({', '.join(f'{k} {n}' for k, n in issues['kind'].value_counts().items())})")
+    print(issues.to_string())
+    print()
+    print(affected_ranges(report['affected']).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""워크포워드 최적화 — 학습 구간에서 고른 파라미터를 다음 구간(표본 외)에 적용해 이어 붙인 성과
+
+지표는 과거 데이터만 쓰므로 조합별 지표 · 목표 비중 · 일간 수익률을 전체 히스토리에 대해 한 번만 계산하고
+(겹치는 학습 구간끼리 다시 계산하지 않음), 각 학습 구간의 점수는 누적합 차이로 모든 조합 · 구간을 한 번에 구한다.
+표본 외 성과는 구간별로 선택된 조합의 목표 비중을 이어 붙여 simulate()로 한 번 재생한다 (교체 비용 포함).
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .backtest import TRADING_DAYS, load_price_file, performance_stats, simulate
+from .indicators import DEFAULT_MA_PERIODS, DEFAULT_STOCH_CONFIG
+from .params import chunks, context, init_worker, int_list, param_grid, random_params, target_weights, warmup_length
+
+METRICS = ('sharpe', 'cagr', 'max_drawdown', 'turnover')
+# 표본 외 구간 단위 (pandas Period 빈도)
+STEPS = ('W', 'M', 'Q', 'Y')
+
+
+# -----------------------------------------------------------
+# 조합별 전체 구간 시계열 — 워커는 sweep과 같은 롤링 캐시를 공유
+# -----------------------------------------------------------
+def _series(combos):
+    """조합별 (체결 비중, 일간 수익률, 회전율) — 평가 시작일부터, 현금 대비 초과수익률은 호출 쪽에서"""
+    s = context['settings']
+    start, lag = s['start'], s['lag']
+    close = context['close'][start:]
+    out = []
+    for stoch, mas in combos:
+        target = target_weights(stoch, mas)
+        executed = np.concatenate([np.zeros(lag), target[:len(target) - lag]])[start:]
+        equity, _, _, turnover = simulate(close, executed, s['cost_bps'], s['slippage_bps'], s['cash_rate'])
+        returns = np.concatenate([[equity[0] - 1], equity[1:] / equity[:-1] - 1])
+        out.append((executed.astype(np.float32), returns, turnover))
+    return out
+
+
+def combo_series(data, combos, start, lag=1, cost_bps=5.0, slippage_bps=5.0, cash_rate=0.0, workers=None):
+    """모든 조합의 (체결 비중, 일간 수익률, 회전율) 배열 — 각각 (조합 수, 평가 일수)"""
+    workers = workers or os.cpu_count() or 1
+    high, low, close = (data[c].to_numpy(dtype=float) for c in ('High', 'Low', 'Close'))
+    settings = {'start': start, 'lag': lag, 'cost_bps': cost_bps, 'slippage_bps': slippage_bps,
+                'cash_rate': cash_rate}
+    init_args = (high, low, close, data.index, settings)
+
+    # 묶음은 combos 순번 목록 — 결과를 combos 순서로 되돌릴 때 사용
+    if workers == 1:
+        init_worker(*init_args)
+        batches = [list(range(len(combos)))]
+        results = [_series(combos)]
+    else:
+        batches = chunks(combos, workers)
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=init_args) as pool:
+            results = list(pool.map(_series, [[combos[i] for i in batch] for batch in batches]))
+
+    ordered = [None] * len(combos)
+    for batch, result in zip(batches, results):
+        for i, series in zip(batch, result):
+            ordered[i] = series
+    return tuple(np.stack([s[j] for s in ordered]) for j in range(3))
+
+
+# -----------------------------------------------------------
+# 구간 점수 — 누적합 차이로 (구간 수, 조합 수) 한 번에
+# -----------------------------------------------------------
+def fold_bounds(dates, first, train_days, step='M', anchored=False):
+    """(학습 시작, 학습 끝 = 표본 외 시작, 표본 외 끝) 인덱스 배열 — 인덱스는 전체 데이터 기준, 끝은 미포함
+
+    표본 외 구간은 step 단위 달력 구간의 첫 거래일에 시작하고, 학습 구간이 train_days를 채운 뒤부터 만든다.
+    """
+    periods = pd.DatetimeIndex(dates).to_period(step)
+    starts = np.flatnonzero(np.concatenate([[True], periods[1:] != periods[:-1]]))
+    starts = starts[starts >= first + train_days]
+    if len(starts) == 0:
+        raise ValueError('학습 구간을 채울 데이터가 부족합니다')
+    ends = np.append(starts[1:], len(dates))
+    train_start = np.full(len(starts), first) if anchored else starts - train_days
+    return train_start, starts, ends
+
+
+def window_scores(returns, turnover, lo, hi, metric, cash_rate=0.0):
+    """각 구간 [lo, hi)에서 조합별 점수 (구간 수, 조합 수) — 인덱스는 returns 열 기준"""
+    excess = returns - (np.exp(np.log1p(cash_rate) / TRADING_DAYS) - 1)
+    n = (hi - lo)[:, None]
+
+    def window_sum(values):
+        prefix = np.concatenate([np.zeros((len(values), 1)), np.cumsum(values, axis=1)], axis=1)
+        return (prefix[:, hi] - prefix[:, lo]).T
+
+    if metric == 'sharpe':
+        mean = window_sum(excess) / n
+        var = (window_sum(excess ** 2) - n * mean ** 2) / np.maximum(n - 1, 1)
+        std = np.sqrt(np.maximum(var, 0))
+        return np.divide(mean, std, out=np.zeros_like(mean), where=std > 0) * np.sqrt(TRADING_DAYS)
+    if metric == 'cagr':
+        return np.expm1(window_sum(np.log1p(returns)) * TRADING_DAYS / n)
+    if metric == 'turnover':
+        return window_sum(turnover) * TRADING_DAYS / n
+
+    # MDD는 누적합으로 분해되지 않아 구간마다 (조합 수, 구간 길이) 로그 자산으로 계산
+    log_equity = np.cumsum(np.log1p(returns), axis=1)
+    scores = np.empty((len(lo), len(returns)))
+    for f, (a, b) in enumerate(zip(lo, hi)):
+        seg = log_equity[:, a:b]
+        base = log_equity[:, a - 1:a] if a else np.zeros((len(returns), 1))
+        peak = np.maximum.accumulate(np.concatenate([base, seg], axis=1), axis=1)[:, 1:]
+        scores[f] = np.expm1((seg - peak).min(axis=1))
+    return scores
+
+
+# -----------------------------------------------------------
+# 워크포워드
+# -----------------------------------------------------------
+def _combo_label(stoch, mas):
+    return '{period}-{k_period}-{d_period}|'.format(**stoch) + '-'.join(map(str, mas))
+
+
+def run_walkforward(data, combos, train_days=3 * TRADING_DAYS, step='M', metric='sharpe', anchored=False,
+                    cost_bps=5.0, slippage_bps=5.0, cash_rate=0.0, lag=1, workers=None):
+    """워크포워드 최적화 — 표본 외 구간을 이어 붙인 자산 곡선과 구간별 선택 결과
+
+    기본 파라미터(DEFAULT_*)는 후보에 항상 포함하고, 같은 표본 외 구간에서의 성과를 비교용으로 함께 반환한다.
+    반환: {'folds', 'equity', 'default', 'benchmark', 'stats', 'default_stats', 'benchmark_stats'}
+    """
+    if metric not in METRICS:
+        raise ValueError(f'알 수 없는 지표: {metric} ({", ".join(METRICS)})')
+    combos = list(combos)
+    labels = [_combo_label(s, m) for s, m in combos]
+    default_label = _combo_label(DEFAULT_STOCH_CONFIG, DEFAULT_MA_PERIODS)
+    if default_label not in labels:
+        combos.append((dict(DEFAULT_STOCH_CONFIG), list(DEFAULT_MA_PERIODS)))
+        labels.append(default_label)
+    default = labels.index(default_label)
+
+    dates = data.index
+    first = max(warmup_length(s, m) for s, m in combos) + lag
+    train_start, test_start, test_end = fold_bounds(dates, first, train_days, step, anchored)
+
+    executed, returns, turnover = combo_series(data, combos, first, lag, cost_bps, slippage_bps, cash_rate, workers)
+    scores = window_scores(returns, turnover, train_start - first, test_start - first, metric, cash_rate)
+    chosen = scores.argmin(axis=1) if metric == 'turnover' else scores.argmax(axis=1)
+
+    # 구간별 선택 조합의 체결 비중을 이어 붙여 표본 외 구간 전체를 한 번에 재생
+    oos = slice(test_start[0], test_end[-1])
+    stitched = np.concatenate([executed[c, a - first:b - first] for c, a, b in zip(chosen, test_start, test_end)])
+    close = data['Close'].to_numpy(dtype=float)[oos]
+    oos_dates = dates[oos]
+    equity, _, trade, turn = simulate(close, stitched.astype(float), cost_bps, slippage_bps, cash_rate)
+    base_equity, _, base_trade, base_turn = simulate(
+        close, executed[default, oos.start - first:oos.stop - first].astype(float), cost_bps, slippage_bps, cash_rate
+    )
+    benchmark = close / close[0]
+
+    def segment_return(curve):
+        at = np.concatenate([[1.0], curve])
+        idx = np.append(test_start - oos.start, len(close))
+        return at[idx[1:]] / at[idx[:-1]] - 1
+
+    folds = pd.DataFrame({
+        'train_start': dates[train_start],
+        'train_end': dates[test_start - 1],
+        'test_start': dates[test_start],
+        'test_end': dates[test_end - 1],
+        'params': [labels[c] for c in chosen],
+        f'train_{metric}': scores[np.arange(len(chosen)), chosen],
+        f'default_train_{metric}': scores[:, default],
+        'test_return': segment_return(equity),
+        'default_test_return': segment_return(base_equity),
+        'benchmark_test_return': segment_return(benchmark),
+    })
+    folds.index.name = 'fold'
+    return {
+        'folds': folds,
+        'equity': pd.Series(equity, index=oos_dates, name='WalkForward'),
+        'default': pd.Series(base_equity, index=oos_dates, name='Default'),
+        'benchmark': pd.Series(benchmark, index=oos_dates, name='TQQQ'),
+        'stats': performance_stats(equity, oos_dates, turn, trade, cash_rate),
+        'default_stats': performance_stats(base_equity, oos_dates, base_turn, base_trade, cash_rate),
+        'benchmark_stats': performance_stats(benchmark, oos_dates, cash_rate=cash_rate),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='워크포워드 최적화 · 표본 외 검증')
+    parser.add_argument('prices', help='일봉 CSV/Parquet 파일')
+    parser.add_argument('--random', type=int, help='무작위 탐색 조합 수 (미지정 시 격자 탐색)')
+    parser.add_argument('--periods', type=int_list, default=[120, 146, 166, 186, 206])
+    parser.add_argument('--k-periods', type=int_list, default=[37, 47, 57, 67])
+    parser.add_argument('--d-periods', type=int_list, default=[9, 14, 19, 24])
+    parser.add_argument('--ma-sets', nargs='+', type=int_list, default=[[20, 45, 151, 212]])
+    parser.add_argument('--train-days', type=int, default=3 * TRADING_DAYS, help='학습 구간 길이 (거래일)')
+    parser.add_argument('--step', choices=STEPS, default='M', help='표본 외 구간 단위 (주 · 월 · 분기 · 연)')
+    parser.add_argument('--anchored', action='store_true', help='학습 구간 시작을 고정 (확장 창)')
+    parser.add_argument('--metric', choices=METRICS, default='sharpe')
+    parser.add_argument('--cost-bps', type=float, default=5.0)
+    parser.add_argument('--slippage-bps', type=float, default=5.0)
+    parser.add_argument('--cash-rate', type=float, default=0.0)
+    parser.add_argument('--lag', type=int, default=1)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--out', help='구간별 선택 결과 CSV 저장 경로')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.random:
+        combos = random_params(args.random, seed=args.seed)
+    else:
+        combos = param_grid(args.periods, args.k_periods, args.d_periods, args.ma_sets)
+
+    result = run_walkforward(
+        load_price_file(args.prices), combos, train_days=args.train_days, step=args.step, metric=args.metric,
+        anchored=args.anchored, cost_bps=args.cost_bps, slippage_bps=args.slippage_bps,
+        cash_rate=args.cash_rate, lag=args.lag, workers=args.workers,
+    )
+    if args.out:
+        result['folds'].to_csv(args.out)
+    summary = {'walkforward': result['stats'], 'default': result['default_stats'],
+               'benchmark': result['benchmark_stats']}
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(result['folds'].tail(12).to_string(float_format=lambda v: f'{v:.4f}'))
+    for name, stats in summary.items():
+        print(f"[{name}] {stats['start']} ~ {stats['end']} · CAGR {stats['cagr']:.2%} · "
+              f"MDD {stats['max_drawdown']:.2%} · Sharpe {stats['sharpe']:.2f}")
+    print(f"파라미터 교체 {(result['folds']['params'] != result['folds']['params'].shift()).sum() - 1}회 · "
+          f"구간 {len(result['folds'])}개")
+
+
+if __name__ == '__main__':
+    main()